@@ -4,8 +4,14 @@ These distances are all based from measurements from google earth.
 
 """
 
+import sys
 from collections import OrderedDict
-from io import StringIO
+from os.path import abspath, dirname, join
+
+# Add the repository root to the python path in order to make the ooc package available for import.
+sys.path.append(join(dirname(abspath(__file__)), ".."))
+
+from ooc.layout import Layout
 
 
 # The simplified airport layout used by this script to calculate the distances.
@@ -137,127 +143,44 @@ bays = OrderedDict((
 ))
 
 
-bay_gate_distance = OrderedDict()
-
 inactive_gates = [3]
 non_existing_gates = [6, 11]
 
-# Loop through all bays
-for bay_name, i in bays.items():
-    if bay_name.startswith("H"):  # Check whether this is a Hotel bay.
-        # Position relative to gate 1
-        pg1 = -1 * ds_h[i]
-
-        # Array holding the distance to each gate.
-        ds_gates = []
+# The gates, the non remote bays and the hotel bays all lay on a single line. The nodes on
+# this line are named after their position relative to gate 1.
+layout = Layout()
+line_positions = sorted(set(ds_nr[1:]) | {-d for d in ds_h[1:]} | {ds_bussing})
+for position_1, position_2 in zip(line_positions[:-1], line_positions[1:]):
+    layout.add_edge(str(position_1), str(position_2), position_2 - position_1)
 
-        # Add distance to normal gates
-        for j in range(1, 21):
-            if j in non_existing_gates:
-                pass
-            elif j in inactive_gates:
-                ds_gates.append("x")
-            else:
-                ds_gates.append(str(abs(pg1 - ds_nr[j])))
+# Add the gates.
+for j in range(1, 21):
+    if j not in non_existing_gates:
+        layout.add_gate(str(j), str(ds_nr[j]), active=j not in inactive_gates)
 
-        # Add distance to bussing gates.
-        for j in range(21, 26):
-            ds_gates.append(str(abs(pg1 - ds_bussing)))
+# Add the bussing gates.
+for j in range(21, 26):
+    layout.add_gate("20B" if j == 25 else str(j), str(ds_bussing))
 
-        bay_gate_distance[bay_name] = ds_gates
+# Add the bays.
+for bay_name, i in bays.items():
+    if bay_name.startswith("H"):  # Check whether this is a Hotel bay.
+        layout.add_bay(bay_name, str(-ds_h[i]))
 
     elif bay_name.startswith("J"):  # Check whether ths is a Juliet bay.
-        # Position relative to bussing area
-        pg14 = ds_j[i]
-
-        # Array holding the distance to each gate.
-        ds_gates = []
-
-        # Add distance to normal gates
-        for j in range(1, 21):
-            if j in non_existing_gates:
-                pass
-            elif j in inactive_gates:
-                ds_gates.append("x")
-            else:
-                ds_gates.append(str(abs(ds_nr[j] - ds_bussing) + pg14))
-
-        # Add distance to bussing gates.
-        for j in range(21, 26):
-            ds_gates.append(str(pg14))
-
-        bay_gate_distance[bay_name] = ds_gates
+        # The juliet bays are connected to the line at the bussing gates.
+        layout.add_edge(bay_name, str(ds_bussing), ds_j[i])
+        layout.add_bay(bay_name)
 
     elif bay_name.startswith("SPV"):  # Check whether this is a state pavilion bay
-        # Array holding the distance to each gate.
-        ds_gates = []
+        # The state pavilion is connected to the line at gate 1.
+        layout.add_edge(bay_name, str(ds_nr[1]), ds_stpv)
+        layout.add_bay(bay_name)
 
-        # Add distance to normal gates
-        for j in range(1, 21):
-            if j in non_existing_gates:
-                pass
-            elif j in inactive_gates:
-                ds_gates.append("x")
-            else:
-                ds_gates.append(str(ds_stpv + ds_nr[j]))
-
-        # Add distance to bussing gates.
-        for j in range(21, 26):
-            ds_gates.append(str(ds_stpv + ds_bussing))
-
-        bay_gate_distance[bay_name] = ds_gates
     else:  # This is a non-remote bay.
-        # distance to gate 1
-        dsg1 = ds_nr[i]
-
-        # Array holding the distance to each gate.
-        ds_gates = []
-
-        # Add distance to normal gates
-        for j in range(1, 21):
-            if j in non_existing_gates:
-                pass
-            elif j in inactive_gates:
-                ds_gates.append("x")
-            else:
-                ds_gates.append(str(abs(dsg1-ds_nr[j])))
-
-        # Add distance to bussing gates.
-        for j in range(21, 26):
-            ds_gates.append(str(abs(dsg1 - ds_bussing)))
-
-        bay_gate_distance[bay_name] = ds_gates
-
-# StringIO used to build the final table
-sio = StringIO()
-
-# Write header
-sio.write("bay , ")
-
-
-def gate_header():
-    """Generator yielding strings containing the names of each gate."""
-    for i in range(1, 26):
-        if i in non_existing_gates:
-            continue
-        i = " 20B" if i == 25 else i
-        yield "{:4}".format(i)
-
-sio.write(", ".join(gate_header()))
-sio.write("\n")
-
-# Loop through each bay.
-for bay_name, ds_gates in bay_gate_distance.items():
-    def foo():
-        """Generator yielding the distance to each gate."""
-        for i in range(0, 23):
-            yield "{:>4}".format(ds_gates[i])
-    sio.write("{:4}, ".format(bay_name))
-    sio.write(", ".join(foo()))
-    sio.write("\n")
+        layout.add_bay(bay_name, str(ds_nr[i]))
 
 # Print the final table.
-print(sio.getvalue())
+print(layout.bay_gate_distance_table())
 
-with open("jomo_kenyatta_international_airport/bay_gate_distance.csv", "w") as f:
-    f.write(sio.getvalue())
+layout.write_bay_gate_distance("jomo_kenyatta_international_airport/bay_gate_distance.csv")
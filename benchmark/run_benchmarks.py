@@ -0,0 +1,259 @@
+"""
+Scaling benchmark of the different stages of the bay and gate assignment.
+
+A synthetic airport and flight schedule is generated for each schedule size. Then the time
+spent loading in the data, generating and writing the lp code, loading in the solutions and
+drawing the charts is measured. Cplex is not run, instead a random (not necessarily feasible)
+solution is written, so the solution loading can be timed as well.
+
+The timings can be saved as baselines and later runs can be compared with them in order to
+catch performance regressions, eg.
+
+    python run_benchmarks.py --save
+    python run_benchmarks.py --compare
+
+By default only the small schedules are run, which finish in a few minutes. Generating the lp
+code of the larger schedules takes very long, so --large runs them without generating the lp
+code. The other stages of the large schedules have baselines as well. Passing the sizes runs
+them with the lp code, unless --no-lp-code is given, eg.
+
+    python run_benchmarks.py --large --no-charts --compare
+    python run_benchmarks.py 500 1000
+
+The baselines were saved with --large --repeat 3 --save, which stores the median time of each
+stage over three runs.
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+from time import perf_counter
+
+
+default_sizes = [100, 200]
+"""
+Default number of flights of the benchmarked schedules.
+"""
+
+large_sizes = [500, 1000, 2000, 5000, 10000, 20000]
+"""
+Number of flights of the large schedules, which are only benchmarked with --large. Their lp code
+isn't generated.
+"""
+
+stages = ["airport.load",
+          "flights.load",
+          "solver.init",
+          "bay.lp_code",
+          "bay.write_lp",
+          "bay.load_solution",
+          "gate.lp_code",
+          "gate.write_lp",
+          "gate.load_solution",
+          "charts"]
+"""
+Names of the benchmarked stages in the order they are run.
+"""
+
+
+def airport_size(n_flights):
+    """
+    Scales the airport with the number of flights, so the number of flights per bay stays
+    roughly the same as in the real schedules.
+
+    :param int n_flights: Number of flights.
+    :return: Dictionary with the number of bays, gates and remote bays.
+    """
+    n_bays = max(47, n_flights // 5)
+    return {"n_bays": n_bays,
+            "n_gates": max(23, n_bays // 2),
+            "n_remote_bays": n_bays // 2}
+
+
+def benchmark(n_flights, seed=0, charts=True, lp_code=True):
+    """
+    Runs the benchmark for a single schedule size.
+
+    :param int n_flights: Number of flights in the schedule.
+    :param int seed: Seed used to generate the airport and schedule.
+    :param bool charts: False to skip drawing the charts.
+    :param bool lp_code: False to skip generating and writing the lp code. The random solutions
+                         are still loaded.
+    :return: Dictionary with the wall time of each stage.
+    """
+    from ooc import Airport, Flights, BayGateSolver
+    from ooc.profiling import Profiler
+    from ooc.lp_solvers import write_solution
+    from ooc.synthetic import generate_airport, generate_schedule
+    # Numpy is imported on first use, import it here so it isn't timed as part of loading the flights.
+    import numpy  # noqa: F401
+
+    timings = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        airport_path = os.path.join(directory, "airport")
+        flights_path = os.path.join(directory, "flights")
+        airport_info = generate_airport(airport_path, seed=seed, **airport_size(n_flights))
+        generate_schedule(flights_path, airport_info, n_flights=n_flights, seed=seed)
+
+        # The garbage collector is disabled while timing, like timeit does. Otherwise the time spent
+        # collecting garbage depends on the previous runs, which makes the timings noisy.
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = perf_counter()
+            airport = Airport(airport_path)
+            timings["airport.load"] = perf_counter() - t0
+
+            t0 = perf_counter()
+            Flights(flights_path, airport)
+            timings["flights.load"] = perf_counter() - t0
+
+            # The workspace is created relative to the current working directory.
+            os.chdir(directory)
+            profiler = Profiler()
+            t0 = perf_counter()
+            solver = BayGateSolver(airport_path, flights_path, "workspace", cplex_command=None, profiler=profiler)
+            timings["solver.init"] = perf_counter() - t0
+
+            flights = solver.flights
+            rng = random.Random(seed)
+
+            if lp_code:
+                solver.solve_bay_assignment()
+            else:
+                os.makedirs(solver.workspace_path, exist_ok=True)
+            bays = [rng.choice([k for k in range(airport.n_bays) if flights.bay_compliance(i, k)])
+                    for i in range(flights.n_flights)]
+            write_solution(solver.bay_sol_path, (("X_{}_{}".format(i, k), 1) for i, k in enumerate(bays)))
+            solver.load_bay_assignment_solution()
+
+            if lp_code:
+                solver.solve_gate_assignment()
+            write_solution(solver.gate_sol_path, (("X_{}_{}".format(i, rng.randrange(airport.n_gates)), 1)
+                                                  for i in range(flights.n_flights) if flights.departing(i)))
+            solver.load_gate_assignment_solution()
+
+            timings.update(profiler.totals())
+
+            if charts:
+                t0 = perf_counter()
+                solver.create_bay_assignment_chart("Bay assignment", os.path.join(directory, "bay.png"))
+                solver.create_gate_assignment_chart("Gate assignment", os.path.join(directory, "gate.png"))
+                timings["charts"] = perf_counter() - t0
+        finally:
+            os.chdir(cwd)
+            gc.enable()
+
+    return {stage: timings[stage] for stage in stages if stage in timings}
+
+
+def compare(results, baselines, tolerance, min_slowdown=0.0):
+    """
+    Compares the benchmark results with the baselines.
+
+    :param dict results: Dictionary with the timings per schedule size.
+    :param dict baselines: Dictionary with the baseline timings per schedule size.
+    :param float tolerance: Allowed relative slowdown, eg. 0.25 allows stages to be 25% slower.
+    :param float min_slowdown: Slowdowns of less than this many seconds are ignored, so the timing noise of
+                               the very short stages isn't reported.
+    :return: List of (size, stage, baseline, time) tuples of the stages that regressed.
+    """
+    regressions = []
+    for size, timings in results.items():
+        for stage, dt in timings.items():
+            baseline = baselines.get(size, {}).get(stage)
+            if baseline is not None and dt > baseline * (1 + tolerance) and dt - baseline >= min_slowdown:
+                regressions.append((size, stage, baseline, dt))
+    return regressions
+
+
+def print_table(results):
+    """
+    Prints a table with the timings per stage and schedule size.
+
+    :param dict results: Dictionary with the timings per schedule size.
+    """
+    sizes = list(results)
+    print("{:20s}".format("stage") + "".join("{:>11s}".format(size) for size in sizes))
+    for stage in stages:
+        print("{:20s}".format(stage) +
+              "".join("{:>11s}".format("" if stage not in results[size] else "{:.3f}".format(results[size][stage]))
+                      for size in sizes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the bay and gate assignment stages.")
+    parser.add_argument("sizes", nargs="*", type=int, default=default_sizes,
+                        help="Number of flights of the benchmarked schedules.")
+    parser.add_argument("--large", action="store_true",
+                        help="Also benchmark the large schedules, without generating their lp code.")
+    parser.add_argument("--no-lp-code", action="store_true", help="Don't generate the lp code of any schedule.")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Number of runs per schedule size. The median time of each stage is reported.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed used to generate the airports and schedules.")
+    parser.add_argument("--no-charts", action="store_true", help="Don't benchmark the charts.")
+    parser.add_argument("--baselines", default=abs_path("baselines.json"), help="Path to the baselines file.")
+    parser.add_argument("--save", action="store_true", help="Save the results as the new baselines.")
+    parser.add_argument("--compare", action="store_true", help="Compare the results with the baselines.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown before a stage is considered a regression.")
+    parser.add_argument("--min-slowdown", type=float, default=0.01,
+                        help="Slowdowns of less than this many seconds are never considered a regression.")
+    args = parser.parse_args()
+    sizes = [(size, not args.no_lp_code) for size in args.sizes]
+    if args.large:
+        sizes += [(size, False) for size in large_sizes if size not in args.sizes]
+
+    results = {}
+    for size, lp_code in sizes:
+        print("Benchmarking {} flights...".format(size))
+        runs = [benchmark(size, seed=args.seed, charts=not args.no_charts, lp_code=lp_code)
+                for _ in range(args.repeat)]
+        results[str(size)] = {stage: statistics.median(run[stage] for run in runs) for stage in runs[0]}
+    print()
+    print_table(results)
+
+    if args.save:
+        baselines = {}
+        if os.path.isfile(args.baselines):
+            with open(args.baselines) as f:
+                baselines = json.load(f)
+        baselines.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+        for size in results:
+            if size not in baselines:
+                print("There are no baselines for {} flights.".format(size))
+        regressions = compare(results, baselines, args.tolerance, args.min_slowdown)
+        for size, stage, baseline, dt in regressions:
+            print("Regression: '{}' with {} flights took {:.3f}s, baseline is {:.3f}s.".format(stage, size, dt,
+                                                                                                baseline))
+        if regressions:
+            sys.exit(1)
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+if __name__ == "__main__":
+    # Add the repository root to the python path in order to make the ooc package available for import.
+    sys.path.append(abs_path(".."))
+
+    main()
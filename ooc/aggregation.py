@@ -0,0 +1,120 @@
+"""
+The functions in here pool identical bays and gates, so the bay and gate assignment models
+only need decision variables for one representative of each pool. Instead of the pairwise
+time conflict constraints, the number of flights in a pool at the same time is limited to the
+number of bays or gates in it. After solving, the flights in a pool are assigned to its
+bays or gates with an interval colouring, see :func:`ooc.intervals.assign_lanes`.
+"""
+
+from ooc.intervals import assign_lanes
+
+
+def group_resources(keys, singletons):
+    """
+    :param list keys: Hashable key of each bay or gate. Resources with the same key are identical.
+    :param set singletons: Indices of the resources that are never pooled.
+    :return: List with the sorted list of resource indices in each pool, sorted by the first index,
+       which is the representative of the pool.
+    :rtype: list
+    """
+    pools = {}
+    for k, key in enumerate(keys):
+        pools.setdefault(("single", k) if k in singletons else key, []).append(k)
+    return sorted(pools.values())
+
+
+def bay_pools(flights):
+    """
+    Finds the pools of identical bays. Bays are identical if they have the same compliance,
+    fueling pits, terminal and gate distances, are all remote or not, and are in the same
+    airline preferences. Spare bays, bays with adjacency constraints and the current bays of
+    overnight flights are never pooled, since the constraints refer to the specific bay.
+
+    :param ooc.Flights flights: Flights object.
+    :return: List with the sorted list of bay indices in each pool, see :func:`group_resources`.
+    :rtype: list
+    """
+    airport = flights.airport
+
+    preferences = {frozenset(flight.preference.bays) for flight in flights.flight_schedule
+                   if flight.preference is not None}
+
+    singletons = set(flights.spare_bays)
+    for bay_pair in airport.adjacency:
+        singletons.update(bay_pair)
+    for group in flights.groups:
+        current = flights.flight_schedule[group.flight_idx[0]].current
+        if group.overnight and current is not None:
+            singletons.add(current.bay)
+
+    keys = []
+    for k in range(airport.n_bays):
+        keys.append((tuple(airport.bay_compliance_matrix[k].items()),
+                     airport.fueling[k],
+                     tuple(airport.terminal_bay_distance(terminal, k) for terminal in airport.terminal_names),
+                     tuple(airport.bay_gate_distance[k]),
+                     k in airport.remote_bays,
+                     tuple(k in bays for bays in preferences)))
+    return group_resources(keys, singletons)
+
+
+def gate_pools(gate_assignment):
+    """
+    Finds the pools of identical gates. Gates are identical if they have the same distance to
+    each bay, are all domestic, bussing or terminal A gates or not, and are in the same airline
+    preferences.
+
+    :param ooc.GateAssignment gate_assignment: Gate assignment of the schedule.
+    :return: List with the sorted list of gate indices in each pool, see :func:`group_resources`.
+    :rtype: list
+    """
+    flights = gate_assignment.flights
+    airport = gate_assignment.airport
+
+    preferences = {frozenset(flight.preference.gates) for flight in flights.flight_schedule
+                   if flight.preference is not None}
+
+    keys = []
+    for l in range(airport.n_gates):
+        keys.append((tuple(airport.bay_gate_distance[k][l] for k in range(airport.n_bays)),
+                     l in airport.domestic_gates,
+                     l in airport.bussing_gates,
+                     l in gate_assignment.terminal_a_gates,
+                     tuple(l in gates for gates in preferences)))
+    return group_resources(keys, set())
+
+
+def disaggregate(flights, pools, resources, follow_groups=False):
+    """
+    Assigns the flights assigned to the representative of a pool to the bays or gates in it.
+
+    :param ooc.Flights flights: Flights object.
+    :param list pools: List with the sorted list of resource indices in each pool.
+    :param list resources: Bay or gate index of each flight, which is the representative for
+       pooled resources, or None.
+    :param bool follow_groups: True to keep the parts of long stay flights on the same resource
+       whenever possible.
+    :return: List with the bay or gate index of each flight.
+    :rtype: list
+    """
+    resources = list(resources)
+    for pool in pools:
+        if len(pool) == 1:
+            continue
+
+        flight_idx = [i for i, resource in enumerate(resources) if resource == pool[0]]
+        windows = [flights.buffered_window(i) for i in flight_idx]
+
+        follows = None
+        if follow_groups:
+            position = {i: n for n, i in enumerate(flight_idx)}
+            follows = []
+            for i in flight_idx:
+                group_idx = flights.groups[flights.flight_group[i]].flight_idx
+                j = group_idx.index(i)
+                follows.append(position.get(group_idx[j - 1]) if j > 0 else None)
+
+        lanes = assign_lanes([eta for eta, _ in windows], [etd for _, etd in windows], len(pool), follows)
+        for i, lane in zip(flight_idx, lanes):
+            resources[i] = pool[lane]
+    return resources
@@ -241,7 +241,7 @@ class Airport:
                 bay_index = self.bay_names.index(bay_name)
 
                 # Create bay info list
-                bay_info = [(None if x is "x" else float(x)) for x in line_values[1:]]
+                bay_info = [(None if x == "x" else float(x)) for x in line_values[1:]]
 
                 # Add it to the bay compliance dict.
                 self.bay_gate_distance[bay_index] = bay_info
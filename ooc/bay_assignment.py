@@ -3,6 +3,8 @@ The class in here generates the code for the bay assignment.
 """
 
 from ooc import ft
+from ooc.intervals import maximal_cliques
+from ooc.profiling import NullProfiler
 
 
 class BayAssignment:
@@ -19,9 +21,36 @@ class BayAssignment:
        code. The code might exceed this limit since the check is done after
        new snippets have been added to the line, and for in some cases it's
        assumed that the line width will never reach the limit.
+
+    :param ooc.profiling.Profiler profiler: Optional profiler used to record the time
+       and size of each generated section of lp code.
+
+    :param flight_subset: Optional iterable with the indices of the flights to generate the
+       code for, eg. an independent component found by :func:`ooc.decomposition.bay_components`.
+       All three parts of long stay flights must be in the subset. The flight indices and
+       objective function weights are the same as for the complete schedule, so the
+       solutions of the subsets can be merged.
+
+    :param float beta: Optional weight for the airline preference objective function. It's
+       calculated from the flights if not given, see :meth:`ooc.Flights.beta`.
+
+    :param float gamma: Optional weight for the penalties. It's calculated from the flights
+       if not given, see :meth:`ooc.Flights.gamma`.
+
+    :param time_conflicts: Optional iterable with the ``(i, j)`` pairs of flights to generate
+       the single time slot constraints for. By default they are generated for all time
+       conflicting pairs. This is used to add these constraints lazily, see
+       :meth:`ooc.BayGateSolver.solve_bay_assignment_lazy`.
+
+    :param list pools: Optional list with the pools of identical bays, see :func:`ooc.aggregation.bay_pools`.
+       Decision variables are only created for the first bay of each pool, and the time
+       conflicts on pooled bays are replaced by capacity constraints on the flights overlapping
+       at the same moment. The solution has to be disaggregated afterwards, see
+       :func:`ooc.aggregation.disaggregate`.
     """
 
-    def __init__(self, flights, compact=True, line_width_limit=120, cplex=True):
+    def __init__(self, flights, compact=True, line_width_limit=120, cplex=True, profiler=None,
+                 flight_subset=None, beta=None, gamma=None, time_conflicts=None, pools=None):
         self.airport = flights.airport
         """"
         class:`ooc.Airport` object holding the information of
@@ -73,12 +102,12 @@ class BayAssignment:
         Weight for the passenger transport distance objective function.
         """
 
-        self.beta = self.flights.beta()
+        self.beta = self.flights.beta() if beta is None else beta
         """
         Weight for the airline preference objective function.
         """
 
-        self.gamma = self.flights.gamma()
+        self.gamma = self.flights.gamma() if gamma is None else gamma
         """
         Weight for the penalties.
         """
@@ -100,6 +129,43 @@ class BayAssignment:
         supported anymore, so this flag should always be ``True``.
         """
 
+        self.profiler = NullProfiler() if profiler is None else profiler
+        """
+        Profiler used to record the time and size of each generated section of lp code.
+        """
+
+        self.flight_idx = list(range(flights.n_flights)) if flight_subset is None else sorted(flight_subset)
+        """
+        Sorted list with the indices of the flights the code is generated for.
+        """
+
+        self.time_conflicts = None if time_conflicts is None else sorted(time_conflicts)
+        """
+        Sorted list with the ``(i, j)`` pairs of flights to generate the single time slot constraints
+        for, or ``None`` to generate them for all time conflicting pairs.
+        """
+
+        if pools is None:
+            pools = [[k] for k in range(self.airport.n_bays)]
+
+        self.bays = [pool[0] for pool in pools]
+        """
+        Sorted list with the indices of the bays to create decision variables for. These are the
+        representatives of the pools.
+        """
+
+        self.capacity = {pool[0]: len(pool) for pool in pools}
+        """
+        Dictionary with the number of bays in the pool of each representative bay.
+        """
+
+        # The splitted flight and fueling constraints link the parts of long stay flights.
+        flight_idx = set(self.flight_idx)
+        for g in self.flights.groups_of(self.flight_idx):
+            group_idx = self.flights.groups[g].flight_idx
+            if not set(group_idx) <= flight_idx:
+                raise Exception("The flight subset only contains a part of long stay flight '{}'.".format(group_idx[0]))
+
     def save_lp_file(self, path):
         with open(path, "w") as f:
             f.write(self.lp_code())
@@ -109,14 +175,17 @@ class BayAssignment:
         :return: lp code for solving the bay assignment problem.
         """
         print("Generating the cplex lp code for the bay assignment...")
-
-        constraint_single_bay_compliance = self.constraint_single_bay_compliance()
-        constraint_single_time_slot = self.constraint_single_time_slot()
-        constraint_fueling = self.constraint_fueling()
-        constraint_splitted_flight = self.constraint_splitted_flight()
-        constraint_adjacency = self.constraint_adjacency()
+        lp_section = self.profiler.lp_section
+
+        constraint_single_bay_compliance = lp_section("bay.constraint_single_bay_compliance",
+                                                      self.constraint_single_bay_compliance)
+        constraint_single_time_slot = lp_section("bay.constraint_single_time_slot", self.constraint_single_time_slot)
+        constraint_fueling = lp_section("bay.constraint_fueling", self.constraint_fueling)
+        constraint_splitted_flight = lp_section("bay.constraint_splitted_flight", self.constraint_splitted_flight)
+        constraint_adjacency = lp_section("bay.constraint_adjacency", self.constraint_adjacency)
         objective_function = self.objective_function()
-        binary_decision_variables_declaration = self.binary_decision_variables_declaration()
+        binary_decision_variables_declaration = lp_section("bay.binary_decision_variables_declaration",
+                                                           self.binary_decision_variables_declaration)
 
         if self.cplex:
             code = "\n".join([
@@ -152,8 +221,8 @@ class BayAssignment:
         z1 = "// Minimization of passenger transport distance\n    "
 
         # Loop through all flight and bay combinations.
-        for i in range(self.flights.n_flights):
-            for k in range(self.airport.n_bays):
+        for i in self.flight_idx:
+            for k in self.bays:
 
                 # Only add compliant flight bay combinations to the objective function.
                 # This combination was never created and thus the decision variable
@@ -201,12 +270,12 @@ class BayAssignment:
         z2 = "// Maximization of airline preference\n    "
 
         # Loop through all flight that have a preference.
-        for i in range(self.flights.n_flights):
+        for i in self.flight_idx:
 
             # Check whether a flight has some preference
             if self.flights.flight_schedule[i].preference is not None:
                 # Add a term for each bay the flight has NO preference for.
-                for k in range(self.airport.n_bays):
+                for k in self.bays:
                     # Only add terms for flight bay combinations that are valid.
                     if self.flights.bay_compliance(i, k):
                         preference = self.preference(i, k)
@@ -288,10 +357,12 @@ class BayAssignment:
         :rtype: string
         """
         # Create complete objective function by combining the three individual objective functions.
-        return "Minimize\n{}\n\n{}\n{}\n{}\n".format(self.of_min_passenger_transport_distance(),
-                                                     self.of_max_airline_preference(),
-                                                     self.of_penalty_values(),
-                                                     self.of_adjacency_penalties())
+        lp_section = self.profiler.lp_section
+        return "Minimize\n{}\n\n{}\n{}\n{}\n".format(
+            lp_section("bay.of_min_passenger_transport_distance", self.of_min_passenger_transport_distance),
+            lp_section("bay.of_max_airline_preference", self.of_max_airline_preference),
+            lp_section("bay.of_penalty_values", self.of_penalty_values),
+            lp_section("bay.of_adjacency_penalties", self.of_adjacency_penalties))
 
     def binary_decision_variables_declaration(self):
         """
@@ -413,13 +484,13 @@ class BayAssignment:
         c = "// Bay compliance and single bay per aircraft Constraint.\n"
 
         # Loop through each flight.
-        for i in range(self.flights.n_flights):
+        for i in self.flight_idx:
 
             # Start writing the constraint for this flight.
             c += "bc_{}:\n".format(i)
 
             # Loop through each bay and check whether it's compliant with the aircraft used in the flight.
-            for k in range(self.airport.n_bays):
+            for k in self.bays:
                 if self.flights.bay_compliance(i, k):
 
                     # If compliant add the term to the constraint's sum.
@@ -446,29 +517,81 @@ class BayAssignment:
         # Add a commend to the code to indicate where the single time slot constrains begin.
         c = "// Single time slot constraints.\n"
 
+        for i, j in self.time_conflicting_pairs():
+
+            # Loop through all bays. Pooled bays get capacity constraints instead.
+            for k in self.bays:
+
+                # Only add the constraint if both flights are compliant with the bay.
+                # If only one or none of them are compliant with the bay there will be
+                # no conflict on this particular bay thanks to the bay compliance constraint.
+                if self.capacity[k] == 1 and self.flights.bay_compliance(i, k) and self.flights.bay_compliance(j, k):
+                    c += "tc_{}_{}_{}: {:10s} + {:10s} <= 1;\n".format(i, j, k,
+                                                                       self.x(i, k),
+                                                                       self.x(j, k))
+
+        for k in self.bays:
+            if self.capacity[k] > 1:
+                c += self.constraint_capacity(k)
+        c += "\n"
+        return c
+
+    def constraint_capacity(self, k):
+        """
+        These constraints make sure that the number of flights assigned to a pool of identical
+        bays at the same moment doesn't exceed the number of bays in the pool. A constraint is
+        created for each maximal set of compliant flights overlapping in time that's larger than
+        the pool.
+
+        :param int k: Index of the representative bay of the pool.
+        :return: lp code for the capacity constraints of the pool.
+        :rtype: string
+        """
+        flight_idx = [i for i in self.flight_idx if self.flights.bay_compliance(i, k)]
+        windows = [self.flights.buffered_window(i) for i in flight_idx]
+
+        c = ""
+        for first, clique in maximal_cliques([eta for eta, _ in windows], [etd for _, etd in windows]):
+            if len(clique) > self.capacity[k]:
+                c += "cc_{}_{}:\n".format(k, flight_idx[first])
+                for n in clique:
+                    c += " + {:10s}".format(self.x(flight_idx[n], k))
+
+                    # Add new line if necessary
+                    if len(c.split("\n")[-1]) > self.line_width_limit:
+                        c += "\n"
+                c += " <= {};\n".format(self.capacity[k])
+        return c
+
+    def time_conflicting_pairs(self):
+        """
+        :return: Generator yielding the ``(i, j)`` pairs of flights the single time slot constraints
+           are generated for.
+        """
+        if self.time_conflicts is not None:
+            flight_idx = set(self.flight_idx)
+            for i, j in self.time_conflicts:
+                if i in flight_idx and j in flight_idx:
+                    yield i, j
+            return
+
+        # Use the index of the time conflicting flights if it's up to date.
+        index = self.flights.valid_index()
+        if index is not None:
+            yield from index.pairs(self.flight_idx)
+            return
+
         # i and j are flight indices.
         # Loop through all combinations of i and j.
-        for i in range(self.flights.n_flights):
+        for idx, i in enumerate(self.flight_idx):
 
-            # By starting index j at i + 1, we prevent adding the constraint for i == j and
+            # By starting with the flight after i, we prevent adding the constraint for i == j and
             # prevent doubling the constrains. The constraint for (i, j) is the same a (j, i)
-            for j in range(i + 1, self.flights.n_flights):
+            for j in self.flight_idx[idx + 1:]:
 
                 # Only add the constraint if the two flights conflict
                 if self.flights.time_conflict(i, j):
-
-                    # Loop through all bays.
-                    for k in range(self.airport.n_bays):
-
-                        # Only add the constraint if both flights are compliant with the bay.
-                        # If only one or none of them are compliant with the bay there will be
-                        # no conflict on this particular bay thanks to the bay compliance constraint.
-                        if self.flights.bay_compliance(i, k) and self.flights.bay_compliance(j, k):
-                            c += "tc_{}_{}_{}: {:10s} + {:10s} <= 1;\n".format(i, j, k,
-                                                                               self.x(i, k),
-                                                                               self.x(j, k))
-        c += "\n"
-        return c
+                    yield i, j
 
     def constraint_fueling(self):
         """
@@ -489,7 +612,7 @@ class BayAssignment:
         c = "// Fueling constrains\n"
 
         # Loop through each flight.
-        for i in range(self.flights.n_flights):
+        for i in self.flight_idx:
             # I'm way to tired right now to come up with names for these, so random letters.
             d = ""  # String holding the content of the constraint for this flight
             q = 0  # If 0, no constraint. If 1, departing non-domestic or full domestic. If 2, departing domestic.
@@ -502,7 +625,7 @@ class BayAssignment:
 
                 # Loop through each bay and add a term to the constraint's sum if it has a fueling port and
                 # the flight and bay combination is compliant.
-                for k in range(self.airport.n_bays):
+                for k in self.bays:
                     if self.airport.fueling[k] and self.flights.bay_compliance(i, k):
                         d += " + {}".format(self.x(i, k))
                         # Add new line if necessary
@@ -517,7 +640,7 @@ class BayAssignment:
 
                 # Loop through each bay and add a term to the constraint for both the parking and
                 # departing flights. Also checks whether the flight bay combination is compliant.
-                for k in range(self.airport.n_bays):
+                for k in self.bays:
                     if self.airport.fueling[k] and self.flights.bay_compliance(i, k):
                         d += " + {} + {}".format(self.x(i, k),
                                                  self.x(i - 1, k))
@@ -545,14 +668,16 @@ class BayAssignment:
 
         c = "// Splitted flights constraints\n"
 
-        # Loop through all flights.
-        for i in range(self.flights.n_flights):
+        # Loop through all flight groups.
+        for g in self.flights.groups_of(self.flight_idx):
+            group = self.flights.groups[g]
 
             # Check if this is a long stay flight.
-            if self.flights.flight_schedule[i].flight_type == ft.Arr:
+            if len(group.flight_idx) == 3:
+                i, i_park, i_dep = group.flight_idx
 
                 # Check if this is an overnight flight
-                if self.flights.is_overnight(i):
+                if group.overnight:
 
                     # Get current location. If the current location is unknown raise an error.
                     current_location = self.flights.flight_schedule[i].current
@@ -569,30 +694,30 @@ class BayAssignment:
 
                     # Set the soft constraint between the arrival and parking flight. (i) → (i+1)
                     c += "sp_{}_{}: {} + {} = 1; \n".format(i, k_current,
-                                                            self.x(i+1, k_current),
+                                                            self.x(i_park, k_current),
                                                             self.u(i, k_current))
 
                     # Set the soft constraint between the parking and departure flight. (i+1) → (i+2)
                     # The aircraft could have been moved  in the parking flight, so we have to create
                     # this constraint for all compliant bays.
-                    for k in range(self.airport.n_bays):
+                    for k in self.bays:
                         if self.flights.bay_compliance(i, k):
-                            c += "sp_{}_{}: {} - {} - {} + {} = 0; \n".format(i+1, k,
-                                                                              self.x(i + 1, k),
-                                                                              self.x(i + 2, k),
-                                                                              self.u(i + 1, k),
-                                                                              self.w(i + 1, k))
+                            c += "sp_{}_{}: {} - {} - {} + {} = 0; \n".format(i_park, k,
+                                                                              self.x(i_park, k),
+                                                                              self.x(i_dep, k),
+                                                                              self.u(i_park, k),
+                                                                              self.w(i_park, k))
                 else:
                     # This is not an overnight flight. So all three 'flights' have to be allocated.
                     # Loop through all compliant bays.
-                    for k in range(self.airport.n_bays):
+                    for k in self.bays:
                         if self.flights.bay_compliance(i, k):
                             c += "sp_{}_{}: {} - {} - {} + {} = 0;\n".format(i, k,
-                                                                             self.x(i, k), self.x(i + 1, k),
-                                                                             self.v(i, k), self.w(i + 1, k))
-                            c += "sp_{}_{}: {} - {} - {} + {} = 0;\n".format(i+1, k,
-                                                                             self.x(i + 1, k), self.x(i + 2, k),
-                                                                             self.v(i + 1, k), self.w(i + 2, k))
+                                                                             self.x(i, k), self.x(i_park, k),
+                                                                             self.v(i, k), self.w(i_park, k))
+                            c += "sp_{}_{}: {} - {} - {} + {} = 0;\n".format(i_park, k,
+                                                                             self.x(i_park, k), self.x(i_dep, k),
+                                                                             self.v(i_park, k), self.w(i_dep, k))
         c += "\n"
         return c
 
@@ -615,8 +740,8 @@ class BayAssignment:
         c = "// Adjacency constraint\n"
 
         # Loop through all combinations of flights
-        for i in range(self.flights.n_flights):
-            for j in range(i + 1, self.flights.n_flights):
+        for idx, i in enumerate(self.flight_idx):
+            for j in self.flight_idx[idx + 1:]:
                 # Only add the constraint for pairs of departing flights.
                 if self.flights.departing(i) and self.flights.departing(j):
                     # Loop through each pair of bays with adjacency constrains.
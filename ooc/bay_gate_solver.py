@@ -4,35 +4,34 @@ BayAssignment and GateAssignment classes, runs all of them and processes the res
 """
 
 from os import mkdir, remove
-from os.path import isdir, isfile, abspath, normpath, join
-import subprocess
+from os.path import isdir, isfile, abspath, normpath, join, getsize, dirname
+from glob import glob
+from collections import namedtuple
+import json
+import re
 import sys
 import xml.etree.ElementTree as ET  #: the extra-terrestrial
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from datetime import datetime, time
-import matplotlib.patches as mpatches
-import matplotlib.lines as mlines
 from time import perf_counter
 
 from ooc import print_color
-from ooc import Airport, Flights, BayAssignment, FlightSolution, GateAssignment, ft
-from ooc.key_pair_dictionary import KeyPairDictionary
-
-colors = [
-    ("#1f77b4", "#66b0e5"),  # 0 Blue
-    ("#17becf", "#5edfed"),  # 1 Cyan
-    ("#bcbd22", "#e4e467"),  # 2 Olive
-    ("#8c564b", "#c1948b"),  # 3 Brown
-    ("#ff7f0e", "#ffa04d"),  # 4 Orange
-    ("#d62728", "#e36868"),  # 5 Red
-    ("#7f7f7f", "#a6a6a6"),  # 6 Grey
-    ("#2ca02c", "#73d973"),  # 7 Green
-    ("#9467bd", "#b395d0"),  # 8 Purple
-    ("#e377c2", "#eeaad9"),  # 9 Pink
-]
+from ooc import Airport, Flights, BayAssignment, FlightSolution, GateAssignment
+from ooc.flight_solution import write_table, write_csv, save_npz
+from ooc.profiling import NullProfiler
+from ooc.lp_solvers import CplexSolver, InfeasibleError, solve_all, cplex_available
+from ooc.cplex_session import CplexSessionPool
+from ooc.compression import open_file, compress_file
+from ooc.decomposition import bay_components, gate_components, time_conflicting_pairs
+from ooc.aggregation import bay_pools, gate_pools, disaggregate
+from ooc.validation import validate
+from ooc.precheck import precheck
+from ooc.conflicts import refine_conflict, write_report
+
+
+LazyRoundType = namedtuple("LazyRoundType", ("n_time_conflicts", "n_violated", "code_generation", "solving"))
 """
-List of colors with dark and light version of each. Used for plotting.
+Named tuple holding the number of time conflicting flight pairs with constraints, the number
+of violated pairs found in the solution and the code generation and solving times of a single
+round of :meth:`BayGateSolver.solve_bay_assignment_lazy`.
 """
 
 
@@ -43,26 +42,74 @@ class BayGateSolver:
 
     :param string airport_path: Path to directory holding the airport data
     :param string flights_path: Path to directory holding the flights data.
-    :param string cplex_command: Terminal command to access the cplex interactive solver.
+    :param string cplex_command: Terminal command to access the cplex interactive solver. Use ``None``
+       to never run cplex.
     :param datetime.timedelta buffer_time: Amount of buffer time to add before and after
        each flight.
     :param list spare_bays: List of strings with the names of the spare bays.
     :param int line_width_limit: Line width limit for the generated LP code. Note since the line
        width is checked after appending, the code might exceed this limit with a few characters.
+    :param ooc.profiling.Profiler profiler: Optional profiler used to record the time spent in each
+       stage, eg. generating each lp section, writing the lp files, solving and loading the solutions.
+    :param lp_solver: Optional solver used to solve the lp files instead of the cplex interactive
+       solver, eg. :class:`ooc.lp_solvers.ScipySolver`. If given, ``cplex_command`` is ignored.
+    :param ooc.Flights flights: Optional flights object that has already been loaded. If given, the
+       airport and flight data are not loaded again and the data paths, ``buffer_time`` and
+       ``spare_bays`` are ignored. See :meth:`from_flights`.
+    :param bool compress: True to gzip compress the lp files ('.lp.gz', which cplex reads natively)
+       and to compress the solution files ('.sol.gz') once they are loaded in. Compressed files
+       in the workspace are always read transparently.
+    :param int cplex_sessions: Optional number of interactive cplex sessions to keep alive and
+       solve the lp files in, see :class:`ooc.cplex_session.CplexSessionPool`. By default a new
+       cplex process is started for each lp file. The sessions stay alive for all solves of this
+       object until :meth:`close` is called, or the object is used as a context manager. Pass a
+       pool as ``lp_solver`` to share the sessions between multiple objects.
+    :param bool refine_conflicts: True to find the conflicting constraints when a model turns out
+       to be infeasible, see :meth:`refine_conflict`. The conflict is written to a report in the
+       workspace before the exception is raised.
     """
 
     def __init__(self, airport_data_path, flights_data_path, jid, cplex_command="cplex", buffer_time=None,
-                 spare_bays=None, line_width_limit=120):
+                 spare_bays=None, line_width_limit=120, profiler=None, lp_solver=None, flights=None,
+                 compress=False, cplex_sessions=None, refine_conflicts=False):
         self.line_width_limit = line_width_limit
 
-        self.airport = Airport(airport_data_path=airport_data_path)
+        self.refine_conflicts = refine_conflicts
+        """
+        True to write a conflict report to the workspace when a model turns out to be infeasible.
+        """
+
+        self.compress = compress
+        """
+        True to compress the lp and solution files in the workspace.
+        """
+        lp_extension = ".lp.gz" if compress else ".lp"
+
+        if flights is not None:
+            airport_data_path = dirname(flights.airport.airlines_path)
+            flights_data_path = dirname(flights.flight_data_path)
+
+        self.profiler = NullProfiler() if profiler is None else profiler
+        """
+        Profiler used to record the time spent in each stage.
+        """
+
+        self.airport_data_path = abspath(airport_data_path)
+        """Path to the directory holding the airport data."""
+
+        self.flights_data_path = abspath(flights_data_path)
+        """Path to the directory holding the flights data."""
+
+        self.airport = Airport(airport_data_path=airport_data_path) if flights is None else flights.airport
         """"
         class:`ooc.Airport` object of holding the information of
         the target airport.
         """
 
-        self.flights = Flights(flight_data_path=flights_data_path, airport=self.airport, buffer_time=buffer_time,
-                               spare_bays=spare_bays)
+        if flights is None:
+            flights = Flights(flight_data_path=flights_data_path, airport=self.airport, buffer_time=buffer_time,
+                              spare_bays=spare_bays)
+        self.flights = flights
         """
         class:`ooc.Flights` object holding the information of all
         flights of the day
@@ -81,42 +128,95 @@ class BayGateSolver:
 
         self.solutions = []  # List holding the final solution.
 
+        self.timings = {}
+        """
+        Dictionary holding the code generation and solving times of the last runs. The keys
+        are 'bay_code_generation', 'bay_solving', 'gate_code_generation' and 'gate_solving'.
+        """
+
+        self.lazy_rounds = []
+        """
+        List with a :class:`LazyRoundType` per round of the last lazy bay assignment solve.
+        """
+
         self.init_workspace()  # Initialize workspace.
         self.init_solution_list()
 
         # Create a few path to relevant paths.
-        self.bay_lp_path = normpath(join(self.workspace_path, "bay.lp"))
+        self.bay_lp_path = normpath(join(self.workspace_path, "bay" + lp_extension))
         self.bay_sol_path = normpath(join(self.workspace_path, "bay.sol"))
-        self.gate_lp_path = normpath(join(self.workspace_path, "gate.lp"))
+        self.gate_lp_path = normpath(join(self.workspace_path, "gate" + lp_extension))
         self.gate_sol_path = normpath(join(self.workspace_path, "gate.sol"))
         self.result_path = normpath(join(self.workspace_path, "result.csv"))
+        self.result_npz_path = normpath(join(self.workspace_path, "result.npz"))
+
+        self.lp_solver = lp_solver
+        """
+        Solver used to solve the lp files, eg. :class:`ooc.lp_solvers.CplexSolver`. If ``None`` the
+        lp files have to be solved separately.
+        """
+
+        self.owns_lp_solver = False
+        """
+        True if the solver was created by this object, in which case it's closed by :meth:`close`.
+        """
+
+        if lp_solver is not None:
+            self.cplex_command = None
+            return
 
         # Check whether we can access cplex from the command line.
-        try:
-            # For some reason the 'subprocess.run' function does not work like described in the documentation in
-            # linux. So after some trail and error I got it working by giving it a list with
-            if sys.platform == "linux":
-                args = [cplex_command + " -c help"]
-            else:  # This works on Windows. Probably also MAC since this is the behaviour described in the documentation
-                args = [cplex_command, "-c", "help"]
-            result = subprocess.run(args,
-                                    shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if cplex_command is None:
+            # Cplex was explicitly disabled, the solver will have to be run separately.
+            self.cplex_command = None
+            return
 
+        # The result of the probe is cached, so cplex is only started once per process.
+        if cplex_available(cplex_command):
             # We can. Store command for later use.
-            if len(result.stderr):
-                print_color.pr_r(
-                    "Warning: Cplex was not found. Please check whether the cplex command is correct. Otherwise cplex "
-                    "will have to be run separately.")
-                self.cplex_command = None
+            self.cplex_command = cplex_command
+            if cplex_sessions:
+                self.lp_solver = CplexSessionPool(cplex_command, size=cplex_sessions)
+                self.owns_lp_solver = True
             else:
-                self.cplex_command = cplex_command
-        except OSError:
+                self.lp_solver = CplexSolver(cplex_command)
+        else:
             # We can't. We'll have to run the solver manually.
             print_color.pr_r(
                 "Warning: Cplex was not found. Please check whether the cplex command is correct. Otherwise cplex "
                 "will have to be run separately.")
             self.cplex_command = None
 
+    def close(self):
+        """
+        Closes the cplex sessions started for ``cplex_sessions``. A solver passed in as ``lp_solver`` is
+        owned by the caller and is left open.
+        """
+        if self.owns_lp_solver:
+            self.lp_solver.close()
+            self.lp_solver = None
+            self.owns_lp_solver = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @classmethod
+    def from_flights(cls, flights, jid, **kwargs):
+        """
+        Creates a solver for an already loaded flights object, so the airport and flight data don't
+        have to be parsed again, eg. when solving the same schedule with different parameters.
+
+        :param ooc.Flights flights: Flights object.
+        :param string jid: Job id.
+        :param kwargs: Other arguments passed on to the constructor, eg. ``lp_solver``.
+        :return: New solver.
+        :rtype: BayGateSolver
+        """
+        return cls(None, None, jid, flights=flights, **kwargs)
+
     def init_workspace(self):
         """
         This function initializes the workspace directory used to store the generated code files and results.
@@ -153,65 +253,353 @@ class BayGateSolver:
             solution.ac_type = flight.ac_type
             solution.pref = flight.preference
 
-    def solve_bay_assignment(self):
+    def solve_bay_assignment(self, decompose=False, processes=None, aggregate=False):
         """
         Generates the lp code needed to solve the bay assignment,
         solves it using cplex and loads in the solution.
+
+        :param bool decompose: True to split the bay assignment in independent components, see
+           :func:`ooc.decomposition.bay_components`. Each component is written to it's own lp file
+           ('bay_<n>.lp') and the components are solved in parallel.
+        :param int processes: Maximum number of components solved at the same time. Defaults to the
+           number of processors.
+        :param bool aggregate: True to pool identical bays, see :func:`ooc.aggregation.bay_pools`.
+           The pools are saved in the workspace ('bay_pools.json'), so the solution can be
+           disaggregated when it's loaded in. The objective value is the one of the pooled model.
         """
         t0 = perf_counter()
-        bay_assignment = BayAssignment(self.flights, line_width_limit=self.line_width_limit)
+
+        if aggregate:
+            with self.profiler.section("bay.aggregate") as section:
+                pools = bay_pools(self.flights)
+                section["n_pools"] = len(pools)
+        else:
+            pools = None
+        self.save_pools("bay", pools)
+
+        if decompose:
+            with self.profiler.section("bay.decompose") as section:
+                components = bay_components(self.flights)
+                section["n_components"] = len(components)
+            lp_paths, sol_paths = self.component_paths("bay", len(components))
+        else:
+            components = [None]
+            lp_paths, sol_paths = [self.bay_lp_path], [self.bay_sol_path]
+
+        # The objective function weights depend on all flights, so they are calculated once.
+        beta = self.flights.beta()
+        gamma = self.flights.gamma()
 
         # Generate and save lp code.
-        with open(self.bay_lp_path, "w") as f:
-            f.write(bay_assignment.lp_code())
+        for flight_subset, lp_path in zip(components, lp_paths):
+            bay_assignment = BayAssignment(self.flights, line_width_limit=self.line_width_limit,
+                                           profiler=self.profiler, flight_subset=flight_subset,
+                                           beta=beta, gamma=gamma, pools=pools)
+            with self.profiler.section("bay.lp_code"):
+                code = bay_assignment.lp_code()
+            self.write_lp_file(lp_path, code, "bay.write_lp")
         dt_code_generation = perf_counter() - t0
         dt_solving = 0
 
-        if self.cplex_command is not None:
-            print("Solving bay assignment with cplex...")
-            # Remove old solution file
-            if isfile(self.bay_sol_path):
-                remove(self.bay_sol_path)
-
-            # Try to solve it.
-            # For some reason the 'subprocess.run' function does not work like described in the documentation in
-            # linux. So after some trail and error I got it working by giving it a list with
-            if sys.platform == "linux":
-                args = [self.cplex_command + " -c 'read {}' optimize 'write {}'".format(
-                self.bay_lp_path, self.bay_sol_path
-            )]
-            else:  # This works on Windows. Probably also MAC since this is the behaviour described in the documentation
-                args = [
-                    self.cplex_command,
-                    "-c",
-                    "read {}".format(self.bay_lp_path,),
-                    "optimize",
-                    "write {}".format(self.bay_sol_path)]
+        if self.lp_solver is not None:
+            print("Solving bay assignment...")
+            # Remove old solution files, so they are not loaded in together with the new ones.
+            self.remove_solutions("bay")
+
             t0 = perf_counter()
-            subprocess.run(args,
-                           shell=True,)
+            try:
+                with self.profiler.section("bay.solve", n_problems=len(lp_paths)):
+                    solve_all(self.lp_solver, lp_paths, sol_paths, processes)
+            except InfeasibleError as e:
+                if not self.refine_conflicts:
+                    raise
+                self.raise_conflict("bay", e.lp_path, e)
             dt_solving = perf_counter() - t0
 
-            if not isfile(self.bay_sol_path):
-                raise Exception("No solution file was generated for the bay assignment.")
+            self.check_solution_files("bay", lp_paths, sol_paths)
 
             print("Bay assignment solved\n")
         else:
             print("Cplex is not available in the command line.\n"
-                  "The bay assignment lp code was generated and saved at\n{}\n".format(self.bay_lp_path) +
-                  "Please solve it in cplex and save the resulting .sol (xml) file at\n{}\n".format(self.bay_sol_path))
+                  "The bay assignment lp code was generated and saved at\n{}\n".format("\n".join(lp_paths)) +
+                  "Please solve it in cplex and save the resulting .sol (xml) file at\n{}\n".format(
+                      "\n".join(sol_paths)))
+
+        self.timings["bay_code_generation"] = dt_code_generation
+        self.timings["bay_solving"] = dt_solving
+        return dt_code_generation, dt_solving
+
+    def solve_bay_assignment_lazy(self, max_rounds=100):
+        """
+        Solves the bay assignment while adding the single time slot constraints lazily. Most of
+        these constraints are never binding, so the problem is first solved without them. Then
+        the flights sharing a bay at the same time are found in the solution and the constraints
+        of these pairs are added before solving again. This is repeated until the solution has no
+        time conflicts, in which case it's also the optimal solution of the complete problem.
+        The solution is loaded in at the end. The rounds are recorded in :attr:`lazy_rounds`.
+
+        :param int max_rounds: Maximum number of rounds.
+        :return: Tuple with the total code generation and solving times.
+        """
+        if self.lp_solver is None:
+            raise Exception("Solving the bay assignment lazily requires a solver, "
+                            "since the lp code has to be solved multiple times.")
+
+        beta = self.flights.beta()
+        gamma = self.flights.gamma()
+        time_conflicts = set()
+        self.save_pools("bay", None)
+        self.lazy_rounds = []
+
+        for _ in range(max_rounds):
+            t0 = perf_counter()
+            bay_assignment = BayAssignment(self.flights, line_width_limit=self.line_width_limit,
+                                           profiler=self.profiler, beta=beta, gamma=gamma,
+                                           time_conflicts=time_conflicts)
+            with self.profiler.section("bay.lp_code"):
+                code = bay_assignment.lp_code()
+            self.write_lp_file(self.bay_lp_path, code, "bay.write_lp")
+            dt_code_generation = perf_counter() - t0
+
+            print("Solving bay assignment, round {}...".format(len(self.lazy_rounds) + 1))
+            self.remove_solutions("bay")
+            t0 = perf_counter()
+            with self.profiler.section("bay.solve", n_problems=1):
+                self.lp_solver.solve(self.bay_lp_path, self.bay_sol_path)
+            dt_solving = perf_counter() - t0
+            if not isfile(self.bay_sol_path):
+                raise Exception("No solution file was generated for the bay assignment.")
 
+            # Load in the solution and find the flights sharing a bay at the same time.
+            for solution in self.solutions:
+                solution.bay_idx = None
+                solution.bay = None
+            self.load_bay_assignment_solution()
+
+            flights_per_bay = {}
+            for i, solution in enumerate(self.solutions):
+                flights_per_bay.setdefault(solution.bay_idx, []).append(i)
+            violated = set()
+            for flight_idx in flights_per_bay.values():
+                violated.update(time_conflicting_pairs(self.flights, flight_idx))
+
+            self.lazy_rounds.append(LazyRoundType(n_time_conflicts=len(time_conflicts),
+                                                  n_violated=len(violated),
+                                                  code_generation=dt_code_generation,
+                                                  solving=dt_solving))
+            if not violated:
+                break
+            time_conflicts |= violated
+        else:
+            raise Exception("The bay assignment still has time conflicts after {} rounds.".format(max_rounds))
+
+        print("Bay assignment solved in {} rounds\n".format(len(self.lazy_rounds)))
+        dt_code_generation = sum(round_.code_generation for round_ in self.lazy_rounds)
+        dt_solving = sum(round_.solving for round_ in self.lazy_rounds)
+        self.timings["bay_code_generation"] = dt_code_generation
+        self.timings["bay_solving"] = dt_solving
         return dt_code_generation, dt_solving
 
+    def check_solution_files(self, name, lp_paths, sol_paths):
+        """
+        Checks whether a solution file was generated for each lp file. Solvers that don't report
+        infeasible models, like the cplex interactive solver, just don't write a solution. So if
+        :attr:`refine_conflicts` is set, the conflict of the model is searched for. If the model
+        turns out to have no conflict, the error raised while searching for it is chained to
+        the exception.
+
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :param list lp_paths: Paths to the lp files.
+        :param list sol_paths: Paths to the solution files.
+        """
+        for lp_path, sol_path in zip(lp_paths, sol_paths):
+            if not isfile(sol_path):
+                message = "No solution file was generated for the {} assignment.".format(name)
+                if not self.refine_conflicts:
+                    raise Exception(message)
+                try:
+                    report_path = self.refine_conflict(name, lp_path)
+                except Exception as e:
+                    raise Exception(message) from e
+                raise Exception("{} The conflicting constraints were written to {}.".format(message, report_path))
+
+    def raise_conflict(self, name, lp_path, error):
+        """
+        Writes the conflict report of a model the solver reported as infeasible and raises an
+        exception pointing to it.
+
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :param string lp_path: Path to the infeasible lp file.
+        :param ooc.lp_solvers.InfeasibleError error: Exception raised by the solver.
+        """
+        report_path = self.refine_conflict(name, lp_path)
+        raise Exception("The {} assignment is infeasible. The conflicting constraints were written "
+                        "to {}.".format(name, report_path)) from error
+
+    def refine_conflict(self, name, lp_path=None):
+        """
+        Finds the conflicting constraints of an infeasible model, see :func:`ooc.conflicts.refine_conflict`,
+        and writes them to a report next to the lp file, eg. 'bay_conflict.txt'. The cplex conflict
+        refiner is used if cplex is available, either through the cplex command or in a session
+        of the :class:`ooc.cplex_session.CplexSessionPool` used to solve the lp files.
+
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :param string lp_path: Path to the lp file. Defaults to the lp file of the complete problem.
+        :return: Path to the report.
+        :rtype: string
+        """
+        if lp_path is None:
+            lp_path = self.bay_lp_path if name == "bay" else self.gate_lp_path
+        report_path = re.sub(r"\.lp(\.gz)?$", "", lp_path) + "_conflict.txt"
+
+        print("Refining the conflict of '{}'...".format(lp_path))
+        with self.profiler.section(name + ".refine_conflict") as section:
+            if isinstance(self.lp_solver, CplexSessionPool):
+                rows = refine_conflict(lp_path, name, self.flights, session_pool=self.lp_solver)
+            elif isinstance(self.lp_solver, CplexSolver):
+                rows = refine_conflict(lp_path, name, self.flights, self.lp_solver.command)
+            else:
+                rows = refine_conflict(lp_path, name, self.flights, self.cplex_command)
+            section["n_rows"] = len(rows)
+        write_report(report_path, rows, lp_path)
+        return report_path
+
+    def pools_path(self, name):
+        """
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :return: Path to the file with the pools of identical bays or gates of the problem.
+        """
+        return normpath(join(self.workspace_path, name + "_pools.json"))
+
+    def save_pools(self, name, pools):
+        """
+        Saves the pools of identical bays or gates the problem is solved with to the workspace.
+
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :param list pools: List with the sorted list of resource indices in each pool, or ``None``
+           if the problem is not aggregated, in which case an old pools file is removed.
+        """
+        path = self.pools_path(name)
+        if pools is not None:
+            with open(path, "w") as f:
+                json.dump(pools, f)
+        elif isfile(path):
+            remove(path)
+
+    def load_pools(self, name):
+        """
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :return: List with the pools of identical bays or gates the problem was solved with, or ``None``
+           if the problem was not aggregated.
+        """
+        path = self.pools_path(name)
+        if not isfile(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def component_paths(self, name, n):
+        """
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :param int n: Number of components.
+        :return: Tuple with the lists of lp and solution file paths of the components.
+        """
+        lp_extension = ".lp.gz" if self.compress else ".lp"
+        return ([normpath(join(self.workspace_path, "{}_{}{}".format(name, c, lp_extension))) for c in range(n)],
+                [normpath(join(self.workspace_path, "{}_{}.sol".format(name, c))) for c in range(n)])
+
+    def solution_paths(self, name):
+        """
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :return: List with the paths of the solution files in the workspace. This is either the
+           solution of the complete problem or the solutions of all of it's components. The
+           solution files might be compressed ('.sol.gz').
+        """
+        for extension in [".sol", ".sol.gz"]:
+            path = normpath(join(self.workspace_path, name + extension))
+            if isfile(path):
+                return [path]
+
+        pattern = re.compile(re.escape(name) + r"_(\d+)\.sol(\.gz)?$")
+        paths = {}
+        for path in glob(join(self.workspace_path, name + "_*.sol*")):
+            match = pattern.search(path)
+            if match:
+                paths[int(match.group(1))] = path
+        return [paths[c] for c in sorted(paths)]
+
+    def objective_value(self, name):
+        """
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        :return: Objective value of the solution in the workspace. If the problem was decomposed,
+           this is the sum of the objective values of all components.
+        :rtype: float
+        """
+        sol_paths = self.solution_paths(name)
+        if not sol_paths:
+            raise Exception("No {} assignment solution file was found.".format(name))
+        return sum(float(self.parse_solution_file(path).find("header").get("objectiveValue")) for path in sol_paths)
+
+    def parse_solution_file(self, path):
+        """
+        :param string path: Path to the (compressed) cplex solution file.
+        :return: Root element of the solution xml file.
+        """
+        with open_file(path, "rb") as f:
+            return ET.parse(f).getroot()
+
+    def compress_solutions(self, name):
+        """
+        Compresses the uncompressed solution files of a problem in the workspace.
+
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        """
+        for path in self.solution_paths(name):
+            if not path.endswith(".gz"):
+                compress_file(path)
+
+    def remove_solutions(self, name):
+        """
+        Removes the solution files of a problem and it's components from the workspace.
+
+        :param string name: Name of the problem, ie. 'bay' or 'gate'.
+        """
+        paths = glob(join(self.workspace_path, name + "_*.sol")) + glob(join(self.workspace_path, name + "_*.sol.gz"))
+        for extension in [".sol", ".sol.gz"]:
+            if isfile(join(self.workspace_path, name + extension)):
+                paths.append(join(self.workspace_path, name + extension))
+        for path in paths:
+            remove(path)
+
+    def write_lp_file(self, path, code, section_name):
+        """
+        Writes generated lp code to a file.
+
+        :param string path: Path to the lp file. It's compressed if the path ends with '.gz'.
+        :param string code: Lp code.
+        :param string section_name: Name of the profiler section.
+        """
+        with self.profiler.section(section_name) as section:
+            with open_file(path, "w") as f:
+                f.write(code)
+            section["bytes"] = getsize(path)
+
     def load_bay_assignment_solution(self):
+        with self.profiler.section("bay.load_solution"):
+            self._load_bay_assignment_solution()
+
+    def _load_bay_assignment_solution(self):
         # Check whether there is a solution file in the workspace.
-        if not isfile(self.bay_sol_path):
+        sol_paths = self.solution_paths("bay")
+        if not sol_paths:
             raise Exception("No bay assignment solution file was found at {}.".format(self.bay_sol_path))
 
-        # Load in xml file outputted by cplex
-        CPLEXSolution = ET.parse(self.bay_sol_path).getroot()
+        # Load in the xml files outputted by cplex. There is one per component if the problem was decomposed.
+        variable_elements = []
+        for sol_path in sol_paths:
+            CPLEXSolution = self.parse_solution_file(sol_path)
+            variable_elements.extend(CPLEXSolution.findall("variables/variable"))
 
-        variable_elements = CPLEXSolution.findall("variables/variable")
         for element in variable_elements:
             # Check whether the variable element is for one of the X decision variables.
             name = element.get("name")
@@ -232,71 +620,120 @@ class BayGateSolver:
         for i, solution in enumerate(self.solutions):
             assert solution.bay is not None, "Flight {} has no bay assigned to it.".format(i)
 
-    def solve_gate_assignment(self):
+        # Assign the flights in pools of identical bays to the bays in the pool.
+        pools = self.load_pools("bay")
+        if pools is not None:
+            bays = disaggregate(self.flights, pools, [solution.bay_idx for solution in self.solutions],
+                                follow_groups=True)
+            for solution, k in zip(self.solutions, bays):
+                solution.bay_idx = k
+                solution.bay = self.airport.bay_names[k]
+
+        if self.compress:
+            self.compress_solutions("bay")
+
+    def solve_gate_assignment(self, decompose=False, processes=None, aggregate=False):
+        """
+        Generates the lp code needed to solve the gate assignment and solves it using cplex.
+        The bay assignment solution must have been loaded in.
+
+        :param bool decompose: True to split the gate assignment in independent components, see
+           :func:`ooc.decomposition.gate_components`. Each component is written to it's own lp file
+           ('gate_<n>.lp') and the components are solved in parallel.
+        :param int processes: Maximum number of components solved at the same time. Defaults to the
+           number of processors.
+        :param bool aggregate: True to pool identical gates, see :func:`ooc.aggregation.gate_pools`.
+           The pools are saved in the workspace ('gate_pools.json'), so the solution can be
+           disaggregated when it's loaded in.
+        """
         t0 = perf_counter()
 
         bays = [solution.bay_idx for solution in self.solutions]
         if bays[0] is None:
             raise Exception("No bay assignment solutions has been loaded.")
 
-        gate_assignment = GateAssignment(self.flights, bays, line_width_limit=self.line_width_limit)
+        gate_assignment = GateAssignment(self.flights, bays)
+        if aggregate:
+            with self.profiler.section("gate.aggregate") as section:
+                pools = gate_pools(gate_assignment)
+                section["n_pools"] = len(pools)
+        else:
+            pools = None
+        self.save_pools("gate", pools)
+
+        if decompose:
+            with self.profiler.section("gate.decompose") as section:
+                components = gate_components(gate_assignment if pools is None else
+                                             GateAssignment(self.flights, bays, pools=pools))
+                section["n_components"] = len(components)
+            lp_paths, sol_paths = self.component_paths("gate", len(components))
+        else:
+            components = [None]
+            lp_paths, sol_paths = [self.gate_lp_path], [self.gate_sol_path]
+
+        # The objective function weights depend on all departing flights and all gates, so they are calculated
+        # once on the unpooled problem. This way the pooled and decomposed problems have the same objective.
+        weights = gate_assignment.weights() if decompose or aggregate else None
 
         # Generate and save lp code.
-        with open(self.gate_lp_path, "w") as f:
-            f.write(gate_assignment.lp_code())
+        for flight_subset, lp_path in zip(components, lp_paths):
+            gate_assignment = GateAssignment(self.flights, bays, line_width_limit=self.line_width_limit,
+                                             profiler=self.profiler, flight_subset=flight_subset, weights=weights,
+                                             pools=pools)
+            with self.profiler.section("gate.lp_code"):
+                code = gate_assignment.lp_code()
+            self.write_lp_file(lp_path, code, "gate.write_lp")
 
         dt_code_generation = perf_counter() - t0
         dt_solving = 0
 
-        if self.cplex_command is not None:
-            print("Solving gate assignment with cplex...")
-            # Remove old solution file
-            if isfile(self.gate_sol_path):
-                remove(self.gate_sol_path)
-
-            # Try to solve it.
-            # For some reason the 'subprocess.run' function does not work like described in the documentation in
-            # linux. So after some trail and error I got it working by giving it a list with
-            if sys.platform == "linux":
-                args = [self.cplex_command + " -c 'read {}' optimize 'write {}'".format(
-                self.gate_lp_path, self.gate_sol_path)]
-            else:  # This works on Windows. Probably also MAC since this is the behaviour described in the documentation
-                args = [
-                    self.cplex_command,
-                    "-c",
-                    "read {}".format(self.gate_lp_path,),
-                    "optimize",
-                    "write {}".format(self.gate_sol_path)]
+        if self.lp_solver is not None:
+            print("Solving gate assignment...")
+            # Remove old solution files, so they are not loaded in together with the new ones.
+            self.remove_solutions("gate")
 
             try:
                 t0 = perf_counter()
-                subprocess.run(args,
-                               shell=True)
+                with self.profiler.section("gate.solve", n_problems=len(lp_paths)):
+                    solve_all(self.lp_solver, lp_paths, sol_paths, processes)
                 dt_solving = perf_counter() - t0
             except KeyboardInterrupt:
                 # By handling this exception we can cancel cplex and get the intermediate solution.
                 pass
+            except InfeasibleError as e:
+                if not self.refine_conflicts:
+                    raise
+                self.raise_conflict("gate", e.lp_path, e)
 
-            if not isfile(self.gate_sol_path):
-                raise Exception("No solution file was generated for the gate assignment.")
+            self.check_solution_files("gate", lp_paths, sol_paths)
 
             print("Gate assignment solved\n")
         else:
             print("Cplex is not available in the command line.\n"
-                  "The gate assignment lp code was generated and saved at\n{}\n".format(self.gate_lp_path) +
-                  "Please solve it in cplex and save the resulting .sol (xml) file at\n{}\n".format(self.gate_sol_path))
+                  "The gate assignment lp code was generated and saved at\n{}\n".format("\n".join(lp_paths)) +
+                  "Please solve it in cplex and save the resulting .sol (xml) file at\n{}\n".format(
+                      "\n".join(sol_paths)))
 
+        self.timings["gate_code_generation"] = dt_code_generation
+        self.timings["gate_solving"] = dt_solving
         return dt_code_generation, dt_solving
 
     def load_gate_assignment_solution(self):
+        with self.profiler.section("gate.load_solution"):
+            self._load_gate_assignment_solution()
+
+    def _load_gate_assignment_solution(self):
         # Check whether there is a solution file in the workspace.
-        if not isfile(self.gate_sol_path):
-            raise Exception("No gate assignment solution file was found at {}.".format(self.bay_sol_path))
+        sol_paths = self.solution_paths("gate")
+        if not sol_paths:
+            raise Exception("No gate assignment solution file was found at {}.".format(self.gate_sol_path))
 
-        # Load in xml file outputted by cplex
-        CPLEXSolution = ET.parse(self.gate_sol_path).getroot()
+        # Load in the xml files outputted by cplex. There is one per component if the problem was decomposed.
+        variable_elements = []
+        for sol_path in sol_paths:
+            CPLEXSolution = self.parse_solution_file(sol_path)
+            variable_elements.extend(CPLEXSolution.findall("variables/variable"))
 
-        variable_elements = CPLEXSolution.findall("variables/variable")
         for element in variable_elements:
             # Check whether the variable element is for one of the X decision variables.
             name = element.get("name")
@@ -320,189 +757,84 @@ class BayGateSolver:
             if self.flights.departing(i):
                 assert solution.bay is not None, "Flight {} has no bay assigned to it.".format(i)
 
-    def print_solution(self):
+        # Assign the flights in pools of identical gates to the gates in the pool.
+        pools = self.load_pools("gate")
+        if pools is not None:
+            gates = disaggregate(self.flights, pools, [solution.gate_idx for solution in self.solutions])
+            for solution, l in zip(self.solutions, gates):
+                if l is not None:
+                    solution.gate_idx = l
+                    solution.gate = self.airport.gate_names[l]
+
+        if self.compress:
+            self.compress_solutions("gate")
+
+    def validate(self):
+        """
+        Checks the loaded solutions against the hard rules of the bay and gate assignment.
+        See :func:`ooc.validation.validate`.
+
+        :return: List with the violations.
+        :rtype: list
         """
-        Returns a string with the solutions
+        return validate(self.solutions)
 
-        :return:
+    def precheck(self):
         """
-        # Get the table header.
-        s = self.solutions[0].str_heading()
+        Checks whether the bay assignment can be feasible before generating any lp code.
+        See :func:`ooc.precheck.precheck`.
 
-        # Loop through each solution to get it's values.
-        for solution in self.solutions:
-            s += solution.str_data()
+        :return: List with the issues found.
+        :rtype: list
+        """
+        with self.profiler.section("bay.precheck") as section:
+            issues = precheck(self.flights)
+            section["n_issues"] = len(issues)
+        return issues
 
-        # Print the table to the console.
-        print(s)
+    def print_solution(self):
+        """
+        Prints a table with the solutions to the console.
+        """
+        # The rows are streamed to the console one at a time.
+        write_table(self.solutions, sys.stdout)
+        print()
 
     def save_csv(self):
         """
         Saves the result to a csv file in the workspace directory named 'result.csv'.
-
-        :return:
         """
+        with open(self.result_path, "w", newline="") as f:
+            write_csv(self.solutions, f)
 
-        # Get the csv table header.
-        s = self.solutions[0].csv_heading()
-
-        # Loop through each solution to get it's values
-        for solution in self.solutions:
-            s += solution.csv_data()
-
-        # Open the csv file and write the table to it.
-        with open(self.result_path, "w") as f:
-            f.write(s)
-
-    def create_bay_assignment_chart(self, title):
-        # Create a new figure.
-        fig = plt.figure(figsize=(8, 8))
+    def save_npz(self):
+        """
+        Saves the result to a compressed columnar numpy file in the workspace directory
+        named 'result.npz'.
+        """
+        save_npz(self.solutions, self.result_npz_path)
 
-        # Set the y-axis tick labels to bay names
-        plt.yticks(range(self.airport.n_bays), self.airport.bay_names)
+    def create_bay_assignment_chart(self, title, path=None):
+        """
+        Creates a Gantt chart of the bay assignment. See :func:`ooc.charts.bay_assignment_chart`.
 
-        # Format the x-axis so it displays the time of the day.
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        plt.gca().xaxis.set_major_locator(mdates.HourLocator())
-        plt.ylim([-1, self.airport.n_bays])
+        :param string title: Title of the chart.
+        :param string path: If given, the chart is saved to this file instead of being created
+           with pyplot. The format is derived from the extension, eg. png or svg.
+        :return: Matplotlib figure.
+        """
+        # Matplotlib is only imported once the first chart is created.
+        from ooc.charts import bay_assignment_chart
+        return bay_assignment_chart(self, title, path)
 
-        reposition_idx = 0
+    def create_gate_assignment_chart(self, title, path=None):
+        """
+        Creates a Gantt chart of the gate assignment. See :func:`ooc.charts.gate_assignment_chart`.
 
-        # Loop through each solution
-        for i, solution in enumerate(self.solutions):
-            # Set the color based on flight type.
-            if self.flights.domestic(i, True):  # Blue for domestic flights
-                color = colors[0]
-            elif self.flights.airline(i) == "KQ":  # Red for non-domestic KQ flights.
-                color = colors[5]
-            else:  # And the rest green
-                color = colors[2]
-
-            # If this is a park flight use the light color, otherwise dark.
-            color = color[1] if solution.flight_type == ft.Park else color[0]
-
-            # If it's part of a split flight, check whether the flight was repositioned.
-            repositioned = False
-            if solution.flight_type in [ft.Arr, ft.Park, ft.Dep]:
-                j = i - [ft.Arr, ft.Park, ft.Dep].index(solution.flight_type)
-                for k in range(2):
-                    if self.solutions[j+k].bay_idx != self.solutions[j+k+1].bay_idx:
-                        repositioned = True
-
-            # If it was repositioned. Use a dotted line.
-            linestyle = ":" if repositioned else "-"
-
-            # Plot a line for the flight.
-            eta = solution.eta
-            etd = solution.etd
-            plt.plot([eta, etd],
-                     [solution.bay_idx] * 2, color=color, linewidth=4, linestyle=linestyle)
-
-            if repositioned and solution.flight_type is ft.Arr:
-                plt.text(eta, solution.bay_idx,  reposition_idx,
-                         verticalalignment='center', horizontalalignment='right', )
-                reposition_idx += 1
-
-        # Configure plot's title, labels, legend, layout,  etc.
-        plt.grid(True, color='0.85')
-        plt.gcf().autofmt_xdate()
-        plt.title(title, y=1.05)
-        plt.xlabel("Time")
-        plt.ylabel("Bay")
-        domestic_patch = mpatches.Patch(color=colors[0][0], label='domestic')
-        nondom_kq_patch = mpatches.Patch(color=colors[5][0], label='non-domestic KQ')
-        nondom_oth_patch = mpatches.Patch(color=colors[2][0], label='non-domestic other')
-        remote_line = mlines.Line2D([], [], color='black', linestyle=":", label='repositioned')
-        plt.legend(handles=[domestic_patch,
-                            nondom_kq_patch,
-                            nondom_oth_patch,
-                            remote_line],
-                   bbox_to_anchor=(0., 1.0, 1., .10), loc=3,
-                   ncol=4, mode="expand", borderaxespad=0.
-                   )
-        plt.tight_layout()
-
-        return fig
-
-    def create_gate_assignment_chart(self, title):
-        # Create a new figure.
-        fig = plt.figure(figsize=(8, 8))
-        # Set the y-axis tick labels to gate names
-        plt.yticks(range(self.airport.n_gates), self.airport.gate_names)
-
-        # Set the axis limits
-        plt.xlim([datetime.combine(self.flights.config['date'], time(0, 0, 0)),
-                  datetime.combine(self.flights.config['date'], time(23, 59, 59))])
-        plt.ylim([-1, self.airport.n_gates])
-
-
-        # Format the x-axis so it displays the time of the day.
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        plt.gca().xaxis.set_major_locator(mdates.HourLocator())
-
-        # For overlapping gate assignments move each flight to different levels on the plot.
-        # Find pairs of conflicting flights on the same gate.
-        gate_conflict_pairs = KeyPairDictionary()
-        line_dy = {}
-        for i in range(self.flights.n_flights):
-            for j in range(i+1, self.flights.n_flights):
-                if self.flights.time_conflict(i, j):
-                    if self.solutions[i].gate_idx == self.solutions[j].gate_idx:
-                        gate_conflict_pairs[i, j] = None
-
-        # Loop through each solution
-        for i, solution in enumerate(self.solutions):
-            if solution.gate_idx is not None:
-                # Allow 20 different levels for placing conflicting lines.
-                dy_list = [False]*20
-                # Loop through each flight the current flight has a conflict with.
-                for pair in gate_conflict_pairs.pairs(i):
-                    # If the flight has a level assigned to it. Mark that level as reserved.
-                    if pair in line_dy:
-                        dy_list[line_dy[pair]] = True
-
-                # Look for a level that has not been reserved and reserve it for the current solution
-                dy = 0
-                while dy_list[dy]:
-                    dy += 1
-                line_dy[i] = dy
-
-                # Calculate level position w.r.t. level 0.
-                dy = (-1)**dy * ((dy+1) // 2)
-
-                # Set the color based on flight type.
-                if self.flights.domestic(i, True):  # Blue for domestic flights
-                    color = colors[0][0]
-                elif self.flights.airline(i) == "KQ":  # Red for non-domestic KQ flights.
-                    color = colors[5][0]
-                else:  # And the rest green
-                    color = colors[2][0]
-
-                # Use a dotted line if the flight is on a remote bay.
-                linestyle = ":" if solution.bay_idx in self.airport.remote_bays else "-"
-
-                eta = solution.eta
-                etd = solution.etd
-                plt.plot([eta, etd],
-                         [solution.gate_idx - 0.2 * dy] * 2, linewidth=4, color=color, linestyle=linestyle)
-
-        # Configure plot's title, labels, legend, layout,  etc.
-        plt.grid(True, color='0.85')
-        plt.gcf().autofmt_xdate()
-        plt.title(title, y=1.05)
-        plt.xlabel("Time")
-        plt.ylabel("Gate")
-        domestic_patch = mpatches.Patch(color=colors[0][0], label='domestic')
-        nondom_kq_patch = mpatches.Patch(color=colors[5][0], label='non-domestic KQ')
-        nondom_oth_patch = mpatches.Patch(color=colors[2][0], label='non-domestic other')
-        remote_line = mlines.Line2D([], [], color='black', linestyle=":", label='on remote bay')
-        plt.legend(handles=[domestic_patch,
-                            nondom_kq_patch,
-                            nondom_oth_patch,
-                            remote_line],
-                   bbox_to_anchor=(0., 1.0, 1., .10), loc=3,
-                   ncol=4, mode="expand", borderaxespad=0.
-                   )
-
-        plt.tight_layout()
-        return fig
+        :param string title: Title of the chart.
+        :param string path: If given, the chart is saved to this file instead of being created
+           with pyplot. The format is derived from the extension, eg. png or svg.
+        :return: Matplotlib figure.
+        """
+        from ooc.charts import gate_assignment_chart
+        return gate_assignment_chart(self, title, path)
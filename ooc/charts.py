@@ -0,0 +1,249 @@
+"""
+The functions in here create the Gantt charts of the bay and gate assignments. This module is
+only imported when the first chart is created, so matplotlib is not needed to load the data,
+generate the lp code or process the results.
+"""
+
+from datetime import datetime, time
+
+import numpy as np
+import matplotlib.dates as mdates
+import matplotlib.patches as mpatches
+import matplotlib.lines as mlines
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from ooc import ft
+from ooc.intervals import interval_lanes
+
+colors = [
+    ("#1f77b4", "#66b0e5"),  # 0 Blue
+    ("#17becf", "#5edfed"),  # 1 Cyan
+    ("#bcbd22", "#e4e467"),  # 2 Olive
+    ("#8c564b", "#c1948b"),  # 3 Brown
+    ("#ff7f0e", "#ffa04d"),  # 4 Orange
+    ("#d62728", "#e36868"),  # 5 Red
+    ("#7f7f7f", "#a6a6a6"),  # 6 Grey
+    ("#2ca02c", "#73d973"),  # 7 Green
+    ("#9467bd", "#b395d0"),  # 8 Purple
+    ("#e377c2", "#eeaad9"),  # 9 Pink
+]
+"""
+List of colors with dark and light version of each. Used for plotting.
+"""
+
+
+def flight_color(flights, i):
+    """
+    :param ooc.Flights flights: Flights object.
+    :param int i: Flight index
+    :return: Tuple with the dark and light color used to plot the flight.
+    """
+    if flights.domestic(i, True):  # Blue for domestic flights
+        return colors[0]
+    elif flights.airline(i) == "KQ":  # Red for non-domestic KQ flights.
+        return colors[5]
+    else:  # And the rest green
+        return colors[2]
+
+
+def new_chart(path):
+    """
+    Creates a new figure and axes for a chart. If the chart is going to be saved to a file,
+    the figure is created without pyplot, so no display backend is needed.
+
+    :param string path: Path the chart will be saved to or ``None``.
+    :return: Tuple with the figure and axes.
+    """
+    if path is None:
+        # Pyplot is only imported when the figure has to be shown.
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(8, 8))
+    else:
+        fig = Figure(figsize=(8, 8))
+    return fig, fig.add_subplot(1, 1, 1)
+
+
+def add_segments(ax, x_start, x_end, y, styles):
+    """
+    Adds horizontal line segments to the axes. A single LineCollection is created for
+    each unique (color, linestyle) combination.
+
+    :param ax: Matplotlib axes.
+    :param numpy.ndarray x_start: Start of each line in matplotlib date numbers.
+    :param numpy.ndarray x_end: End of each line in matplotlib date numbers.
+    :param numpy.ndarray y: Height of each line.
+    :param list styles: List with the (color, linestyle) tuple of each line.
+    """
+    # Each segment is a 2x2 array with the start and end points of a line.
+    segments = np.empty((len(y), 2, 2))
+    segments[:, 0, 0] = x_start
+    segments[:, 1, 0] = x_end
+    segments[:, 0, 1] = y
+    segments[:, 1, 1] = y
+
+    groups = {}
+    for idx, style in enumerate(styles):
+        groups.setdefault(style, []).append(idx)
+
+    for (color, linestyle), idx in groups.items():
+        ax.add_collection(LineCollection(segments[idx], colors=color, linewidths=4, linestyles=linestyle))
+
+
+def finish_chart(fig, ax, title, y_label, legend_line_label, path):
+    """
+    Configures the chart's title, labels, legend and layout. If a path is given, the
+    chart is saved to it. The format is derived from the file extension, eg. png or svg.
+    """
+    ax.grid(True, color='0.85')
+    ax.set_title(title, y=1.05)
+    ax.set_xlabel("Time")
+    ax.set_ylabel(y_label)
+    fig.autofmt_xdate()
+    domestic_patch = mpatches.Patch(color=colors[0][0], label='domestic')
+    nondom_kq_patch = mpatches.Patch(color=colors[5][0], label='non-domestic KQ')
+    nondom_oth_patch = mpatches.Patch(color=colors[2][0], label='non-domestic other')
+    remote_line = mlines.Line2D([], [], color='black', linestyle=":", label=legend_line_label)
+    ax.legend(handles=[domestic_patch,
+                       nondom_kq_patch,
+                       nondom_oth_patch,
+                       remote_line],
+              bbox_to_anchor=(0., 1.0, 1., .10), loc=3,
+              ncol=4, mode="expand", borderaxespad=0.
+              )
+    fig.tight_layout()
+
+    if path is not None:
+        fig.savefig(path)
+
+
+def bay_assignment_chart(solver, title, path=None):
+    """
+    Creates a Gantt chart of the bay assignment.
+
+    :param ooc.BayGateSolver solver: Solver holding the loaded solutions.
+    :param string title: Title of the chart.
+    :param string path: If given, the chart is saved to this file instead of being created
+       with pyplot. The format is derived from the extension, eg. png or svg.
+    :return: Matplotlib figure.
+    """
+    airport = solver.airport
+    flights = solver.flights
+    solutions = solver.solutions
+
+    fig, ax = new_chart(path)
+
+    # Set the y-axis tick labels to bay names
+    ax.set_yticks(range(airport.n_bays))
+    ax.set_yticklabels(airport.bay_names)
+
+    # Format the x-axis so it displays the time of the day.
+    ax.xaxis_date()
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+    ax.xaxis.set_major_locator(mdates.HourLocator())
+
+    # Only plot the flights that have been assigned to a bay.
+    assigned = [i for i, solution in enumerate(solutions) if solution.bay_idx is not None]
+
+    # Check which split flights have been repositioned. This is done once per split flight.
+    repositioned = [False] * flights.n_flights
+    for group in flights.groups:
+        if len(group.flight_idx) == 3:
+            bays = {solutions[i].bay_idx for i in group.flight_idx}
+            for i in group.flight_idx:
+                repositioned[i] = len(bays) > 1
+
+    styles = []
+    for i in assigned:
+        # If this is a park flight use the light color, otherwise dark.
+        color = flight_color(flights, i)
+        color = color[1] if solutions[i].flight_type == ft.Park else color[0]
+
+        # If it was repositioned. Use a dotted line.
+        styles.append((color, ":" if repositioned[i] else "-"))
+
+    add_segments(ax,
+                 mdates.date2num([solutions[i].eta for i in assigned]),
+                 mdates.date2num([solutions[i].etd for i in assigned]),
+                 np.array([solutions[i].bay_idx for i in assigned]),
+                 styles)
+
+    # Number the repositioned flights.
+    reposition_idx = 0
+    for i in assigned:
+        if repositioned[i] and solutions[i].flight_type is ft.Arr:
+            ax.text(mdates.date2num(solutions[i].eta), solutions[i].bay_idx, reposition_idx,
+                    verticalalignment='center', horizontalalignment='right', )
+            reposition_idx += 1
+
+    ax.autoscale_view()
+    ax.set_ylim([-1, airport.n_bays])
+
+    finish_chart(fig, ax, title, "Bay", "repositioned", path)
+    return fig
+
+
+def gate_assignment_chart(solver, title, path=None):
+    """
+    Creates a Gantt chart of the gate assignment. Flights that are at the same gate at the
+    same time are drawn at different levels.
+
+    :param ooc.BayGateSolver solver: Solver holding the loaded solutions.
+    :param string title: Title of the chart.
+    :param string path: If given, the chart is saved to this file instead of being created
+       with pyplot. The format is derived from the extension, eg. png or svg.
+    :return: Matplotlib figure.
+    """
+    airport = solver.airport
+    flights = solver.flights
+    solutions = solver.solutions
+
+    fig, ax = new_chart(path)
+
+    # Set the y-axis tick labels to gate names
+    ax.set_yticks(range(airport.n_gates))
+    ax.set_yticklabels(airport.gate_names)
+
+    # Format the x-axis so it displays the time of the day.
+    ax.xaxis_date()
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+    ax.xaxis.set_major_locator(mdates.HourLocator())
+
+    # Group the flights per gate.
+    gate_flights = {}
+    for i, solution in enumerate(solutions):
+        if solution.gate_idx is not None:
+            gate_flights.setdefault(solution.gate_idx, []).append(i)
+
+    # For overlapping gate assignments move each flight to different levels on the plot.
+    # The levels are found per gate by colouring the buffered time windows of the flights.
+    flight_idx = []
+    levels = []
+    for gate_idx, gate_flight_idx in gate_flights.items():
+        windows = [flights.buffered_window(i) for i in gate_flight_idx]
+        flight_idx.extend(gate_flight_idx)
+        levels.extend(interval_lanes([eta for eta, _ in windows], [etd for _, etd in windows]))
+
+    # Calculate level position w.r.t. level 0.
+    levels = np.array(levels, dtype=int)
+    dy = (-1) ** levels * ((levels + 1) // 2)
+
+    styles = []
+    for i in flight_idx:
+        # Use a dotted line if the flight is on a remote bay.
+        linestyle = ":" if solutions[i].bay_idx in airport.remote_bays else "-"
+        styles.append((flight_color(flights, i)[0], linestyle))
+
+    add_segments(ax,
+                 mdates.date2num([solutions[i].eta for i in flight_idx]),
+                 mdates.date2num([solutions[i].etd for i in flight_idx]),
+                 np.array([solutions[i].gate_idx for i in flight_idx]) - 0.2 * dy,
+                 styles)
+
+    # Set the axis limits
+    ax.set_xlim([datetime.combine(flights.config['date'], time(0, 0, 0)),
+                 datetime.combine(flights.config['date'], time(23, 59, 59))])
+    ax.set_ylim([-1, airport.n_gates])
+
+    finish_chart(fig, ax, title, "Gate", "on remote bay", path)
+    return fig
@@ -0,0 +1,200 @@
+"""
+Command line interface of the bay and gate assignment. The airport is only loaded once, so
+many schedules can be solved in a single invocation, eg.
+
+    ooc-assign jomo_kenyatta_international_airport schedule_2015_06_02 schedule_2015_07_05 \\
+        --buffer-time 15 --spare-bays J2A J2B --backend scipy --no-plot
+
+The workspace of each schedule is named 'workspace_<schedule directory name>' and is created
+in the output directory.
+"""
+
+import argparse
+import copy
+import json
+import sys
+from datetime import timedelta
+from os import makedirs
+from os.path import basename, normpath, join, relpath
+
+from ooc import Airport, Flights, BayGateSolver
+from ooc.print_color import pr_g, pr_r
+from ooc.profiling import Profiler
+
+
+backends = ["cplex", "cplex-session", "scipy", "none"]
+"""
+Backends used to solve the lp files. 'cplex' starts the cplex interactive solver for each lp file,
+'cplex-session' keeps cplex sessions alive for all schedules, 'scipy' uses scipy's milp solver and
+'none' only generates the lp files.
+"""
+
+
+def create_parser():
+    """
+    :return: Parser of the command line arguments.
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="ooc-assign", description="Solves the bay and gate assignment of one "
+                                                                    "or more flight schedules.")
+    parser.add_argument("airport", help="Directory holding the airport data.")
+    parser.add_argument("schedules", nargs="+", help="Directories holding the flight schedules.")
+    parser.add_argument("-o", "--output", default=".", help="Directory in which the workspaces are created.")
+    parser.add_argument("-b", "--buffer-time", type=float, default=0,
+                        help="Buffer time in minutes added before and after each flight.")
+    parser.add_argument("-s", "--spare-bays", nargs="*", default=[], help="Names of the spare bays.")
+    parser.add_argument("--backend", choices=backends, default="cplex", help="Solver used to solve the lp files.")
+    parser.add_argument("--cplex-command", default="cplex",
+                        help="Terminal command to access the cplex interactive solver.")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of lp files solved in parallel. Defaults to the number of processors.")
+    parser.add_argument("--decompose", action="store_true",
+                        help="Split the problems in independent components, which are solved in parallel.")
+    parser.add_argument("--aggregate", action="store_true",
+                        help="Pool identical bays and gates, which shrinks the problems.")
+    parser.add_argument("--precheck", action="store_true",
+                        help="Check whether the bay assignment can be feasible before generating the lp code, "
+                             "and skip the schedule if it can't.")
+    parser.add_argument("--refine-conflicts", action="store_true",
+                        help="Write the conflicting constraints to a report in the workspace if a problem is "
+                             "infeasible.")
+    parser.add_argument("--load-only", action="store_true",
+                        help="Don't solve the problems, only load the solutions in the workspaces.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Save the time spent in each stage to 'profile.json' in the workspace and "
+                             "print it as json.")
+    parser.add_argument("--no-plot", action="store_true", help="Don't create the charts.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Don't print the solution tables.")
+    return parser
+
+
+def create_lp_solver(args):
+    """
+    :param argparse.Namespace args: Parsed command line arguments.
+    :return: Dictionary with the ``lp_solver`` and ``cplex_command`` arguments of :class:`ooc.BayGateSolver`.
+    :rtype: dict
+    """
+    if args.backend == "scipy":
+        from ooc.lp_solvers import ScipySolver
+        return {"lp_solver": ScipySolver()}
+    if args.backend == "cplex-session":
+        from ooc.cplex_session import CplexSessionPool
+        return {"lp_solver": CplexSessionPool(args.cplex_command, size=args.workers or 1)}
+    if args.backend == "none":
+        return {"cplex_command": None}
+    return {"cplex_command": args.cplex_command}
+
+
+def workspace_name(schedule_path):
+    """
+    :param string schedule_path: Path to the directory holding the flight schedule.
+    :return: Name of the workspace of the schedule.
+    :rtype: string
+    """
+    name = basename(normpath(schedule_path))
+    if name.startswith("schedule_"):
+        name = name[len("schedule_"):]
+    return "workspace_" + name
+
+
+def run_schedule(airport, schedule_path, args, solver_args):
+    """
+    Solves the bay and gate assignment of a single schedule.
+
+    :param ooc.Airport airport: Loaded airport.
+    :param string schedule_path: Path to the directory holding the flight schedule.
+    :param argparse.Namespace args: Parsed command line arguments.
+    :param dict solver_args: Extra arguments of :class:`ooc.BayGateSolver`.
+    :return: Solver with the solutions loaded in.
+    :rtype: ooc.BayGateSolver
+    """
+    profiler = Profiler() if args.profile else None
+
+    # The flights attach themselves to the airport, so each schedule gets a shallow copy.
+    flights = Flights(schedule_path, copy.copy(airport), buffer_time=timedelta(minutes=args.buffer_time),
+                      spare_bays=args.spare_bays)
+    jid = normpath(join(args.output, workspace_name(schedule_path)))
+    solver = BayGateSolver.from_flights(flights, jid, profiler=profiler, refine_conflicts=args.refine_conflicts,
+                                        **solver_args)
+
+    if args.precheck:
+        issues = solver.precheck()
+        for issue in issues:
+            pr_r(issue.message)
+        if issues:
+            raise Exception("The pre-check found {} issues.".format(len(issues)))
+
+    if not args.load_only:
+        solver.solve_bay_assignment(decompose=args.decompose, processes=args.workers, aggregate=args.aggregate)
+    solver.load_bay_assignment_solution()
+    if not args.load_only:
+        solver.solve_gate_assignment(decompose=args.decompose, processes=args.workers, aggregate=args.aggregate)
+    solver.load_gate_assignment_solution()
+
+    if not args.quiet:
+        solver.print_solution()
+    solver.save_csv()
+
+    if not args.no_plot:
+        name = basename(normpath(schedule_path))
+        solver.create_bay_assignment_chart("Bay assignment for {}".format(name),
+                                           join(solver.workspace_path, "bay_assignment.png"))
+        solver.create_gate_assignment_chart("Gate assignment for {}".format(name),
+                                            join(solver.workspace_path, "gate_assignment.png"))
+
+    if args.profile:
+        profile = {"schedule": schedule_path,
+                   "timings": solver.timings,
+                   "stages": profiler.totals(),
+                   "records": profiler.records}
+        with open(join(solver.workspace_path, "profile.json"), "w") as f:
+            json.dump(profile, f, indent=2)
+        print(json.dumps({"schedule": schedule_path, "timings": solver.timings, "stages": profiler.totals()}))
+
+    return solver
+
+
+def main(argv=None):
+    """
+    Entry point of the 'ooc-assign' command.
+
+    :param list argv: Command line arguments. Defaults to ``sys.argv[1:]``.
+    :return: Exit code, 1 if any of the schedules failed.
+    :rtype: int
+    """
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
+    # The workspaces are created relative to the working directory, see :attr:`ooc.BayGateSolver.workspace_path`.
+    try:
+        args.output = relpath(args.output)
+    except ValueError:
+        parser.error("the output directory must be on the same drive as the working directory")
+    makedirs(args.output, exist_ok=True)
+
+    airport = Airport(args.airport)
+    solver_args = create_lp_solver(args)
+
+    failed = []
+    try:
+        for schedule_path in args.schedules:
+            pr_g("Solving schedule '{}'".format(schedule_path))
+            try:
+                run_schedule(airport, schedule_path, args, solver_args)
+            except Exception as e:
+                # Continue with the other schedules, so one bad schedule doesn't stop the batch.
+                pr_r("Error: Schedule '{}' failed: {}".format(schedule_path, e))
+                failed.append(schedule_path)
+    finally:
+        lp_solver = solver_args.get("lp_solver")
+        if hasattr(lp_solver, "close"):
+            lp_solver.close()
+
+    if failed:
+        pr_r("{} of {} schedules failed: {}".format(len(failed), len(args.schedules), ", ".join(failed)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+The functions in here read and write the (compressed) files in the workspace. Files with a
+'.gz' extension are gzip compressed and are (de)compressed while streaming, so the complete
+uncompressed file is never held in memory.
+"""
+
+from os import remove
+
+
+compress_level = 6
+"""
+Gzip compression level used for the workspace files. It's a good trade-off between size and speed.
+"""
+
+
+def open_file(path, mode="r"):
+    """
+    Opens a file, which is gzip compressed if the path ends with '.gz'.
+
+    :param string path: Path to the file.
+    :param string mode: Mode, eg. 'r', 'w', 'rb' or 'wb'. Text mode is used unless 'b' is in the mode.
+    :return: File object.
+    """
+    if path.endswith(".gz"):
+        # Imported here, so importing the package doesn't pay for gzip and zlib when nothing is compressed.
+        import gzip
+
+        if "b" not in mode:
+            mode += "t"
+        return gzip.open(path, mode, compresslevel=compress_level)
+    return open(path, mode)
+
+
+def compress_file(path):
+    """
+    Compresses a file and removes the uncompressed file.
+
+    :param string path: Path to the file.
+    :return: Path to the compressed file, which is the original path with '.gz' appended.
+    :rtype: string
+    """
+    import gzip
+    import shutil
+
+    gz_path = path + ".gz"
+    with open(path, "rb") as f_in, gzip.open(gz_path, "wb", compresslevel=compress_level) as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    remove(path)
+    return gz_path
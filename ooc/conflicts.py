@@ -0,0 +1,258 @@
+"""
+The functions in here find out why a bay or gate assignment model is infeasible. A conflict is
+a minimal set of constraints that is infeasible on it's own, so removing any of them makes the
+set feasible. It's found with the cplex conflict refiner if cplex is available, otherwise with a
+deletion filter on the sparse model. The constraints in the conflict are mapped back to the
+flights, bays and gates they are generated for, and written to a compact report.
+"""
+
+import re
+from collections import namedtuple
+
+from ooc.compression import open_file
+from ooc.cplex_session import CplexSession
+from ooc.lp_solvers import read_lp, lp_arrays
+
+
+ConflictRowType = namedtuple("ConflictRowType", ("name", "constraint", "flights", "bays", "gates", "message"))
+"""
+Named tuple holding a single constraint of a conflict. ``constraint`` is the name of the kind
+of constraint, ``flights``, ``bays`` and ``gates`` are tuples with the indices of the flights,
+bays and gates the constraint is generated for, and ``message`` describes it.
+"""
+
+constraint_names = {"bc": "single_bay_compliance",
+                    "tc": "single_time_slot",
+                    "cc": "capacity",
+                    "fc": "fueling",
+                    "sp": "splitted_flight",
+                    "nt": "night_stay",
+                    "ad": "adjacency",
+                    "sg": "single_gate"}
+"""
+Names of the kind of constraint of each constraint name prefix used in the generated lp code.
+"""
+
+
+def is_feasible(model, rows):
+    """
+    :param ooc.lp_solvers.LpModelType model: Lp model.
+    :param list rows: Indices of the constraints to check.
+    :return: False if the model is infeasible with only these constraints.
+    :rtype: bool
+    """
+    from scipy.optimize import milp, LinearConstraint, Bounds
+    import numpy as np
+
+    c, a, row_lower, row_upper, integrality, upper = lp_arrays(model, rows)
+
+    # Only the feasibility matters, so the objective is dropped.
+    result = milp(np.zeros(len(c)),
+                  constraints=LinearConstraint(a, row_lower, row_upper) if len(rows) else (),
+                  integrality=integrality,
+                  bounds=Bounds(np.zeros(len(c)), upper))
+    return result.status != 2
+
+
+def deletion_filter(model):
+    """
+    Finds a conflict with a deletion filter. Constraints are removed from the model as long as
+    it stays infeasible. They are removed in chunks, which are split in half when the model
+    becomes feasible without them, so large parts of the model that have nothing to do with the
+    conflict are removed with a single check.
+
+    :param ooc.lp_solvers.LpModelType model: Infeasible lp model.
+    :return: Sorted list with the indices of the constraints in the conflict.
+    :rtype: list
+    """
+    if is_feasible(model, list(range(len(model.rows)))):
+        raise Exception("The model is feasible, so it has no conflict.")
+
+    # The kept constraints together with the remaining chunks are always infeasible.
+    kept = []
+    chunks = [list(range(len(model.rows)))]
+    while chunks:
+        chunk = chunks.pop()
+        rest = kept + [row for remaining in chunks for row in remaining]
+        if not is_feasible(model, rest):
+            # The chunk is not needed for the conflict.
+            continue
+        if len(chunk) == 1:
+            kept.append(chunk[0])
+        else:
+            half = len(chunk) // 2
+            chunks.append(chunk[half:])
+            chunks.append(chunk[:half])
+    return sorted(kept)
+
+
+def cplex_conflict(lp_path, cplex_command="cplex", timeout=None):
+    """
+    Finds a conflict with the cplex conflict refiner.
+
+    :param string lp_path: Path to the lp file.
+    :param string cplex_command: Terminal command to access the cplex interactive solver.
+    :param float timeout: Maximum number of seconds to wait for cplex to finish a command.
+    :return: List with the names of the constraints in the conflict.
+    :rtype: list
+    """
+    session = CplexSession(cplex_command, timeout)
+    session.start()
+    try:
+        return parse_conflict(session.conflict(lp_path))
+    finally:
+        session.close()
+
+
+def parse_conflict(output):
+    """
+    :param string output: Output of the cplex 'display conflict all' command, which displays the
+       conflict in the lp format.
+    :return: List with the names of the constraints in the conflict.
+    :rtype: list
+    """
+    names = []
+    in_constraints = False
+    for line in output.splitlines():
+        keyword = line.strip().lower()
+        if keyword in ["subject to", "such that", "st", "s.t."]:
+            in_constraints = True
+        elif re.match(r"(bounds|binar(y|ies)|generals?|end)$", keyword):
+            in_constraints = False
+        elif in_constraints:
+            match = re.match(r"\s*([A-Za-z_]\w*)\s*:", line)
+            if match:
+                names.append(match.group(1))
+    return names
+
+
+def flight_label(flights, i):
+    """
+    :param ooc.Flights flights: Flights object.
+    :param int i: Flight index
+    :return: Flight index with it's flight number, eg. '3 (KQ100)'.
+    :rtype: string
+    """
+    flight = flights.flight_schedule[i]
+    flight_no = flight.out_flight_no if flight.out_flight_no is not None else flight.in_flight_no
+    return "{} ({})".format(i, flight_no)
+
+
+def describe_row(name, problem, flights):
+    """
+    Maps a constraint of the generated lp code back to the flights, bays and gates it's generated for.
+
+    :param string name: Name of the constraint, eg. 'tc_3_5_12'.
+    :param string problem: Name of the problem, ie. 'bay' or 'gate'.
+    :param ooc.Flights flights: Flights object the lp code was generated for.
+    :return: Description of the constraint.
+    :rtype: ConflictRowType
+    """
+    airport = flights.airport
+    prefix, *values = name.split("_")
+    constraint = constraint_names.get(prefix)
+    try:
+        values = [int(value) for value in values]
+    except ValueError:
+        constraint = None
+
+    def resource(index):
+        return airport.bay_names[index] if problem == "bay" else airport.gate_names[index]
+
+    def resources(*indices):
+        return (indices, ()) if problem == "bay" else ((), indices)
+
+    if constraint is None:
+        return ConflictRowType(name, None, (), (), (), "Unknown constraint.")
+
+    if constraint == "single_bay_compliance" and len(values) == 1:
+        i, = values
+        return ConflictRowType(name, constraint, (i,), (), (),
+                               "Flight {} is assigned to exactly one compliant bay.".format(flight_label(flights, i)))
+
+    if constraint == "single_time_slot" and len(values) == 3:
+        i, j, k = values
+        bays, gates = resources(k)
+        return ConflictRowType(name, constraint, (i, j), bays, gates,
+                               "Flights {} and {} overlap in time and can't both use {} {}.".format(
+                                   flight_label(flights, i), flight_label(flights, j), problem, resource(k)))
+
+    if constraint == "capacity" and len(values) == 2:
+        k, i = values
+        bays, gates = resources(k)
+        return ConflictRowType(name, constraint, (i,), bays, gates,
+                               "The flights at the same time as flight {} can't all use the {}s "
+                               "identical to {}.".format(flight_label(flights, i), problem, resource(k)))
+
+    if constraint == "fueling" and len(values) == 1:
+        i, = values
+        return ConflictRowType(name, constraint, (i,), (), (),
+                               "Flight {} is fueled at a bay with fueling pits.".format(flight_label(flights, i)))
+
+    if constraint == "splitted_flight" and len(values) == 2:
+        i, k = values
+        group = flights.groups[flights.flight_group[i]].flight_idx
+        return ConflictRowType(name, constraint, tuple(group), (k,), (),
+                               "Towing between the parts of long stay flight {} at bay {}.".format(
+                                   flight_label(flights, group[0]), airport.bay_names[k]))
+
+    if constraint == "night_stay" and len(values) == 2:
+        i, k = values
+        return ConflictRowType(name, constraint, (i,), (k,), (),
+                               "Overnight flight {} is at it's current bay {}.".format(
+                                   flight_label(flights, i), airport.bay_names[k]))
+
+    if constraint == "adjacency" and len(values) == 3:
+        k, i, j = values
+        return ConflictRowType(name, constraint, (i, j), (k,), (),
+                               "Flights {} and {} at adjacent bays next to {}.".format(
+                                   flight_label(flights, i), flight_label(flights, j), airport.bay_names[k]))
+
+    if constraint == "single_gate" and len(values) == 1:
+        i, = values
+        return ConflictRowType(name, constraint, (i,), (), (),
+                               "Flight {} is assigned to exactly one feasible gate.".format(flight_label(flights, i)))
+
+    return ConflictRowType(name, None, (), (), (), "Unknown constraint.")
+
+
+def refine_conflict(lp_path, problem, flights, cplex_command=None, session_pool=None):
+    """
+    Finds a conflict of an infeasible bay or gate assignment model.
+
+    :param string lp_path: Path to the (compressed) lp file.
+    :param string problem: Name of the problem, ie. 'bay' or 'gate'.
+    :param ooc.Flights flights: Flights object the lp code was generated for.
+    :param string cplex_command: Terminal command to access the cplex interactive solver. If ``None``
+       and no ``session_pool`` is given, the conflict is found with :func:`deletion_filter`.
+    :param ooc.cplex_session.CplexSessionPool session_pool: Optional pool of cplex sessions the
+       conflict refiner is run in, instead of starting a new cplex process.
+    :return: List with the descriptions of the constraints in the conflict.
+    :rtype: list
+    """
+    if session_pool is not None:
+        names = parse_conflict(session_pool.conflict(lp_path))
+    elif cplex_command is not None:
+        names = cplex_conflict(lp_path, cplex_command)
+    else:
+        with open_file(lp_path) as f:
+            model = read_lp(f.read())
+        names = [model.row_names[row] for row in deletion_filter(model)]
+    return [describe_row(name, problem, flights) for name in names]
+
+
+def write_report(path, rows, lp_path):
+    """
+    Writes a conflict report.
+
+    :param string path: Path to the report.
+    :param list rows: List with the descriptions of the constraints in the conflict.
+    :param string lp_path: Path to the lp file the conflict was found in.
+    """
+    flight_idx = sorted({i for row in rows for i in row.flights})
+    width = max([len(row.name) for row in rows] + [4])
+    with open(path, "w") as f:
+        f.write("Conflict in '{}'\n".format(lp_path))
+        f.write("{} constraints, flights {}\n\n".format(len(rows), ", ".join(str(i) for i in flight_idx)))
+        for row in rows:
+            f.write("{:{}s}  {}\n".format(row.name, width, row.message))
@@ -0,0 +1,366 @@
+"""
+The classes in here keep interactive cplex processes alive and drive them over their standard
+input and output with the 'read', 'optimize' and 'write' commands. Starting cplex and checking
+out a licence only has to be done once per session instead of once per lp file.
+"""
+
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+from os.path import isfile
+from queue import Queue, LifoQueue, Empty
+from time import perf_counter
+
+from ooc.lp_solvers import InfeasibleError
+
+
+class CplexSessionError(Exception):
+    """
+    Raised when a cplex session stopped responding or exited. The session has to be restarted
+    before it can be used again.
+    """
+    pass
+
+
+def read_output(stream, queue):
+    """
+    Reads the output of a process and puts it on a queue in chunks. ``None`` is put on the
+    queue once the process closed it's output. Runs in a separate thread, so the output can be
+    read with a timeout.
+
+    :param stream: Binary output stream of the process.
+    :param queue.Queue queue: Queue the output chunks are put on.
+    """
+    fd = stream.fileno()
+    while True:
+        try:
+            chunk = os.read(fd, 4096)
+        except OSError:
+            chunk = b""
+        if not chunk:
+            queue.put(None)
+            return
+        queue.put(chunk.decode(errors="replace"))
+
+
+class CplexSession:
+    """
+    A single interactive cplex process.
+
+    :param string command: Terminal command to access the cplex interactive solver.
+    :param float timeout: Maximum number of seconds to wait for cplex to finish a command.
+       ``None`` to wait indefinitely.
+    """
+
+    prompt = "CPLEX> "
+    """
+    Prompt printed by cplex when it's waiting for the next command.
+    """
+
+    def __init__(self, command="cplex", timeout=None):
+        self.command = command
+        self.timeout = timeout
+        self.process = None
+        self.output = None
+        self.reader = None
+        self.n_solved = 0  #: Number of lp files solved since the session was (re)started.
+
+    def start(self):
+        """
+        Starts the cplex process and waits for the first prompt.
+        """
+        args = shlex.split(self.command) if sys.platform != "win32" else self.command
+        self.process = subprocess.Popen(args,
+                                        stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT)
+        self.output = Queue()
+        self.reader = threading.Thread(target=read_output, args=(self.process.stdout, self.output), daemon=True)
+        self.reader.start()
+        self.n_solved = 0
+        self.read_until_prompt(self.timeout)
+
+    def is_alive(self):
+        """
+        :return: True if the cplex process is running.
+        :rtype: bool
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def read_until_prompt(self, timeout=None):
+        """
+        Reads the output of cplex until the prompt.
+
+        :param float timeout: Maximum number of seconds to wait. ``None`` to wait indefinitely.
+        :return: Output of the last command, without the prompt.
+        :rtype: string
+        """
+        output = ""
+        deadline = None if timeout is None else perf_counter() + timeout
+        while not output.endswith(self.prompt):
+            try:
+                chunk = self.output.get(timeout=None if deadline is None else max(deadline - perf_counter(), 0))
+            except Empty:
+                raise CplexSessionError("Cplex did not respond within {} seconds.".format(timeout))
+            if chunk is None:
+                raise CplexSessionError("Cplex exited unexpectedly:\n{}".format(output))
+            output += chunk
+        return output[:-len(self.prompt)]
+
+    def execute(self, line, timeout=None):
+        """
+        Sends a single command to cplex and waits for it to finish.
+
+        :param string line: Command, eg. 'read bay.lp'.
+        :param float timeout: Maximum number of seconds to wait. Defaults to the session timeout.
+        :return: Output of the command.
+        :rtype: string
+        """
+        if not self.is_alive():
+            raise CplexSessionError("The cplex session is not running.")
+        try:
+            self.process.stdin.write((line + "\n").encode())
+            self.process.stdin.flush()
+        except OSError:
+            raise CplexSessionError("Cplex closed it's input.")
+
+        output = self.read_until_prompt(self.timeout if timeout is None else timeout)
+        if "CPLEX Error" in output:
+            raise Exception("Cplex failed to execute '{}':\n{}".format(line, output))
+        return output
+
+    def solve(self, lp_path, sol_path):
+        """
+        Solves an lp file and writes the solution to a cplex solution file.
+
+        :param string lp_path: Path to the lp file.
+        :param string sol_path: Path to the solution file.
+        """
+        if isfile(sol_path):
+            # Cplex asks for confirmation before overwriting a file.
+            os.remove(sol_path)
+        self.execute("read {}".format(lp_path))
+        output = self.execute("optimize")
+        self.n_solved += 1
+        if re.search(r"\binfeasible\b", output, re.IGNORECASE):
+            raise InfeasibleError("The model in '{}' is infeasible.".format(lp_path), lp_path)
+        self.execute("write {}".format(sol_path))
+        if not isfile(sol_path):
+            raise Exception("No solution was found for '{}'.".format(lp_path))
+
+    def conflict(self, lp_path):
+        """
+        Runs the cplex conflict refiner on an infeasible lp file.
+
+        :param string lp_path: Path to the lp file.
+        :return: Output of the 'display conflict all' command, which displays the conflict in the
+           lp format, see :func:`ooc.conflicts.parse_conflict`.
+        :rtype: string
+        """
+        self.execute("read {}".format(lp_path))
+        self.execute("optimize")
+        self.execute("conflict")
+        return self.execute("display conflict all")
+
+    def ping(self, timeout=10):
+        """
+        Checks whether cplex still responds to commands.
+
+        :param float timeout: Maximum number of seconds to wait for a response.
+        :return: True if cplex responded.
+        :rtype: bool
+        """
+        try:
+            self.execute("help", timeout)
+            return True
+        except CplexSessionError:
+            return False
+
+    def restart(self):
+        """
+        Stops the cplex process, if it's still running, and starts a new one.
+        """
+        self.close()
+        self.start()
+
+    def close(self):
+        """
+        Asks cplex to quit and kills it if it doesn't.
+        """
+        if self.process is None:
+            return
+        if self.is_alive():
+            try:
+                self.process.stdin.write(b"quit\n")
+                self.process.stdin.flush()
+                self.process.wait(5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self.process = None
+
+
+class CplexSessionPool:
+    """
+    Pool of interactive cplex sessions. It can be used as the ``lp_solver`` of :class:`ooc.BayGateSolver`.
+    The sessions are started when they are first needed and are kept alive until the pool is closed.
+    Before a session is used it's checked whether it's still responding, if not it's restarted.
+
+    :param string command: Terminal command to access the cplex interactive solver.
+    :param int size: Maximum number of sessions.
+    :param float timeout: Maximum number of seconds to wait for cplex to finish a command.
+       ``None`` to wait indefinitely.
+    :param int retries: Number of times an lp file is solved again in a restarted session if the
+       session failed while solving it.
+    """
+
+    def __init__(self, command="cplex", size=1, timeout=None, retries=1):
+        self.command = command
+        self.size = size
+        self.timeout = timeout
+        self.retries = retries
+        self.sessions = []  #: All sessions started by this pool.
+        self.idle = LifoQueue()  # The last used session is reused first, so the other ones stay idle.
+        self.lock = threading.Lock()
+        self.n_restarts = 0  #: Number of times a session was restarted.
+
+    def acquire(self):
+        """
+        :return: An idle session that's responding. A new session is started if all sessions are
+           busy and the pool is not full yet.
+        :rtype: CplexSession
+        """
+        try:
+            session = self.idle.get_nowait()
+        except Empty:
+            with self.lock:
+                new = len(self.sessions) < self.size
+                if new:
+                    session = CplexSession(self.command, self.timeout)
+                    self.sessions.append(session)
+            if new:
+                try:
+                    session.start()
+                except Exception:
+                    self.discard(session)
+                    raise
+                return session
+            session = self.idle.get()
+
+        # Health check.
+        if not session.ping():
+            try:
+                self.restart(session)
+            except Exception:
+                self.discard(session)
+                raise
+        return session
+
+    def release(self, session):
+        """
+        :param CplexSession session: Session returned by :meth:`acquire`, which can be reused.
+        """
+        self.idle.put(session)
+
+    def restart(self, session):
+        """
+        :param CplexSession session: Session to restart.
+        """
+        with self.lock:
+            self.n_restarts += 1
+        session.restart()
+
+    def discard(self, session):
+        """
+        Removes a session that failed to (re)start from the pool and closes it, so another session
+        can be started in its place.
+
+        :param CplexSession session: Session to remove.
+        """
+        with self.lock:
+            self.sessions.remove(session)
+        session.close()
+
+    def solve(self, lp_path, sol_path):
+        """
+        Solves an lp file in one of the sessions and writes the solution to a cplex solution file.
+
+        :param string lp_path: Path to the lp file.
+        :param string sol_path: Path to the solution file.
+        """
+        session = self.acquire()
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    session.solve(lp_path, sol_path)
+                    return
+                except CplexSessionError:
+                    if attempt == self.retries:
+                        session.close()
+                        raise
+                    self.restart(session)
+        finally:
+            self.release(session)
+
+    def conflict(self, lp_path):
+        """
+        Runs the cplex conflict refiner on an infeasible lp file in one of the sessions, see
+        :meth:`CplexSession.conflict`.
+
+        :param string lp_path: Path to the lp file.
+        :return: Output of the 'display conflict all' command.
+        :rtype: string
+        """
+        session = self.acquire()
+        try:
+            return session.conflict(lp_path)
+        except CplexSessionError:
+            session.close()
+            raise
+        finally:
+            self.release(session)
+
+    def solve_all(self, lp_paths, sol_paths, processes=None):
+        """
+        Solves multiple lp files in parallel using the sessions in the pool.
+
+        :param list lp_paths: Paths to the lp files.
+        :param list sol_paths: Paths to the solution files.
+        :param int processes: Maximum number of lp files solved at the same time. Defaults to
+           the size of the pool.
+        """
+        workers = self.size if processes is None else min(processes, self.size)
+        if workers <= 1 or len(lp_paths) == 1:
+            for lp_path, sol_path in zip(lp_paths, sol_paths):
+                self.solve(lp_path, sol_path)
+        else:
+            # Imported here to keep importing the package fast.
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Consume the results, so exceptions raised by the workers are raised here.
+                list(pool.map(self.solve, lp_paths, sol_paths))
+
+    def close(self):
+        """
+        Closes all sessions.
+        """
+        with self.lock:
+            sessions, self.sessions = self.sessions, []
+        for session in sessions:
+            session.close()
+        self.idle = LifoQueue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,184 @@
+"""
+The functions in here split the bay and gate assignments into independent sub problems. Two
+flights depend on each other if they appear together in any of the constraints of
+:class:`ooc.BayAssignment` or :class:`ooc.GateAssignment`. The connected components of the
+graph formed by these dependencies can be solved separately, since none of their decision
+variables share a constraint and the objective function is a plain sum over the decision variables.
+"""
+
+from ooc.intervals import overlapping_pairs
+
+
+class DisjointSet:
+    """
+    Disjoint set (union-find) data structure over the integers ``0..n-1``, used to find the
+    connected components of a graph.
+
+    :param int n: Number of elements.
+    """
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        """
+        :param int i: Element
+        :return: Representative element of the set i is in.
+        """
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+
+        # Path compression.
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i, j):
+        """
+        Merges the sets holding i and j.
+
+        :param int i: Element
+        :param int j: Element
+        """
+        i = self.find(i)
+        j = self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)
+
+    def union_all(self, elements):
+        """
+        Merges the sets of all elements.
+
+        :param elements: Iterable with the elements.
+        """
+        first = None
+        for i in elements:
+            if first is None:
+                first = i
+            else:
+                self.union(first, i)
+
+    def sets(self):
+        """
+        :return: List with the sorted elements of each set. The sets are sorted by their smallest element.
+        :rtype: list
+        """
+        sets = {}
+        for i in range(len(self.parent)):
+            sets.setdefault(self.find(i), []).append(i)
+        return list(sets.values())
+
+
+def compliant_bays(flights):
+    """
+    :param ooc.Flights flights: Flights object.
+    :return: List with the set of compliant bays of each flight.
+    :rtype: list
+    """
+    index = flights.valid_index()
+    if index is not None:
+        return list(index.compliant_bays)
+    return [frozenset(k for k in range(flights.airport.n_bays) if flights.bay_compliance(i, k))
+            for i in range(flights.n_flights)]
+
+
+def time_conflicting_pairs(flights, flight_idx=None, use_index=True):
+    """
+    Finds all pairs of time conflicting flights. The buffered time windows are checked with a
+    sweep line first and the exact check is done with :meth:`ooc.Flights.time_conflict`.
+    Flights with a time window wrapping around midnight are checked against all other flights.
+    If the flights have an up to date index (see :meth:`ooc.Flights.build_index`) the pairs are
+    taken from the index instead.
+
+    :param ooc.Flights flights: Flights object.
+    :param list flight_idx: Optional list with the indices of the flights to check. Defaults to all flights.
+    :param bool use_index: False to always check the time windows.
+    :return: Generator yielding the ``(i, j)`` pairs of time conflicting flights with ``i < j``.
+    """
+    index = flights.valid_index() if use_index else None
+    if index is not None:
+        yield from index.pairs(flight_idx)
+        return
+
+    if flight_idx is None:
+        flight_idx = range(flights.n_flights)
+    windows = {i: flights.buffered_window(i) for i in flight_idx}
+    wrapped = [i for i in flight_idx if windows[i][0] >= windows[i][1]]
+    wrapped_set = set(wrapped)
+    regular = [i for i in flight_idx if i not in wrapped_set]
+
+    for a, b in overlapping_pairs([windows[i][0] for i in regular], [windows[i][1] for i in regular]):
+        i, j = regular[a], regular[b]
+        if flights.time_conflict(i, j):
+            yield (i, j) if i < j else (j, i)
+
+    for i in wrapped:
+        for j in flight_idx:
+            # Pairs of two wrapped flights are only yielded once.
+            if j != i and (j not in wrapped_set or i < j) and flights.time_conflict(i, j):
+                yield (i, j) if i < j else (j, i)
+
+
+def bay_components(flights):
+    """
+    Finds the independent sub problems of the bay assignment. Two flights are connected if
+
+     - they are part of the same long stay flight (splitted flight and fueling constraints),
+     - they conflict in time and share a compliant bay (single time slot constraints),
+     - they are both departing and compliant with the two bays of an adjacent bay pair
+       (adjacency constraints). Note that these constraints don't check for time conflicts,
+       so they might connect flights throughout the whole day.
+
+    :param ooc.Flights flights: Flights object.
+    :return: List with the sorted flight indices of each component.
+    :rtype: list
+    """
+    bays = compliant_bays(flights)
+    components = DisjointSet(flights.n_flights)
+
+    # Long stay flights.
+    for group in flights.groups:
+        components.union_all(group.flight_idx)
+
+    # Time conflicts on shared bays.
+    for i, j in time_conflicting_pairs(flights):
+        if bays[i] & bays[j]:
+            components.union(i, j)
+
+    # Adjacent bays.
+    departing = [i for i in range(flights.n_flights) if flights.departing(i)]
+    for bay_1, bay_2 in flights.airport.adjacency:
+        group_1 = [i for i in departing if bay_1 in bays[i]]
+        group_2 = [i for i in departing if bay_2 in bays[i]]
+        # Constraints are only created for pairs of different flights.
+        if group_1 and group_2 and len(set(group_1) | set(group_2)) > 1:
+            components.union_all(group_1 + group_2)
+
+    return components.sets()
+
+
+def gate_components(gate_assignment):
+    """
+    Finds the independent sub problems of the gate assignment. Two departing flights are
+    connected if they conflict in time and share a feasible gate (time conflict constraints).
+    Since domestic flights can only use the domestic gates and late KQ flights only the
+    terminal A gates, the domestic and international flights always end up in separate
+    components, which are split further in time.
+
+    :param ooc.GateAssignment gate_assignment: Gate assignment of the complete schedule.
+    :return: List with the sorted indices of the departing flights in each component.
+    :rtype: list
+    """
+    flights = gate_assignment.flights
+    departing = [i for i, _, _ in gate_assignment.departing_flights()]
+    gates = {i: frozenset(l for l in range(flights.airport.n_gates) if gate_assignment.is_feasible(i, l))
+             for i in departing}
+
+    components = DisjointSet(flights.n_flights)
+    for i, j in time_conflicting_pairs(flights, departing):
+        if gates[i] & gates[j]:
+            components.union(i, j)
+
+    departing = set(departing)
+    return [component for component in components.sets() if component[0] in departing]
@@ -0,0 +1,110 @@
+"""
+The class in here indexes the time conflicts and compliant bays of the flights, so they don't
+have to be checked for every pair of flights each time the lp code is generated. The index is
+kept up to date when flights are inserted, updated or cancelled on a live :class:`ooc.Flights`
+object, see :meth:`ooc.Flights.insert_flights`.
+"""
+
+from ooc.decomposition import time_conflicting_pairs
+
+
+class FlightIndex:
+    """
+    Index of the time conflicting flights and the compliant bays of each flight. Use
+    :meth:`ooc.Flights.build_index` to create it.
+
+    :param ooc.Flights flights: Flights object.
+    """
+
+    def __init__(self, flights):
+        self.flights = flights
+        self.buffer_time = flights.buffer_time  #: Buffer time the time conflicts were found with.
+        self.spare_bays = tuple(flights.spare_bays)  #: Spare bays the compliant bays were found with.
+        self.conflicts = []  #: List with the set of time conflicting flights of each flight.
+        self.compliant_bays = []  #: List with the frozenset of compliant bays of each flight.
+        self.build()
+
+    def build(self):
+        """
+        Builds the index for all flights.
+        """
+        n = self.flights.n_flights
+        self.compliant_bays = [self.find_compliant_bays(i) for i in range(n)]
+        self.conflicts = [set() for _ in range(n)]
+        for i, j in time_conflicting_pairs(self.flights, use_index=False):
+            self.conflicts[i].add(j)
+            self.conflicts[j].add(i)
+
+    def is_valid(self, flights):
+        """
+        :param ooc.Flights flights: Flights object.
+        :return: True if the index belongs to this flights object and it was built with it's
+           current buffer time and spare bays.
+        :rtype: bool
+        """
+        return self.flights is flights and \
+            self.buffer_time == flights.buffer_time and \
+            self.spare_bays == tuple(flights.spare_bays)
+
+    def find_compliant_bays(self, i):
+        """
+        :param int i: Flight index.
+        :return: Set of bays the flight is compliant with.
+        :rtype: frozenset
+        """
+        return frozenset(k for k in range(self.flights.airport.n_bays) if self.flights.bay_compliance(i, k))
+
+    def add(self, i):
+        """
+        Adds a flight that was appended to the schedule.
+
+        :param int i: Flight index.
+        """
+        if i != len(self.conflicts):
+            raise Exception("Only flights appended to the schedule can be added to the index.")
+        self.compliant_bays.append(frozenset())
+        self.conflicts.append(set())
+        self.update(i)
+
+    def update(self, i):
+        """
+        Updates the index after a flight changed. Only the pairs with this flight are checked again.
+
+        :param int i: Flight index.
+        """
+        for j in self.conflicts[i]:
+            self.conflicts[j].discard(i)
+        self.compliant_bays[i] = self.find_compliant_bays(i)
+        # Flights that are appended together are only checked against the flights already in the index.
+        self.conflicts[i] = {j for j in range(len(self.conflicts)) if j != i and self.flights.time_conflict(i, j)}
+        for j in self.conflicts[i]:
+            self.conflicts[j].add(i)
+
+    def remove(self, i):
+        """
+        Removes a flight that was removed from the schedule. The indices of the flights after it
+        are shifted down by one.
+
+        :param int i: Flight index.
+        """
+        for j in self.conflicts[i]:
+            self.conflicts[j].discard(i)
+        del self.conflicts[i]
+        del self.compliant_bays[i]
+        self.conflicts = [{j - (j > i) for j in conflicts} for conflicts in self.conflicts]
+
+    def pairs(self, flight_idx=None):
+        """
+        :param flight_idx: Optional iterable with the indices of the flights to check. Defaults to all flights.
+        :return: Generator yielding the ``(i, j)`` pairs of time conflicting flights with ``i < j``.
+        """
+        if flight_idx is None:
+            flight_idx = range(len(self.conflicts))
+            flight_set = None
+        else:
+            flight_idx = sorted(flight_idx)
+            flight_set = set(flight_idx)
+        for i in flight_idx:
+            for j in sorted(self.conflicts[i]):
+                if j > i and (flight_set is None or j in flight_set):
+                    yield i, j
@@ -4,9 +4,72 @@ This class holds the results for a single flight.
 
 # To be honest, I'm kinda regretting the decision I took in the beginning to not use SQL.
 
+import csv
+import io
+from operator import attrgetter
+
+
+def flight_type_to_str(solution, flight_type):
+    return str(flight_type)
+
+
+def time_to_str(solution, value):
+    return value.strftime("%H:%M")
+
+
+def preference_to_str(solution, preference):
+    if preference != "":
+        return "{:3}, ({}), ({})".format(preference.dest,
+                                         ";".join([solution.airport.bay_names[k] for k in preference.bays]),
+                                         ";".join([solution.airport.gate_names[j] for j in preference.gates]),)
+    else:
+        return ""
+
 
 class FlightSolution:
     """This class holds the solution of a single flight."""
+
+    __slots__ = ("airport",
+                 "flights",
+                 "idx",
+                 "flight_type",
+                 "in_flight_no",
+                 "origin",
+                 "eta",
+                 "reg_no",
+                 "out_flight_no",
+                 "dest",
+                 "etd",
+                 "ac_type",
+                 "pref",
+                 "bay",
+                 "gate",
+                 "bay_idx",
+                 "gate_idx")
+
+    cols = [("idx", 3, None),
+            ("flight_type", 11, flight_type_to_str),
+            ("in_flight_no", 12, None),
+            ("origin", 6, None),
+            ("eta", 5, time_to_str),
+            ("bay", 4, None),
+            ("gate", 4, None),
+            ("reg_no", 6, None),
+            ("out_flight_no", 13, None),
+            ("dest", 4, None),
+            ("etd", 5, time_to_str),
+            ("ac_type", 7, None),
+            ("pref", 15, preference_to_str)]
+    """
+    List with the name, width and string conversion function of each column in the
+    solution table. The conversion functions are called with the solution and value.
+    """
+
+    _col_values = attrgetter(*[name for name, _, _ in cols])
+    _conversions = [(col, type_conversion) for col, (_, _, type_conversion) in enumerate(cols)
+                    if type_conversion is not None]
+    _str_row_format = "".join("{{:>{}}}  ".format(width) for _, width, _ in cols) + "\n"
+
     def __init__(self, idx, bay_gate_solver):
         self.airport = bay_gate_solver.airport
         self.flights = bay_gate_solver.flights
@@ -28,61 +91,118 @@ class FlightSolution:
         self.bay_idx = None  #: Assigned bay index
         self.gate_idx = None  #: Assigned gate index
 
-        def preference_to_str(preference):
-            if preference != "":
-                return "{:3}, ({}), ({})".format(preference.dest,
-                                                 ";".join([self.airport.bay_names[k] for k in preference.bays]),
-                                                 ";".join([self.airport.gate_names[j] for j in preference.gates]),)
-            else:
-                return ""
-
-        self.cols = [("idx", 3, None),
-                     ("flight_type", 11, lambda x: str(x)),
-                     ("in_flight_no", 12, None),
-                     ("origin", 6, None),
-                     ("eta", 5, lambda x: x.strftime("%H:%M")),
-                     ("bay", 4, None),
-                     ("gate", 4, None),
-                     ("reg_no", 6, None),
-                     ("out_flight_no", 13, None),
-                     ("dest", 4, None),
-                     ("etd", 5, lambda x: x.strftime("%H:%M")),
-                     ("ac_type", 7, None),
-                     ("pref", 15, preference_to_str)]
-
-    def str_heading(self):
+    def values(self):
+        """
+        :return: List with the string converted value of each column. Missing values are empty strings.
+        :rtype: list
+        """
+        values = list(self._col_values(self))
+        for col, type_conversion in self._conversions:
+            if values[col] is not None:
+                values[col] = type_conversion(self, values[col])
+        return ["" if value is None else value for value in values]
+
+    @classmethod
+    def str_heading(cls):
         s = ""
-        for name, width, _ in self.cols:
+        for name, width, _ in cls.cols:
             s += "{name:{width}}  ".format(name=name, width=width)
         return s + "\n" + "="*len(s) + "\n"
 
     def str_data(self):
+        return self._str_row_format.format(*self.values())
 
-        s = ""
-        for name, width, type_conversion in self.cols:
-            value = getattr(self, name)
-            value = "" if value is None else value
-            if value is None:
-                value = ""
-            else:
-                value = type_conversion(value) if type_conversion is not None else value
-            s += "{name:>{width}}  ".format(name=value, width=width)
-        return s + "\n"
-
-    def csv_heading(self):
-        return ",".join(["{name:>{width}}  ".format(name=name, width=width) for name, width, _ in self.cols]) + "\n"
+    @classmethod
+    def csv_heading(cls):
+        """
+        :return: Heading row in the csv format written by :func:`write_csv`.
+        :rtype: string
+        """
+        return csv_line([name for name, _, _ in cls.cols])
 
     def csv_data(self):
-        s = ""
+        """
+        :return: Row in the csv format written by :func:`write_csv`.
+        :rtype: string
+        """
+        return csv_line(self.values())
+
+
+def csv_line(values):
+    """
+    :param list values: Values of a row.
+    :return: Row formatted by the csv writer.
+    :rtype: string
+    """
+    f = io.StringIO()
+    csv.writer(f).writerow(values)
+    return f.getvalue()
+
+
+def write_table(solutions, f):
+    """
+    Writes the solutions as a human readable table to a file. The rows are streamed to the
+    file one at a time.
+
+    :param list solutions: List of :class:`ooc.FlightSolution` objects.
+    :param f: Text file like object.
+    """
+    f.write(FlightSolution.str_heading())
+    f.writelines(solution.str_data() for solution in solutions)
+
+
+def write_csv(solutions, f):
+    """
+    Writes the solutions to a csv file. The rows are streamed to the file one at a time.
+
+    :param list solutions: List of :class:`ooc.FlightSolution` objects.
+    :param f: Text file like object. If it's a real file, it should be opened with ``newline=""``.
+    """
+    writer = csv.writer(f)
+    writer.writerow([name for name, _, _ in FlightSolution.cols])
+    writer.writerows(solution.values() for solution in solutions)
+
+
+def save_npz(solutions, path):
+    """
+    Saves the solutions in a compressed columnar numpy ``.npz`` file. Each column is stored
+    as a separate array. Times are stored as ``datetime64[m]`` and missing indices as -1.
+
+    :param list solutions: List of :class:`ooc.FlightSolution` objects.
+    :param string path: Path to the output file.
+    """
+    # numpy is only needed for this export, so it's imported here to keep importing ooc light.
+    import numpy as np
+
+    n = len(solutions)
+
+    def column(name, dtype, convert=None):
+        getter = attrgetter(name)
+        if convert is None:
+            return np.fromiter((getter(solution) for solution in solutions), dtype=dtype, count=n)
+        return np.fromiter((convert(getter(solution)) for solution in solutions), dtype=dtype, count=n)
+
+    def string_column(name):
+        getter = attrgetter(name)
+        return np.array(["" if getter(solution) is None else getter(solution) for solution in solutions], dtype=str)
+
+    def index_or_minus_one(value):
+        return -1 if value is None else value
 
-        def row_generator():
-            for name, width, type_conversion in self.cols:
-                value = getattr(self, name)
-                value = "" if value is None else value
-                if value is None:
-                    value = ""
-                else:
-                    value = type_conversion(value) if type_conversion is not None else value
-                yield "{name:>{width}}  ".format(name=value, width=width)
-
-        return ",".join(row_generator()) + "\n"
+    np.savez_compressed(
+        path,
+        idx=column("idx", np.int64),
+        flight_type=column("flight_type", np.int8, lambda x: x.value),
+        in_flight_no=string_column("in_flight_no"),
+        origin=string_column("origin"),
+        eta=np.array([solution.eta for solution in solutions], dtype="datetime64[m]"),
+        reg_no=string_column("reg_no"),
+        out_flight_no=string_column("out_flight_no"),
+        dest=string_column("dest"),
+        etd=np.array([solution.etd for solution in solutions], dtype="datetime64[m]"),
+        ac_type=string_column("ac_type"),
+        bay=string_column("bay"),
+        gate=string_column("gate"),
+        bay_idx=column("bay_idx", np.int64, index_or_minus_one),
+        gate_idx=column("gate_idx", np.int64, index_or_minus_one),
+    )
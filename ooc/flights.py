@@ -5,7 +5,8 @@ The class in here loads in and processes the data about the flight schedule.
 from recordclass import recordclass
 from enum import Enum
 from os.path import abspath, join, normpath
-from datetime import time, date, datetime, timedelta
+from datetime import datetime, timedelta
+import csv
 import json
 
 
@@ -41,6 +42,21 @@ Named tuple used to hold the current location of overnight flights.
 """
 
 
+GroupType = recordclass("GroupType",
+                        ("flight_idx",
+                         "overnight",
+                         "in_flight_no",
+                         "origin",
+                         "out_flight_no",
+                         "dest"))
+"""
+Named tuple used to hold a flight group, ie. a full flight or the arrival, park and departure parts
+of a split flight. ``flight_idx`` holds the indices of the flights in the group. The inbound flight
+number and origin are those of the first flight and the outbound flight number and destination
+those of the last flight.
+"""
+
+
 class ft(Enum):
     """
     Enumerator used to represent the flight type.
@@ -51,6 +67,171 @@ class ft(Enum):
     Dep = 3
 
 
+flight_schedule_columns = ["flight_type", "in_flight_no", "origin", "eta", "bay", "gate", "reg_no", "out_flight_no",
+                           "dest", "etd", "ac_type"]
+"""
+Columns of the flight schedule csv file.
+"""
+
+
+def parse_minutes(values, path=None):
+    """
+    Converts times in the 'HH:MM' format to minutes since midnight. All values are converted
+    at once with numpy.
+
+    :param list values: List of time strings.
+    :param string path: Path to the file holding the times, used in the error message.
+    :return: List with the number of minutes since midnight of each time.
+    :rtype: list
+    """
+    if not len(values):
+        return []
+
+    # numpy is only imported once a schedule is loaded, to keep importing ooc light.
+    import numpy as np
+
+    parts = np.char.partition(np.array(values, dtype=str), ":")
+    try:
+        minutes = parts[:, 0].astype(int) * 60 + parts[:, 2].astype(int)
+    except ValueError:
+        raise Exception("Invalid time in the flight schedule '{}'. Times should be formatted as 'HH:MM'.".format(path))
+    return minutes.tolist()
+
+
+def normalize_row(row):
+    """
+    :param row: Dictionary with the values per flight schedule csv column or a list with the
+       values in the order of the columns.
+    :return: List with the values in the order of the columns. The values are stripped strings
+       or None if they are missing.
+    :rtype: list
+    """
+    if isinstance(row, dict):
+        row = [row.get(name) for name in flight_schedule_columns]
+    return [None if value is None else (str(value).strip() or None) for value in row]
+
+
+class FlightSchedule:
+    """
+    List like container holding the flight schedule. The flights are stored in columns and the
+    :data:`FlightType` record of a flight is only created the first time it's accessed. After that
+    the same record is returned. The eta and etd are stored as minutes since midnight of the
+    schedule's date, they are negative for flights that arrived on the previous day.
+
+    :param datetime.date schedule_date: Date of the schedule.
+    :param dict columns: Dictionary with a list per :data:`FlightType` field.
+    """
+
+    def __init__(self, schedule_date, columns=None):
+        self.midnight = datetime(*schedule_date.timetuple()[:3])  #: Midnight at the start of the schedule's date.
+        self.columns = columns or {name: [] for name in FlightType.__fields__}  #: Dictionary with the columns.
+        self.records = [None] * len(self.columns["flight_type"])  #: List with the records that were created.
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        record = self.records[i]
+        if record is None:
+            record = self.records[i] = self.create_record(i)
+        return record
+
+    def __setitem__(self, i, flight):
+        self.records[i] = flight
+
+    def __delitem__(self, i):
+        del self.records[i]
+        for column in self.columns.values():
+            del column[i]
+
+    def __iter__(self):
+        for i in range(len(self.records)):
+            yield self[i]
+
+    def extend_columns(self, columns):
+        """
+        Appends flights to the schedule without creating their records.
+
+        :param dict columns: Dictionary with a list per :data:`FlightType` field.
+        """
+        for name, column in self.columns.items():
+            column.extend(columns[name])
+        self.records.extend([None] * len(columns["flight_type"]))
+
+    def insert(self, i, flight):
+        """
+        :param int i: Index to insert the flight at.
+        :param FlightType flight: Flight record.
+        """
+        self.records.insert(i, flight)
+        for column in self.columns.values():
+            column.insert(i, None)
+
+    def append(self, flight):
+        """
+        :param FlightType flight: Flight record.
+        """
+        self.insert(len(self.records), flight)
+
+    def clear(self):
+        self.records.clear()
+        for column in self.columns.values():
+            column.clear()
+
+    def create_record(self, i):
+        """
+        :param int i: Flight index.
+        :return: A new record for a flight, created from the columns.
+        :rtype: FlightType
+        """
+        columns = self.columns
+        return FlightType(flight_type=columns["flight_type"][i],
+                          in_flight_no=columns["in_flight_no"][i],
+                          origin=columns["origin"][i],
+                          eta=self.midnight + timedelta(minutes=columns["eta"][i]),
+                          reg_no=columns["reg_no"][i],
+                          out_flight_no=columns["out_flight_no"][i],
+                          dest=columns["dest"][i],
+                          etd=self.midnight + timedelta(minutes=columns["etd"][i]),
+                          ac_type=columns["ac_type"][i],
+                          airline=columns["airline"][i],
+                          preference=columns["preference"][i],
+                          current=columns["current"][i])
+
+    def value(self, i, name):
+        """
+        Gets a field of a flight without creating it's record.
+
+        :param int i: Flight index.
+        :param string name: Field name.
+        :return: Value of the field. The eta and etd are returned in minutes since midnight.
+        """
+        record = self.records[i]
+        if record is None:
+            return self.columns[name][i]
+        value = getattr(record, name)
+        if name in ["eta", "etd"]:
+            return int((value - self.midnight).total_seconds() // 60)
+        return value
+
+    def set_value(self, i, name, value):
+        """
+        Sets a field of a flight. The record is updated as well if it was already created.
+
+        :param int i: Flight index.
+        :param string name: Field name.
+        :param value: New value. The eta and etd are given in minutes since midnight.
+        """
+        self.columns[name][i] = value
+        record = self.records[i]
+        if record is not None:
+            if name in ["eta", "etd"]:
+                value = self.midnight + timedelta(minutes=value)
+            setattr(record, name, value)
+
+
 class Flights:
     """
     Class holding the information regarding the flights.
@@ -97,16 +278,20 @@ class Flights:
         self.config_path = normpath(join(flight_data_path, "config.json"))
         """Path to the json file holding the schedule configuration parameters."""
 
-        self.flight_schedule = []  #: List holding the flight schedule and information.
+        self.flight_schedule = []  #: :class:`FlightSchedule` holding the flight schedule and information.
         self.preferences_table = {}  #: Dictionary holding the flight preference table.
         self.current_table = {}  #: Dictionary holding the current location of overninght flights.
         self.config = {}  #: Dictionary holding other properties about the schedule.
+        self.index = None  #: Optional :class:`ooc.flight_index.FlightIndex`, see :meth:`build_index`.
+        self.groups = []  #: List with the :data:`GroupType` of each full flight and split flight.
+        self.flight_group = []  #: List with the index of the group of each flight.
 
         # Load data files
         self.load_config()
         self.load_current()
         self.load_preferences()
         self.load_flight_data()
+        self.build_groups()
         self.check_duplicate_flights()
         self.process_overnight_flights()
         self.process_flight_preferences()
@@ -118,87 +303,84 @@ class Flights:
 
     def load_flight_data(self):
         """
-        Loads the flight schedule csv file.
+        Loads the flight schedule csv file. The whole file is parsed at once into columns and the
+        times are converted to minutes in a single pass. The :data:`FlightType` records are only
+        created when a flight is accessed, see :class:`FlightSchedule`.
         """
-        with open(self.flight_data_path) as f:
-            self.flight_schedule.clear()
-
-            # Read the first line
-            # Split the line at the commas
-            # Strip any leading or trailing spaces, tabs, etc.
-            heading = [x.strip() for x in f.readline().split(",")]
+        with open(self.flight_data_path, newline="") as f:
+            reader = csv.reader(f)
 
             # Check if the heading is valid.
-            if heading != ["flight_type",
-                           "in_flight_no",
-                           "origin",
-                           "eta",
-                           "bay",
-                           "gate",
-                           "reg_no",
-                           "out_flight_no",
-                           "dest",
-                           "etd",
-                           "ac_type"]:
+            heading = [x.strip() for x in next(reader, [])]
+            if heading != flight_schedule_columns:
                 raise Exception("Invalid flight schedule csv file '{}'.".format(self.flight_data_path))
 
-            line_nr = -1
-            # Read line by line.
-            for line in f:
-                line_nr += 1
-                # Split and strip values.
-                line_values = [None if y == "" else y for y in [x.strip() for x in line.split(",")]]
-
-                # Get and check airline code. If neither an inbound
-                # nor outbound flight number was given, set airline
-                # code to None.
-                airline_code = None
-                for fl_no in [line_values[1],   # Inbound flight number
-                              line_values[7]]:  # Outbound flight number
-                    if fl_no is not None:  # If there is a flight number get airline code.
-                        airline_code = fl_no[:2]
-                        # Check whether the airline code was defined in the airlines csv file.
-                        if airline_code not in self.airport.airlines:
-                            raise Exception("Airline '{}' for flight '{}' is invalid.".format(airline_code,
-                                                                                              len(self.flight_schedule)))
-
-                # If this flight has neither an inbound nor outbound flight number, than get the airline code from the
-                # last read flight. This happens for park flights and departure flights at the end of the day.
-                if airline_code is None:
-                    airline_code = self.flight_schedule[-1].airline
-
-
-
-                # Find current location if known.
-                current_location = None
-                for flight_no in [line_values[1], line_values[7]]:
-                    if flight_no is None:
-                        continue
-                    if flight_no in self.current_table:
-                        current_location = self.current_table[flight_no]
-
-                # Create flight object.
-                flight = FlightType(flight_type=ft[line_values[0]],  # Get ft enumerator.,
-                                    in_flight_no=line_values[1],
-                                    origin=line_values[2],
-                                    eta=datetime(*self.config['date'].timetuple()[:3], *[int(x) for x in line_values[3].split(":")]),  # create time obj from eta
-                                    # bay=line_values[4],
-                                    # gate=line_values[5],
-                                    reg_no=line_values[6],
-                                    out_flight_no=line_values[7],
-                                    dest=line_values[8],
-                                    etd=datetime(*self.config['date'].timetuple()[:3], *[int(x) for x in line_values[9].split(":")]),  # create time obj from etd
-                                    ac_type=line_values[10],
-                                    airline=airline_code,
-                                    preference=None,
-                                    current=current_location)
-
-                # Check if the aircraft type is valid
-                if flight.ac_type not in self.airport.aircraft:
-                    raise Exception("Invalid aircraft type '{}' for flight '{}'.".format(flight.ac_type,
-                                                                                         len(self.flight_schedule)))
-
-                self.flight_schedule.append(flight)
+            # Strip the values and replace empty ones with None. Empty lines are skipped.
+            rows = [[x.strip() or None for x in row] for row in reader if row]
+
+        self.flight_schedule = FlightSchedule(self.config['date'], self.parse_flight_rows(rows))
+
+    def parse_flight_rows(self, rows, first=0):
+        """
+        Parses rows of the flight schedule.
+
+        :param list rows: List with the values of each row in the order of the flight schedule csv
+           columns. The values are stripped strings or None if they are missing.
+        :param int first: Index of the first flight, used in the error messages.
+        :return: Dictionary with a list per :data:`FlightType` field. The eta and etd are in
+           minutes since midnight.
+        :rtype: dict
+        """
+        for i, row in enumerate(rows, first):
+            if len(row) != len(flight_schedule_columns):
+                raise Exception("Flight '{}' in '{}' has {} values instead of {}.".format(
+                    i, self.flight_data_path, len(row), len(flight_schedule_columns)))
+
+        (flight_types, in_flight_nos, origins, etas, _, _, reg_nos, out_flight_nos, dests, etds, ac_types) = \
+            [list(column) for column in zip(*rows)] if rows else [[] for _ in flight_schedule_columns]
+
+        # Get the ft enumerators.
+        try:
+            flight_types = [ft[flight_type] for flight_type in flight_types]
+        except KeyError as e:
+            raise Exception("Invalid flight type {} in '{}'.".format(e, self.flight_data_path))
+
+        # Get and check the airline codes. The outbound flight number takes precedence. If this flight
+        # has neither an inbound nor outbound flight number, than use the airline code of the previous
+        # flight. This happens for park flights and departure flights at the end of the day.
+        airlines = []
+        airline_code = None
+        for i, flight_nos in enumerate(zip(in_flight_nos, out_flight_nos), first):
+            for flight_no in flight_nos:
+                if flight_no is not None:
+                    airline_code = flight_no[:2]
+                    # Check whether the airline code was defined in the airlines csv file.
+                    if airline_code not in self.airport.airlines:
+                        raise Exception("Airline '{}' for flight '{}' is invalid.".format(airline_code, i))
+            airlines.append(airline_code)
+
+        # Check if the aircraft types are valid
+        for i, ac_type in enumerate(ac_types, first):
+            if ac_type not in self.airport.aircraft:
+                raise Exception("Invalid aircraft type '{}' for flight '{}'.".format(ac_type, i))
+
+        # Find the current location if known. The outbound flight number takes precedence.
+        current = self.current_table.get
+        currents = [current(out_flight_no, current(in_flight_no))
+                    for in_flight_no, out_flight_no in zip(in_flight_nos, out_flight_nos)]
+
+        return {"flight_type": flight_types,
+                "in_flight_no": in_flight_nos,
+                "origin": origins,
+                "eta": parse_minutes(etas, self.flight_data_path),
+                "reg_no": reg_nos,
+                "out_flight_no": out_flight_nos,
+                "dest": dests,
+                "etd": parse_minutes(etds, self.flight_data_path),
+                "ac_type": ac_types,
+                "airline": airlines,
+                "preference": [None] * len(rows),
+                "current": currents}
 
     def load_preferences(self):
         """
@@ -252,26 +434,95 @@ class Flights:
                 current = CurrentType(bay=bay_index)
                 self.current_table[line_values[0]] = current
 
-    def process_flight_preferences(self):
-        for i, flight in enumerate(self.flight_schedule):
-            # Find flight_nos
-            in_flight = [None, None]
-            out_flight = [None, None]
-            if flight.flight_type in [ft.Arr, ft.Park, ft.Dep]:
-                j = [ft.Arr, ft.Park, ft.Dep].index(flight.flight_type)
-                in_flight[0] = self.flight_schedule[i - j].in_flight_no
-                in_flight[1] = self.flight_schedule[i - j].origin
-                out_flight[0] = self.flight_schedule[i + 2 - j].out_flight_no
-                out_flight[1] = self.flight_schedule[i + 2 - j].dest
+    def build_groups(self):
+        """
+        Builds the group table. Each full flight is a group on it's own and the arrival, park and
+        departure parts of a split flight form one group.
+        """
+        flight_types = [self.flight_schedule.value(i, "flight_type") for i in range(self.n_flights)]
+        self.groups = []
+        self.flight_group = []
+        i = 0
+        while i < len(flight_types):
+            if flight_types[i] == ft.Full:
+                flight_idx = (i,)
+            elif flight_types[i] == ft.Arr and flight_types[i + 1:i + 3] == [ft.Park, ft.Dep]:
+                flight_idx = (i, i + 1, i + 2)
             else:
-                in_flight[0] = flight.in_flight_no
-                in_flight[1] = flight.origin
-                out_flight[0] = flight.out_flight_no
-                out_flight[1] = flight.dest
+                raise Exception("Flight '{}' is not a full flight or the start of an 'Arr', 'Park' and 'Dep' "
+                                "split flight.".format(i))
+            self.add_group(flight_idx)
+            i += len(flight_idx)
+
+    def add_group(self, flight_idx):
+        """
+        Adds a group for flights that were appended to the schedule.
+
+        :param tuple flight_idx: Indices of the flights in the group.
+        """
+        self.flight_group.extend([len(self.groups)] * len(flight_idx))
+        self.groups.append(GroupType(flight_idx=flight_idx, overnight=False, in_flight_no=None, origin=None,
+                                     out_flight_no=None, dest=None))
+        self.update_group(len(self.groups) - 1)
+
+    def update_group(self, g):
+        """
+        Updates the flight numbers, airports and overnight flag of a group after it's flights changed.
+
+        :param int g: Group index.
+        """
+        schedule = self.flight_schedule
+        group = self.groups[g]
+        first, last = group.flight_idx[0], group.flight_idx[-1]
+        group.in_flight_no = schedule.value(first, "in_flight_no")
+        group.origin = schedule.value(first, "origin")
+        group.out_flight_no = schedule.value(last, "out_flight_no")
+        group.dest = schedule.value(last, "dest")
+
+        # A flight is an overnight flight if any of it's parts spans midnight.
+        day = 24 * 60
+        group.overnight = any(schedule.value(i, "eta") // day != schedule.value(i, "etd") // day or
+                              schedule.value(i, "etd") < schedule.value(i, "eta") for i in group.flight_idx)
+
+    def remove_group(self, g):
+        """
+        Removes a group of flights that were removed from the schedule. The indices of the
+        flights and groups after it are shifted down.
+
+        :param int g: Group index.
+        """
+        first = self.groups[g].flight_idx[0]
+        n = len(self.groups[g].flight_idx)
+        del self.groups[g]
+        del self.flight_group[first:first + n]
+        for group in self.groups[g:]:
+            group.flight_idx = tuple(i - n for i in group.flight_idx)
+        self.flight_group[first:] = [h - 1 for h in self.flight_group[first:]]
+
+    def groups_of(self, flight_idx=None):
+        """
+        :param flight_idx: Optional iterable with flight indices. Defaults to all flights.
+        :return: Sorted list with the indices of the groups the flights belong to.
+        :rtype: list
+        """
+        if flight_idx is None:
+            return list(range(len(self.groups)))
+        return sorted({self.flight_group[i] for i in flight_idx})
+
+    def process_flight_preferences(self, flight_idx=None):
+        """
+        Finds the preference of each flight. The inbound flight number of the first part and the
+        outbound flight number of the last part of a split flight are used for all three parts.
+
+        :param flight_idx: Optional iterable with the indices of the flights to process. Defaults to
+           all flights. The whole group of each flight is processed.
+        """
+        for g in self.groups_of(flight_idx):
+            group = self.groups[g]
 
             # Find flight preference.
             flight_preference = None
-            for flight_no, airport_code in [in_flight, out_flight]:
+            for flight_no, airport_code in [(group.in_flight_no, group.origin), (group.out_flight_no, group.dest)]:
                 if flight_no is None:
                     continue
                 for flight_pref_no in self.preferences_table:
@@ -281,52 +532,211 @@ class Flights:
                 if flight_preference is not None:
                     break
 
-            self.flight_schedule[i].preference = flight_preference
+            for i in group.flight_idx:
+                self.flight_schedule.set_value(i, "preference", flight_preference)
 
+    def process_overnight_flights(self, flight_idx=None):
+        """
+        Since the schedule does not have the date information for the flight's eta and etd they will
+        all be loaded in on the same date. This is not true for overnight flights that arrived on the previous
+        day. This function fixes the eta and etd dates for overnight flights. It works on the times in
+        minutes, so no records are created. Flights that were already moved are not moved again.
 
+        :param flight_idx: Optional iterable with the indices of the flights to process. Defaults to
+           all flights. The whole group of each flight is processed.
+        """
+        schedule = self.flight_schedule
+        day = 24 * 60
+
+        def eta(i):
+            return schedule.value(i, "eta")
+
+        def etd(i):
+            return schedule.value(i, "etd")
+
+        # Loop through all groups.
+        for g in self.groups_of(flight_idx):
+            flight_idx = self.groups[g].flight_idx
+
+            # Check whether any of the parts is an overnight flight. If so, move it and all
+            # parts before it to the previous day.
+            if any(etd(i) < eta(i) for i in flight_idx):
+                previous_part_overnight = False
+                for i in reversed(flight_idx):
+                    if previous_part_overnight:
+                        schedule.set_value(i, "eta", eta(i) - day)
+                        schedule.set_value(i, "etd", etd(i) - day)
+                    if eta(i) > etd(i):
+                        schedule.set_value(i, "eta", eta(i) - day)
+                        previous_part_overnight = True
+            self.update_group(g)
+
+    def check_duplicate_flights(self, flight_idx=None):
+        """
+        Check for duplicate flights in the flight schedule data. Flights are duplicates if they have
+        the same inbound or outbound flight number, eta and etd.
 
+        :param flight_idx: Optional iterable with the indices of the flights to check. Only duplicates
+           of these flights are reported. Defaults to all flights.
+        """
+        schedule = self.flight_schedule
+        seen = {}
+        duplicates = set()
+        for i in range(self.n_flights):
+            times = (schedule.value(i, "eta"), schedule.value(i, "etd"))
+            for direction in ["in_flight_no", "out_flight_no"]:
+                flight_no = schedule.value(i, direction)
+                if flight_no is None:
+                    continue
+                key = (direction, flight_no) + times
+                for j in seen.get(key, ()):
+                    duplicates.add((j, i))
+                seen.setdefault(key, []).append(i)
 
-    def process_overnight_flights(self):
+        if flight_idx is not None:
+            flight_idx = set(flight_idx)
+            duplicates = {(i, j) for i, j in duplicates if i in flight_idx or j in flight_idx}
+
+        for i, j in sorted(duplicates):
+            print("Warning: Duplicate flights {} {}".format(i, j))  # Print a warning
+
+    def build_index(self):
         """
-        Since the schedule does not have the date information for the flight's eta and etd they will
-        all be loaded in on the same date. This is not true for overnight flights that arrived on the previous
-        day. This function fixes the eta and etd dates for overnight flights.
+        Builds the index of the time conflicting flights and compliant bays. Once built, it's kept up to
+        date by :meth:`insert_flights`, :meth:`update_flight` and :meth:`cancel_flight` and it's used to
+        generate the lp code.
 
-        :return:
+        :return: The index.
+        :rtype: ooc.flight_index.FlightIndex
         """
-        # Loop through all flights.
-        for i, flight in enumerate(self.flight_schedule):
-            # Check if it's an
-            if self.is_overnight(i):
-                if flight.flight_type == ft.Arr:
-                    previous_part_overnight = False
-                    for j in [2, 1, 0]:
-                        if previous_part_overnight:
-                            self.flight_schedule[i + j].eta -= timedelta(days=1)
-                            self.flight_schedule[i + j].etd -= timedelta(days=1)
-                        if self.flight_schedule[i+j].eta > self.flight_schedule[i+j].etd:
-                            self.flight_schedule[i + j].eta -= timedelta(days=1)
-                            previous_part_overnight = True
-                if flight.flight_type == ft.Full:
-                    self.flight_schedule[i].eta -= timedelta(days=1)
+        from ooc.flight_index import FlightIndex
+        self.index = None
+        self.index = FlightIndex(self)
+        return self.index
 
-    def check_duplicate_flights(self):
+    def valid_index(self):
         """
-        Check for duplicate flights in the flight schedule data.
+        :return: The index if it was built for the current buffer time and spare bays, otherwise None.
+        :rtype: ooc.flight_index.FlightIndex
         """
+        if self.index is not None and self.index.is_valid(self):
+            return self.index
+        return None
 
-        # Loop through all flight combinations
-        for i in range(self.n_flights):
-            for j in range(i+1, self.n_flights):
-                # Checks whether the flight numbers, eta and etd of the two flights are the same.
-                if (((self.flight_schedule[i].in_flight_no == self.flight_schedule[j].in_flight_no) and
-                     (self.flight_schedule[i].in_flight_no is not None)) or
-                    ((self.flight_schedule[i].out_flight_no == self.flight_schedule[j].out_flight_no) and
-                     (self.flight_schedule[i].out_flight_no is not None))
-                    ) and \
-                        (self.flight_schedule[i].eta == self.flight_schedule[j].eta) and \
-                        (self.flight_schedule[i].etd == self.flight_schedule[j].etd):
-                    print("Warning: Duplicate flights {} {}".format(i, j))  # Print a warning
+    def split_group(self, i):
+        """
+        :param int i: Flight index.
+        :return: List with the indices of the arrival, park and departure parts of a split flight
+           or just the index of the flight if it's a full flight.
+        :rtype: list
+        """
+        return list(self.groups[self.flight_group[i]].flight_idx)
+
+    def flight_row(self, i):
+        """
+        :param int i: Flight index.
+        :return: Dictionary with the values of the flight in the flight schedule csv columns. The
+           eta and etd are formatted as 'HH:MM'.
+        :rtype: dict
+        """
+        schedule = self.flight_schedule
+        row = {name: schedule.value(i, name) for name in flight_schedule_columns if name not in ["bay", "gate"]}
+        row["flight_type"] = row["flight_type"].name
+        for name in ["eta", "etd"]:
+            row[name] = "{:02d}:{:02d}".format(*divmod(row[name] % (24 * 60), 60))
+        return row
+
+    def insert_flights(self, rows):
+        """
+        Appends new flights to the schedule. Their overnight dates, preferences and current locations
+        are processed and the index is updated if it was built. The other flights are not changed.
+
+        :param list rows: List with the new flights. Each flight is a dictionary with the values per
+           flight schedule csv column or a list with the values in the order of the columns. The eta
+           and etd are formatted as 'HH:MM'. Split flights are given as their 'Arr', 'Park' and 'Dep'
+           parts in this order.
+        :return: List with the indices of the new flights.
+        :rtype: list
+        """
+        rows = [normalize_row(row) for row in rows]
+
+        # Check whether the split flights are complete, before anything is changed.
+        flight_types = [row[0] for row in rows]
+        group_sizes = []
+        k = 0
+        while k < len(flight_types):
+            if flight_types[k] == "Arr" and flight_types[k + 1:k + 3] == ["Park", "Dep"]:
+                group_sizes.append(3)
+            elif flight_types[k] == "Full":
+                group_sizes.append(1)
+            else:
+                raise Exception("Flight {} is not a full flight or the start of an 'Arr', 'Park' and 'Dep' "
+                                "split flight.".format(k))
+            k += group_sizes[-1]
+
+        first = self.n_flights
+        self.flight_schedule.extend_columns(self.parse_flight_rows(rows, first))
+        flight_idx = list(range(first, self.n_flights))
+        for size in group_sizes:
+            self.add_group(tuple(range(first, first + size)))
+            first += size
+
+        self.check_duplicate_flights(flight_idx)
+        self.process_overnight_flights(flight_idx)
+        self.process_flight_preferences(flight_idx)
+        if self.index is not None:
+            for i in flight_idx:
+                self.index.add(i)
+        return flight_idx
+
+    def update_flight(self, i, **values):
+        """
+        Changes the values of a flight, eg. a new eta, and processes it's split flight again.
+
+        :param int i: Flight index.
+        :param values: New values per flight schedule csv column, eg. ``etd="14:35"`` or ``ac_type="B738"``.
+           The flight type can't be changed.
+        :return: List with the indices of the flights that were processed again.
+        :rtype: list
+        """
+        for name in values:
+            if name not in flight_schedule_columns or name in ["flight_type", "bay", "gate"]:
+                raise Exception("The '{}' of a flight can't be updated.".format(name))
+
+        group = self.split_group(i)
+        rows = [self.flight_row(j) for j in group]
+        rows[group.index(i)].update(values)
+        columns = self.parse_flight_rows([normalize_row(row) for row in rows], group[0])
+
+        # The times are reset to the same day, so the overnight flights are processed from scratch.
+        for name, column in columns.items():
+            for j, value in zip(group, column):
+                self.flight_schedule.set_value(j, name, value)
+
+        self.check_duplicate_flights(group)
+        self.process_overnight_flights(group)
+        self.process_flight_preferences(group)
+        if self.index is not None:
+            for j in group:
+                self.index.update(j)
+        return group
+
+    def cancel_flight(self, i):
+        """
+        Removes a flight from the schedule. If it's part of a split flight, all three parts are
+        removed. The indices of the flights after it are shifted down.
+
+        :param int i: Flight index.
+        :return: List with the indices the removed flights had.
+        :rtype: list
+        """
+        group = self.split_group(i)
+        for j in reversed(group):
+            del self.flight_schedule[j]
+            if self.index is not None:
+                self.index.remove(j)
+        self.remove_group(self.flight_group[i])
+        return group
 
     @property
     def n_flights(self):
@@ -447,6 +857,20 @@ class Flights:
             # Both are overnight flights, so they are time conflicting.
             return True
 
+    def buffered_window(self, i):
+        """
+        Returns the time window a flight occupies its bay, including the buffer times. Just like
+        in :meth:`time_conflict`, a preceding buffer time is only added to arrival and full flights
+        and a trailing buffer time only to departure and full flights.
+
+        :param int i: Flight index
+        :return: Tuple with the buffered eta and etd.
+        """
+        flight = self.flight_schedule[i]
+        eta = flight.eta - (self.buffer_time if flight.flight_type in [ft.Arr, ft.Full] else timedelta(0))
+        etd = flight.etd + (self.buffer_time if flight.flight_type in [ft.Dep, ft.Full] else timedelta(0))
+        return eta, etd
+
     def bay_compliance(self, i, k):
         """
         :param int i: Flight index
@@ -461,33 +885,10 @@ class Flights:
     def is_overnight(self, i):
         """
         :param i: Flight id
-        :return: A boolean indicating whether a flight is an overnight flight or not.
+        :return: A boolean indicating whether a flight is an overnight flight or not. For split
+           flights this is the case if any of it's parts is an overnight flight.
         """
-
-        f = self.flight_schedule[i]
-
-        # This will be valid for general use.
-        if f.flight_type == ft.Full:
-            if f.eta.day != f.etd.day:
-                return True
-        else:
-            i -= [ft.Arr, ft.Park, ft.Dep].index(f.flight_type)
-            if (f.etd.day != f.eta.day) or \
-                   (self.flight_schedule[i+1].etd.day != self.flight_schedule[i+1].eta.day) or \
-                   (self.flight_schedule[i+2].etd.day != self.flight_schedule[i+2].eta.day):
-                return True
-
-        # Since the schedule does not contain information on which day the flights eta and etd are. The will
-        # both be loaded in on the same day. This part of the function is used to detect overnight flights in
-        # this scenario. This is then used by the process_overnight_flights() to fix the dates for overnight
-        # flights.
-        if f.flight_type == ft.Full:
-            return f.etd < f.eta
-        else:
-            i -= [ft.Arr, ft.Park, ft.Dep].index(f.flight_type)
-            return (f.etd < f.eta) or \
-                   (self.flight_schedule[i+1].etd < self.flight_schedule[i+1].eta) or \
-                   (self.flight_schedule[i+2].etd < self.flight_schedule[i+2].eta)
+        return self.groups[self.flight_group[i]].overnight
 
     def beta(self):
         return self.gamma() * 3
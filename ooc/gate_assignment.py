@@ -5,6 +5,9 @@ The class in here generates the code for the bay assignment.
 from datetime import datetime, time
 from math import isclose
 
+from ooc.intervals import maximal_cliques
+from ooc.profiling import NullProfiler
+
 
 class GateAssignment:
     """
@@ -15,9 +18,28 @@ class GateAssignment:
 
     :param ooc.Flights: Flight object holding the information on all
         the flights of the day.
+
+    :param ooc.profiling.Profiler profiler: Optional profiler used to record the time
+       and size of each generated section of lp code.
+
+    :param flight_subset: Optional iterable with the indices of the flights to generate the
+       code for, eg. an independent component found by :func:`ooc.decomposition.gate_components`.
+       Only the departing flights in the subset are assigned to a gate.
+
+    :param tuple weights: Optional tuple with the ``(epsilon, eta)`` objective function weights.
+       By default they are calculated while generating the objective function. When
+       generating the code for a subset of the flights, the weights of the complete
+       schedule should be passed in, see :meth:`weights`.
+
+    :param list pools: Optional list with the pools of identical gates, see :func:`ooc.aggregation.gate_pools`.
+       Decision variables are only created for the first gate of each pool, and the time
+       conflicts on pooled gates are replaced by soft capacity constraints on the flights
+       overlapping at the same moment. The solution has to be disaggregated afterwards, see
+       :func:`ooc.aggregation.disaggregate`.
     """
 
-    def __init__(self, flights, bays, line_width_limit=120):
+    def __init__(self, flights, bays, line_width_limit=120, profiler=None, flight_subset=None, weights=None,
+                 pools=None):
         self.airport = flights.airport
         """"
         class:`ooc.Airport` object of holding the information of
@@ -39,16 +61,53 @@ class GateAssignment:
 
         self.m_list = []
 
+        self.o_list = []
+        """
+        List holding the names of the penalty values with the number of flights exceeding the
+        capacity of a pool of gates.
+        """
+
+        if pools is None:
+            pools = [[l] for l in range(self.airport.n_gates)]
+
+        self.gates = [pool[0] for pool in pools]
+        """
+        Sorted list with the indices of the gates to create decision variables for. These are the
+        representatives of the pools.
+        """
+
+        self.capacity = {pool[0]: len(pool) for pool in pools}
+        """
+        Dictionary with the number of gates in the pool of each representative gate.
+        """
+
         self.line_width_limit = line_width_limit
         """
         Line width limit of the generated code. Lines might exceed this limit
         by a bit, since the checks are done after the new snippet has been written.
         """
 
+        self.profiler = NullProfiler() if profiler is None else profiler
+        """
+        Profiler used to record the time and size of each generated section of lp code.
+        """
+
+        self.flight_idx = list(range(flights.n_flights)) if flight_subset is None else sorted(flight_subset)
+        """
+        Sorted list with the indices of the flights the code is generated for.
+        """
+
         self.delta = 0.001
         self.epsilon = 1
         self.eta = 1
 
+        self.fixed_weights = weights is not None
+        """
+        True if the epsilon and eta weights were given, in which case they are not recalculated.
+        """
+        if self.fixed_weights:
+            self.epsilon, self.eta = weights
+
         self.terminal_a_gates = ['12', '13', '14', '15', '16', '17', '18', '19',
                                  '20', '21', '22', '23', '24', '20B']
         for i, gate_name in enumerate(self.terminal_a_gates):
@@ -61,15 +120,18 @@ class GateAssignment:
 
     def lp_code(self):
         print("Generating the lp code for the gate assignment...")
+        lp_section = self.profiler.lp_section
 
-        of_min_bay_gate_distance = self.of_min_bay_gate_distance()
-        of_airline_preference = self.of_airline_preference()
-        constraint_single_gate_per_flight = self.constraint_single_gate_per_flight()
-        constraint_time_conflict = self.constraint_time_conflict()
+        of_min_bay_gate_distance = lp_section("gate.of_min_bay_gate_distance", self.of_min_bay_gate_distance)
+        of_airline_preference = lp_section("gate.of_airline_preference", self.of_airline_preference)
+        constraint_single_gate_per_flight = lp_section("gate.constraint_single_gate_per_flight",
+                                                       self.constraint_single_gate_per_flight)
+        constraint_time_conflict = lp_section("gate.constraint_time_conflict", self.constraint_time_conflict)
         # constraint_domestic = self.constraint_domestic()
         # constraint_kq_after_6pm = self.constraint_kq_after_6pm()
-        binary_decision_variables_declaration = self.binary_decision_variables_declaration()
-        of_penalty_variables = self.of_penalty_variables()
+        binary_decision_variables_declaration = lp_section("gate.binary_decision_variables_declaration",
+                                                           self.binary_decision_variables_declaration)
+        of_penalty_variables = lp_section("gate.of_penalty_variables", self.of_penalty_variables)
 
         lp_code_parts = [
             "Maximize",
@@ -92,10 +154,54 @@ class GateAssignment:
         """
         Generator yielding the flight index, assigned bay and flight object of departing flights.
         """
-        for i in range(self.flights.n_flights):
+        for i in self.flight_idx:
             if self.flights.departing(i):
                 yield i, self.bay[i], self.flights.flight_schedule[i]
 
+    def weights(self):
+        """
+        Calculates the epsilon and eta objective function weights of the flights, see
+        :meth:`epsilon_weight` and :meth:`eta_weight`.
+
+        :return: Tuple with the epsilon and eta weights.
+        """
+        epsilon = self.epsilon_weight()
+        return epsilon, self.eta_weight(epsilon)
+
+    def epsilon_weight(self):
+        """
+        :return: The epsilon weight, which is twice the sum of the largest bay gate distance term
+           of each flight, so the airline preference outweighs the distance.
+        :rtype: float
+        """
+        of_max_value = 0
+        for i, k, flight in self.departing_flights():
+            flight_max_value = 0
+            for l in self.gates:
+                if self.is_feasible(i, l):
+                    constant = self.flights.n_passengers(i) * self.airport.bay_gate_distance[k][l] * self.delta
+                    if constant > flight_max_value:
+                        flight_max_value = constant
+            of_max_value += flight_max_value
+        return 2 * of_max_value
+
+    def eta_weight(self, epsilon):
+        """
+        :param float epsilon: Epsilon weight.
+        :return: The eta weight, which is the sum of all airline preference terms but at least
+           epsilon, so the penalty variables outweigh both objectives.
+        :rtype: float
+        """
+        max_value = 0
+        for i, k, flight in self.departing_flights():
+            for l in self.gates:
+                if self.is_feasible(i, l):
+                    preference = self.preference(i, l)
+                    if preference is not None:
+                        max_value += epsilon * preference
+
+        return max_value if max_value >= epsilon else epsilon
+
     def x(self, i, l, allow_new=False):
         """
         Returns the name of the binary decision variable connecting a flight ``i``
@@ -136,6 +242,20 @@ class GateAssignment:
             self.m_list.append(name)
         return name
 
+    def o(self, l, i):
+        """
+        Returns the name of the penalty value of a capacity constraint.
+
+        :param l: Index of the representative gate of the pool.
+        :param i: Index of the flight starting the set of overlapping flights.
+        :returns: O penalty value name
+        :rtype: String
+        """
+        name = "O_{}_{}".format(l, i)
+        if name not in self.o_list:
+            self.o_list.append(name)
+        return name
+
     def flight_located_at_gate(self, i, l):
         # Check if the flight is a remote and gate l is a dedicated bussing gate.
         if (self.bay[i] in self.airport.remote_bays) and (l in self.airport.bussing_gates):
@@ -195,18 +315,13 @@ class GateAssignment:
         print(" - Objective function: Minimization of bay gate distance")
         z6 = "\\ Minimization of bay gate distance.\n   "
 
-        of_max_value = 0
-
         for i, k, flight in self.departing_flights():
-            flight_max_value = 0
-            for l in range(self.airport.n_gates):
+            for l in self.gates:
                 # Check if the bay gate combination is feasible
                 if self.is_feasible(i, l):
                     bay_gate_distance = self.airport.bay_gate_distance[k][l]
                     constant = self.flights.n_passengers(i) \
                                * bay_gate_distance * self.delta
-                    if constant > flight_max_value:
-                        flight_max_value = constant
 
                     # Generate string with the decision variable and it's constant
                     # and add it to the objective function.
@@ -218,19 +333,17 @@ class GateAssignment:
                     if len(z6.split("\n")[-1]) > self.line_width_limit:
                         z6 = z6.rstrip()
                         z6 += "\n   "
-            of_max_value += flight_max_value
 
-        self.epsilon = 2 * of_max_value
+        if not self.fixed_weights:
+            self.epsilon = self.epsilon_weight()
         return z6
 
     def of_airline_preference(self):
         print(" - Objective function: Maximization of airline preference.")
         z7 = "\\ Maximization of airline preference.\n   "
 
-        max_value = 0
-
         for i, k, flight in self.departing_flights():
-            for l in range(self.airport.n_gates):
+            for l in self.gates:
                 # Check if the bay gate combination is feasible
                 if self.is_feasible(i, l):
                     preference = self.preference(i, l)
@@ -238,8 +351,6 @@ class GateAssignment:
                         continue
                     constant = self.epsilon * preference
 
-                    max_value += constant
-
                     z7 += " +{:<17.4f} {:15s}".format(constant, self.x(i, l))
 
                     # Add new line if necessary
@@ -247,14 +358,15 @@ class GateAssignment:
                         z7 = z7.rstrip()
                         z7 += "\n   "
 
-        self.eta = max_value if max_value >= self.epsilon else self.epsilon
+        if not self.fixed_weights:
+            self.eta = self.eta_weight(self.epsilon)
         return z7
 
     def of_penalty_variables(self):
         print(" - Objective function: Penalty variables.")
         z8 = "\\ Penalty variables.\n   "
 
-        for m in self.m_list:
+        for m in self.m_list + self.o_list:
             z8 += " -{:<20.4f}{:15s}".format(self.eta, m)
             # Add new line if necessary
             if len(z8.split("\n")[-1]) > self.line_width_limit:
@@ -291,7 +403,7 @@ class GateAssignment:
             c += "sg_{}:\n       ".format(i)
 
             # Loop through each bay and check whether it's compliant with the aircraft used in the flight.
-            for l in range(self.airport.n_gates):
+            for l in self.gates:
                 # Check whether the bay gate combination is feasible.
                 if self.is_feasible(i, l):
 
@@ -323,13 +435,45 @@ class GateAssignment:
                     # Check whether there is a time conflict.
                     if self.flights.time_conflict(i, j):
                         # Loop through each gate and check whether the bay gate combinations are feasible.
-                        for l in range(self.airport.n_gates):
-                            if (self.is_feasible(i, l)) and \
+                        for l in self.gates:
+                            if (self.capacity[l] == 1) and \
+                               (self.is_feasible(i, l)) and \
                                (self.is_feasible(j, l)):
                                 c += "   tc_{}_{}_{}: {} + {} - {} <= 1\n".format(i, j, l,
                                                                                   self.x(i, l),
                                                                                   self.x(j, l),
                                                                                   self.m(i, j, l))
+
+        for l in self.gates:
+            if self.capacity[l] > 1:
+                c += self.constraint_capacity(l)
+        return c
+
+    def constraint_capacity(self, l):
+        """
+        These soft constraints limit the number of flights assigned to a pool of identical gates
+        at the same moment to the number of gates in the pool. A constraint is created for each
+        maximal set of feasible flights overlapping in time that's larger than the pool. The
+        flights exceeding the capacity are penalized just like the flights sharing a single gate.
+
+        :param int l: Index of the representative gate of the pool.
+        :return: lp code for the capacity constraints of the pool.
+        :rtype: string
+        """
+        flight_idx = [i for i, k, flight in self.departing_flights() if self.is_feasible(i, l)]
+        windows = [self.flights.buffered_window(i) for i in flight_idx]
+
+        c = ""
+        for first, clique in maximal_cliques([eta for eta, _ in windows], [etd for _, etd in windows]):
+            if len(clique) > self.capacity[l]:
+                c += "   cc_{}_{}:\n       ".format(l, flight_idx[first])
+                for n in clique:
+                    c += " + {:10s}".format(self.x(flight_idx[n], l))
+
+                    # Add new line if necessary
+                    if len(c.split("\n")[-1]) > self.line_width_limit:
+                        c += "\n       "
+                c += " - {} <= {}\n".format(self.o(l, flight_idx[first]), self.capacity[l])
         return c
 
     # These constraints where removed from the LP file since they are not neccesary anymore.
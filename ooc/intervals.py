@@ -0,0 +1,143 @@
+"""
+Functions in here work on sets of time intervals, eg. the (buffered) eta and etd of flights.
+"""
+
+import heapq
+
+
+def interval_lanes(starts, ends):
+    """
+    Assigns each interval to a lane, such that the intervals in a lane never overlap. This
+    is done with a heap based interval colouring, so the minimum number of lanes is used.
+    Intervals are closed, so two intervals where one ends at the exact moment the other
+    one starts are overlapping, just like in :meth:`ooc.Flights.time_conflict`.
+
+    :param list starts: Start of each interval.
+    :param list ends: End of each interval.
+    :return: List with the lane index of each interval.
+    :rtype: list
+    """
+    lanes = [None] * len(starts)
+
+    # Heap holding the (end, lane) of the intervals currently occupying a lane and
+    # a heap with the lanes that have been freed up again. The lowest free lane is
+    # always reused first.
+    occupied = []
+    free = []
+    n_lanes = 0
+
+    for i in sorted(range(len(starts)), key=starts.__getitem__):
+        # Free up all lanes of intervals that ended before this one starts.
+        while occupied and occupied[0][0] < starts[i]:
+            heapq.heappush(free, heapq.heappop(occupied)[1])
+
+        if free:
+            lane = heapq.heappop(free)
+        else:
+            lane = n_lanes
+            n_lanes += 1
+
+        lanes[i] = lane
+        heapq.heappush(occupied, (ends[i], lane))
+
+    return lanes
+
+
+def overlapping_pairs(starts, ends):
+    """
+    Finds all pairs of overlapping intervals with a sweep line. Only the intervals that are
+    still active when an interval starts are checked, so this is much faster than checking
+    all pairs when few intervals overlap. Intervals are closed, just like in :func:`interval_lanes`.
+
+    :param list starts: Start of each interval.
+    :param list ends: End of each interval.
+    :return: Generator yielding the ``(i, j)`` index pairs of overlapping intervals with ``i < j``.
+    """
+    # Heap holding the (end, index) of the intervals that haven't ended yet.
+    active = []
+
+    for i in sorted(range(len(starts)), key=starts.__getitem__):
+        # Remove the intervals that ended before this one starts.
+        while active and active[0][0] < starts[i]:
+            heapq.heappop(active)
+
+        for _, j in active:
+            yield (i, j) if i < j else (j, i)
+
+        heapq.heappush(active, (ends[i], i))
+
+
+def maximal_cliques(starts, ends):
+    """
+    Finds the maximal sets of intervals overlapping at the same moment with a sweep line. Since
+    intervals form an interval graph, these are the maximal cliques of the time conflicts, so at
+    most ``n`` intervals overlap at any moment if none of these sets holds more than ``n`` intervals.
+    Intervals are closed, just like in :func:`interval_lanes`.
+
+    :param list starts: Start of each interval.
+    :param list ends: End of each interval.
+    :return: Generator yielding tuples with the index of the interval starting the clique and the
+       sorted list with the indices of the intervals in it.
+    """
+    # Starts are sorted before ends at the same moment, since closed intervals touching each other overlap.
+    events = sorted([(start, 0, i) for i, start in enumerate(starts)] +
+                    [(end, 1, i) for i, end in enumerate(ends)])
+    active = set()
+    for n, (_, is_end, i) in enumerate(events):
+        if is_end:
+            active.discard(i)
+        else:
+            active.add(i)
+            # The set is only maximal if the next event ends one of the intervals.
+            if n + 1 == len(events) or events[n + 1][1]:
+                yield i, sorted(active)
+
+
+def assign_lanes(starts, ends, n_lanes, follows=None):
+    """
+    Assigns each interval to one of a fixed number of lanes, such that the intervals in a lane
+    never overlap if at most ``n_lanes`` intervals overlap at any moment. The intervals are
+    assigned in order of their start, which for an interval graph never needs more lanes than
+    the largest clique, so any free lane can be picked. If no lane is free, the interval is put
+    in the lane that was freed up first. Intervals are closed, just like in :func:`interval_lanes`.
+
+    :param list starts: Start of each interval.
+    :param list ends: End of each interval.
+    :param int n_lanes: Number of lanes.
+    :param list follows: Optional list with the index of the interval each interval follows up on,
+       or ``None``. An interval is put in the same lane as the one it follows up on if that lane
+       is free, eg. to keep the parts of a long stay flight on the same bay. Other intervals
+       starting in the gap before a follow up interval avoid the lane held for it.
+    :return: List with the lane index of each interval.
+    :rtype: list
+    """
+    lanes = [None] * len(starts)
+    lane_ends = [None] * n_lanes
+
+    followers = {}
+    if follows is not None:
+        for i, j in enumerate(follows):
+            if j is not None:
+                followers[j] = i
+    held = {}  # Lane held for each follow up interval that hasn't been assigned yet.
+
+    for i in sorted(range(len(starts)), key=starts.__getitem__):
+        free = [lane for lane in range(n_lanes) if lane_ends[lane] is None or lane_ends[lane] < starts[i]]
+        j = None if follows is None else follows[i]
+        held.pop(i, None)
+        if j is not None and lanes[j] in free:
+            lane = lanes[j]
+        elif free:
+            # Only take a held lane if this interval ends before the follow up interval starts.
+            available = [lane for lane in free
+                         if all(ends[i] < starts[k] for k, held_lane in held.items() if held_lane == lane)]
+            lane = (available or free)[0]
+        else:
+            lane = min(range(n_lanes), key=lane_ends.__getitem__)
+
+        lanes[i] = lane
+        lane_ends[lane] = ends[i] if lane_ends[lane] is None else max(lane_ends[lane], ends[i])
+        if i in followers:
+            held[followers[i]] = lane
+
+    return lanes
@@ -2,44 +2,144 @@ class KeyPairDictionary(dict):
     """
     Dictionary that uses a tuple with two elements as it's key. The order
     of the pair is ignored.
+
+    Internally the pairs are stored with a canonical ``(min, max)`` key and a
+    neighbour index is kept per element. This makes membership checks O(1) and
+    :meth:`pairs` O(degree) instead of scanning all keys. The elements of the
+    pairs must therefore be orderable, eg. flight or bay indices.
     """
 
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        super().__init__()
+        self._neighbours = {}
+        """
+        Dictionary holding the neighbours of each element. The neighbours are stored as
+        the keys of a dictionary, so they are yielded in insertion order.
+        """
+        self.update(*args, **kwargs)
+
+    @classmethod
+    def from_arrays(cls, i, j, values=None):
+        """
+        Creates a dictionary from two arrays with the elements of each pair.
+
+        :param i: Array like with the first elements of the pairs, eg. a numpy array.
+        :param j: Array like with the second elements of the pairs.
+        :param values: Array like with the value of each pair. Defaults to ``None`` for all pairs.
+        :return: New dictionary.
+        :rtype: KeyPairDictionary
+        """
+        # Convert numpy arrays to lists so the keys are python integers.
+        i = i.tolist() if hasattr(i, "tolist") else list(i)
+        j = j.tolist() if hasattr(j, "tolist") else list(j)
+        if len(i) != len(j):
+            raise Exception("The pair arrays have different lengths.")
+
+        if values is None:
+            values = [None] * len(i)
+        else:
+            values = values.tolist() if hasattr(values, "tolist") else list(values)
+
+        d = cls()
+        for a, b, value in zip(i, j, values):
+            d[a, b] = value
+        return d
+
+    @staticmethod
+    def canonical(key):
+        """
+        :param tuple key: Pair in any order.
+        :return: Pair as a ``(min, max)`` tuple.
+        """
+        a, b = key
+        return (a, b) if a <= b else (b, a)
 
     def __getitem__(self, item):
-        if item in self.keys():
-            return super().__getitem__(item)
-        elif (item[1], item[0]) in self.keys():
-            return super().__getitem__((item[1], item[0]))
-        raise KeyError()
+        return super().__getitem__(self.canonical(item))
 
     def __setitem__(self, key, value):
-        if (key[1], key[0]) in self.keys():
-            return super().__setitem__((key[1], key[0]), value)
-        else:
-            return super().__setitem__(key, value)
+        key = self.canonical(key)
+        if not super().__contains__(key):
+            a, b = key
+            self._neighbours.setdefault(a, {})[b] = None
+            self._neighbours.setdefault(b, {})[a] = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        key = self.canonical(key)
+        super().__delitem__(key)
+        self._remove_neighbours(key)
+
+    def _remove_neighbours(self, key):
+        a, b = key
+        for x, y in ((a, b), (b, a)):
+            neighbours = self._neighbours.get(x)
+            if neighbours is not None:
+                neighbours.pop(y, None)
+                if not neighbours:
+                    del self._neighbours[x]
 
     def __contains__(self, item):
-        if item in self.keys():
-            return True
-        elif (item[1], item[0]) in self.keys():
-            return True
-        return False
+        return super().__contains__(self.canonical(item))
+
+    def __reduce__(self):
+        # The neighbour index is rebuilt from the items when unpickling.
+        return self.__class__, (dict(self),)
+
+    def get(self, key, default=None):
+        return super().get(self.canonical(key), default)
+
+    def pop(self, key, *args):
+        key = self.canonical(key)
+        if super().__contains__(key):
+            value = super().__getitem__(key)
+            del self[key]
+            return value
+        if args:
+            return args[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._remove_neighbours(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        key = self.canonical(key)
+        if not super().__contains__(key):
+            self[key] = default
+        return super().__getitem__(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self._neighbours.clear()
+
+    def copy(self):
+        return self.__class__(self)
 
     def pairs(self, i):
         """
         Yield all pairs of i
 
-        :param i:
-        :return:
+        :param i: Element
+        :return: Generator yielding the elements paired with i.
         """
-        for key in self.keys():
-            if i in key:
-                yield key[not key.index(i)]
+        yield from self._neighbours.get(i, ())
 
     def contains(self, i):
-        for key in self.keys():
-            if i in key:
-                return True
-        return False
+        """
+        :param i: Element
+        :return: True if i is part of any pair.
+        """
+        return i in self._neighbours
+
+    def degree(self, i):
+        """
+        :param i: Element
+        :return: Number of pairs i is part of.
+        """
+        return len(self._neighbours.get(i, ()))
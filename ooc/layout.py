@@ -0,0 +1,167 @@
+"""
+The class in here computes the distances between the bays, gates and terminals of an airport
+from a graph of it's layout and writes the 'bay_gate_distance.csv' and 'bay_terminal_distance.csv'
+tables loaded by :class:`ooc.Airport`. The shortest paths from all bays are computed at once
+with scipy's sparse graph routines, so it scales to airports with hundreds of stands.
+"""
+
+from collections import OrderedDict
+
+
+class Layout:
+    """
+    Graph of the layout of an airport. The nodes are points on the apron and in the terminals,
+    eg. bays, gates, terminal entrances and junctions. The edges are the paths between them.
+    Paths can be walked in both directions.
+    """
+
+    def __init__(self):
+        self.nodes = OrderedDict()  #: Dictionary with the index of each node.
+        self.edges = {}  #: Dictionary with the length of the edge between each (node index, node index) pair.
+        self.bays = OrderedDict()  #: Dictionary with the node index of each bay.
+        self.gates = OrderedDict()  #: Dictionary with the node index of each gate.
+        self.inactive_gates = set()  #: Names of the gates that can't be used.
+        self.terminals = OrderedDict()  #: Dictionary with the node index of each terminal.
+
+    def node(self, name):
+        """
+        :param string name: Node name.
+        :return: Index of the node. The node is created if it doesn't exist yet.
+        :rtype: int
+        """
+        if name not in self.nodes:
+            self.nodes[name] = len(self.nodes)
+        return self.nodes[name]
+
+    def add_edge(self, node_1, node_2, length):
+        """
+        Adds a path between two nodes. If there already is a path between the nodes, the
+        shortest one is kept.
+
+        :param string node_1: Name of the first node.
+        :param string node_2: Name of the second node.
+        :param float length: Length of the path.
+        """
+        if length < 0:
+            raise Exception("The path between '{}' and '{}' has a negative length.".format(node_1, node_2))
+        key = tuple(sorted((self.node(node_1), self.node(node_2))))
+        self.edges[key] = min(length, self.edges.get(key, length))
+
+    def add_bay(self, name, node=None):
+        """
+        :param string name: Bay name.
+        :param string node: Name of the node the bay is at. Defaults to the bay name.
+        """
+        self.bays[name] = self.node(name if node is None else node)
+
+    def add_gate(self, name, node=None, active=True):
+        """
+        :param string name: Gate name.
+        :param string node: Name of the node the gate is at. Defaults to the gate name.
+        :param bool active: False if the gate can't be used. Inactive gates are marked with an
+           'x' in the bay gate distance table.
+        """
+        self.gates[name] = self.node(name if node is None else node)
+        if not active:
+            self.inactive_gates.add(name)
+
+    def add_terminal(self, name, node=None):
+        """
+        :param string name: Terminal name.
+        :param string node: Name of the node the terminal is at. Defaults to the terminal name.
+        """
+        self.terminals[name] = self.node(name if node is None else node)
+
+    def distances(self, sources, targets):
+        """
+        Computes the shortest path distances between nodes.
+
+        :param list sources: Source node indices.
+        :param list targets: Target node indices.
+        :return: Array with the distance from each source (rows) to each target (columns).
+           Unreachable targets have an infinite distance.
+        :rtype: numpy.ndarray
+        """
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import dijkstra
+
+        n = len(self.nodes)
+        rows = [a for a, _ in self.edges]
+        cols = [b for _, b in self.edges]
+        # Zero length edges are kept as explicit entries, so they are still seen as edges.
+        graph = csr_matrix((list(self.edges.values()), (rows, cols)), shape=(n, n))
+
+        # Only run dijkstra once for each unique source node.
+        unique_sources, inverse = np.unique(np.asarray(sources, dtype=int), return_inverse=True)
+        distances = dijkstra(graph, directed=False, indices=unique_sources)
+        return distances[inverse][:, np.asarray(targets, dtype=int)]
+
+    def bay_gate_distances(self):
+        """
+        :return: Array with the distance between each bay (rows) and gate (columns).
+        :rtype: numpy.ndarray
+        """
+        return self.distances(list(self.bays.values()), list(self.gates.values()))
+
+    def bay_terminal_distances(self):
+        """
+        :return: Array with the distance between each bay (rows) and terminal (columns).
+        :rtype: numpy.ndarray
+        """
+        return self.distances(list(self.bays.values()), list(self.terminals.values()))
+
+    def bay_gate_distance_table(self):
+        """
+        :return: String with the bay gate distance table in the format of 'bay_gate_distance.csv'.
+           Inactive gates and gates that can't be reached from a bay are marked with an 'x'.
+        """
+        distances = self.bay_gate_distances()
+        lines = ["{:4}, ".format("bay") + ", ".join("{:>4}".format(name) for name in self.gates)]
+        for bay_name, row in zip(self.bays, distances):
+            lines.append("{:4}, ".format(bay_name) + ", ".join(
+                "{:>4}".format("x" if gate_name in self.inactive_gates else format_distance(distance))
+                for gate_name, distance in zip(self.gates, row)))
+        return "\n".join(lines) + "\n"
+
+    def bay_terminal_distance_table(self):
+        """
+        :return: String with the bay terminal distance table in the format of 'bay_terminal_distance.csv'.
+        """
+        distances = self.bay_terminal_distances()
+        lines = ["{:4}, ".format("bay") + ", ".join("{:3}".format(name) for name in self.terminals).rstrip()]
+        for bay_name, row in zip(self.bays, distances):
+            for terminal_name, distance in zip(self.terminals, row):
+                if distance == float("inf"):
+                    raise Exception("Terminal '{}' can't be reached from bay '{}'.".format(terminal_name, bay_name))
+            lines.append("{:4}, ".format(bay_name) +
+                         ", ".join("{:3}".format(format_distance(distance)) for distance in row).rstrip())
+        return "\n".join(lines) + "\n"
+
+    def write_bay_gate_distance(self, path):
+        """
+        :param string path: Path to the 'bay_gate_distance.csv' file.
+        """
+        with open(path, "w") as f:
+            f.write(self.bay_gate_distance_table())
+
+    def write_bay_terminal_distance(self, path):
+        """
+        :param string path: Path to the 'bay_terminal_distance.csv' file.
+        """
+        with open(path, "w") as f:
+            f.write(self.bay_terminal_distance_table())
+
+
+def format_distance(distance):
+    """
+    :param float distance: Distance.
+    :return: The distance as a string. Whole distances are written without decimals and
+       infinite distances as 'x'.
+    :rtype: string
+    """
+    if distance == float("inf"):
+        return "x"
+    if float(distance).is_integer():
+        return "{:.0f}".format(distance)
+    return "{:.1f}".format(distance)
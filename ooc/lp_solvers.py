@@ -0,0 +1,368 @@
+"""
+The classes in here solve the generated lp files and write the solution to a cplex solution
+(xml) file, which is loaded in by :class:`ooc.BayGateSolver`. Besides the cplex interactive
+solver, the lp files can be solved with scipy's milp solver (HiGHS), which is useful when
+cplex is not available.
+"""
+
+import re
+import subprocess
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+from ooc.compression import open_file
+
+
+LpModelType = namedtuple("LpModelType", ("sense",
+                                         "variables",
+                                         "objective",
+                                         "rows",
+                                         "row_names",
+                                         "row_lower",
+                                         "row_upper",
+                                         "binary"))
+"""
+Named tuple holding an lp model in sparse form. ``objective`` is a dictionary with the
+coefficient per variable index and ``rows`` a list with a ``{variable index: coefficient}``
+dictionary per constraint.
+"""
+
+token_pattern = re.compile(r"(?P<name>[A-Za-z_]\w*):"
+                           r"|(?P<comparator><=|>=|=<|=>|=|<|>)"
+                           r"|(?P<sign>[+-])"
+                           r"|(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+                           r"|(?P<variable>[A-Za-z_]\w*)")
+"""
+Regular expression matching the tokens in the objective function and constraint sections of an lp file.
+"""
+
+
+class InfeasibleError(Exception):
+    """
+    Raised by a solver when an lp file has no feasible solution, as opposed to the solver failing
+    or stopping before it found one.
+
+    :param string message: Error message.
+    :param string lp_path: Path to the infeasible lp file.
+    """
+
+    def __init__(self, message, lp_path=None):
+        super().__init__(message)
+        self.lp_path = lp_path
+
+    def __reduce__(self):
+        # Keep the lp path when the exception is sent back from a worker process.
+        return type(self), (self.args[0], self.lp_path)
+
+
+def read_lp(code):
+    """
+    Parses the lp code generated by :class:`ooc.BayAssignment` and :class:`ooc.GateAssignment`.
+    Only the subset of the cplex lp format used by these classes is supported, ie. an
+    objective function, linear constraints with a constant right hand side and a binary
+    section. All other variables are continuous with a lower bound of zero.
+
+    :param string code: Lp code.
+    :return: Lp model
+    :rtype: LpModelType
+    """
+    # Remove the comments and split the code in it's sections.
+    code = re.sub(r"\\.*", "", code)
+    sections = re.split(r"^\s*(minimize|maximize|subject to|binary|binaries|end)\s*$", code,
+                        flags=re.IGNORECASE | re.MULTILINE)
+
+    sense = None
+    variables = {}
+    objective = {}
+    rows = []
+    row_names = []
+    row_lower = []
+    row_upper = []
+    binary = set()
+
+    def variable_index(name):
+        if name not in variables:
+            variables[name] = len(variables)
+        return variables[name]
+
+    for keyword, content in zip(sections[1::2], sections[2::2]):
+        keyword = keyword.lower()
+        if keyword in ["minimize", "maximize"]:
+            sense = 1 if keyword == "minimize" else -1
+            for index, coefficient in parse_terms(token_pattern.finditer(content), variable_index):
+                objective[index] = objective.get(index, 0) + coefficient
+
+        elif keyword == "subject to":
+            tokens = token_pattern.finditer(content)
+            for match in tokens:
+                if match.lastgroup != "name":
+                    raise Exception("Expected the name of a constraint, found '{}'.".format(match.group()))
+                row = {}
+                comparator = None
+                for index, coefficient in parse_terms(tokens, variable_index):
+                    if isinstance(index, str):
+                        comparator = index
+                        break
+                    row[index] = row.get(index, 0) + coefficient
+                if comparator is None:
+                    raise Exception("Constraint '{}' has no right hand side.".format(match.group("name")))
+
+                rhs = parse_number(tokens)
+                rows.append(row)
+                row_names.append(match.group("name"))
+                row_lower.append(-float("inf") if comparator in ["<=", "=<", "<"] else rhs)
+                row_upper.append(float("inf") if comparator in [">=", "=>", ">"] else rhs)
+
+        elif keyword in ["binary", "binaries"]:
+            for match in token_pattern.finditer(content):
+                binary.add(variable_index(match.group()))
+
+    if sense is None:
+        raise Exception("The lp code has no objective function.")
+
+    return LpModelType(sense=sense,
+                       variables=list(variables),
+                       objective=objective,
+                       rows=rows,
+                       row_names=row_names,
+                       row_lower=row_lower,
+                       row_upper=row_upper,
+                       binary=binary)
+
+
+def parse_terms(tokens, variable_index):
+    """
+    Parses the linear terms of an expression until the end of the tokens or a comparator.
+
+    :param tokens: Iterator yielding the token matches.
+    :param variable_index: Function returning the index of a variable name.
+    :return: Generator yielding the (variable index, coefficient) of each term. If a comparator
+       is reached the comparator string is yielded as the index.
+    """
+    sign = 1
+    coefficient = None
+    for match in tokens:
+        kind = match.lastgroup
+        if kind == "sign":
+            if match.group() == "-":
+                sign = -sign
+        elif kind == "number":
+            coefficient = float(match.group())
+        elif kind == "variable":
+            yield variable_index(match.group()), sign * (1 if coefficient is None else coefficient)
+            sign = 1
+            coefficient = None
+        elif kind == "comparator":
+            yield match.group(), None
+            return
+        else:
+            raise Exception("Unexpected '{}' in the lp code.".format(match.group()))
+
+
+def parse_number(tokens):
+    """
+    :param tokens: Iterator yielding the token matches.
+    :return: The next (signed) number.
+    :rtype: float
+    """
+    sign = 1
+    for match in tokens:
+        if match.lastgroup == "sign":
+            sign = -sign if match.group() == "-" else sign
+        elif match.lastgroup == "number":
+            return sign * float(match.group())
+        else:
+            break
+    raise Exception("Expected a number in the lp code.")
+
+
+def lp_arrays(model, rows=None):
+    """
+    Converts an lp model to the arrays used by :func:`scipy.optimize.milp`.
+
+    :param LpModelType model: Lp model.
+    :param list rows: Optional list with the indices of the constraints to include. Defaults to all.
+    :return: Tuple with the objective coefficients, the sparse constraint matrix, the lower and
+       upper bounds of the constraints, the integrality and the upper bounds of the variables.
+    """
+    import numpy as np
+    from scipy.sparse import coo_matrix
+
+    if rows is None:
+        rows = range(len(model.rows))
+
+    n = len(model.variables)
+    c = np.zeros(n)
+    for index, coefficient in model.objective.items():
+        c[index] = model.sense * coefficient
+
+    row_idx = []
+    col_idx = []
+    data = []
+    for r, row in enumerate(model.rows[row] for row in rows):
+        row_idx.extend([r] * len(row))
+        col_idx.extend(row.keys())
+        data.extend(row.values())
+    a = coo_matrix((data, (row_idx, col_idx)), shape=(len(rows), n)).tocsr()
+
+    integrality = np.zeros(n)
+    upper = np.full(n, np.inf)
+    binary = list(model.binary)
+    integrality[binary] = 1
+    upper[binary] = 1
+
+    return (c, a, [model.row_lower[row] for row in rows], [model.row_upper[row] for row in rows],
+            integrality, upper)
+
+
+def write_solution(path, values, objective_value=0):
+    """
+    Writes a minimal cplex solution (xml) file. Only the header with the objective value and
+    the variables are written, which is all that's needed to load in the solution.
+
+    :param string path: Path to the .sol file.
+    :param values: Iterable yielding (variable name, value) pairs.
+    :param float objective_value: Objective value to write to the header.
+    """
+    with open(path, "w") as f:
+        f.write('<?xml version = "1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<CPLEXSolution version="1.2">\n'
+                ' <header\n'
+                '   objectiveValue="{}"/>\n'
+                ' <variables>\n'.format(objective_value))
+        for index, (name, value) in enumerate(values):
+            f.write('  <variable name="{}" index="{}" value="{}"/>\n'.format(name, index, value))
+        f.write(' </variables>\n'
+                '</CPLEXSolution>\n')
+
+
+@lru_cache(maxsize=None)
+def cplex_available(command="cplex"):
+    """
+    Checks whether the cplex interactive solver can be started. The result is cached, so cplex
+    is only started once per process for each command.
+
+    :param string command: Terminal command to access the cplex interactive solver.
+    :return: True if cplex is available.
+    :rtype: bool
+    """
+    try:
+        # For some reason the 'subprocess.run' function does not work like described in the documentation in
+        # linux. So after some trail and error I got it working by giving it a list with
+        if sys.platform == "linux":
+            args = [command + " -c help"]
+        else:  # This works on Windows. Probably also MAC since this is the behaviour described in the documentation
+            args = [command, "-c", "help"]
+        result = subprocess.run(args,
+                                shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return not len(result.stderr)
+    except OSError:
+        return False
+
+
+class CplexSolver:
+    """
+    Solves lp files with the cplex interactive solver.
+
+    :param string command: Terminal command to access the cplex interactive solver.
+    """
+
+    def __init__(self, command="cplex"):
+        self.command = command
+
+    def solve(self, lp_path, sol_path):
+        """
+        Solves an lp file and writes the solution to a cplex solution file.
+
+        :param string lp_path: Path to the lp file.
+        :param string sol_path: Path to the solution file.
+        """
+        # For some reason the 'subprocess.run' function does not work like described in the documentation in
+        # linux. So after some trail and error I got it working by giving it a list with
+        if sys.platform == "linux":
+            args = [self.command + " -c 'read {}' optimize 'write {}'".format(lp_path, sol_path)]
+        else:  # This works on Windows. Probably also MAC since this is the behaviour described in the documentation
+            args = [
+                self.command,
+                "-c",
+                "read {}".format(lp_path),
+                "optimize",
+                "write {}".format(sol_path)]
+        subprocess.run(args, shell=True)
+
+
+class ScipySolver:
+    """
+    Solves lp files with :func:`scipy.optimize.milp`.
+
+    :param float time_limit: Optional time limit in seconds.
+    :param float mip_rel_gap: Optional relative optimality gap at which the solver stops.
+    """
+
+    def __init__(self, time_limit=None, mip_rel_gap=None):
+        self.time_limit = time_limit
+        self.mip_rel_gap = mip_rel_gap
+
+    def solve(self, lp_path, sol_path):
+        """
+        Solves an lp file and writes the solution to a cplex solution file.
+
+        :param string lp_path: Path to the lp file. It may be gzip compressed ('.lp.gz').
+        :param string sol_path: Path to the solution file.
+        """
+        import numpy as np
+        from scipy.optimize import milp, LinearConstraint, Bounds
+
+        with open_file(lp_path) as f:
+            model = read_lp(f.read())
+
+        n = len(model.variables)
+        c, a, row_lower, row_upper, integrality, upper = lp_arrays(model)
+        binary = list(model.binary)
+
+        options = {}
+        if self.time_limit is not None:
+            options["time_limit"] = self.time_limit
+        if self.mip_rel_gap is not None:
+            options["mip_rel_gap"] = self.mip_rel_gap
+
+        result = milp(c,
+                      constraints=LinearConstraint(a, row_lower, row_upper) if len(model.rows) else (),
+                      integrality=integrality,
+                      bounds=Bounds(np.zeros(n), upper),
+                      options=options)
+        if result.status == 2:
+            raise InfeasibleError("The model in '{}' is infeasible.".format(lp_path), lp_path)
+        if result.x is None:
+            raise Exception("No solution was found for '{}': {}".format(lp_path, result.message))
+
+        x = result.x
+        x[binary] = np.round(x[binary])
+        write_solution(sol_path,
+                       zip(model.variables, x.tolist()),
+                       objective_value=model.sense * result.fun)
+
+
+def solve_all(solver, lp_paths, sol_paths, processes=None):
+    """
+    Solves multiple lp files in parallel using a process pool.
+
+    :param solver: Solver object, eg. :class:`CplexSolver` or :class:`ScipySolver`.
+    :param list lp_paths: Paths to the lp files.
+    :param list sol_paths: Paths to the solution files.
+    :param int processes: Maximum number of worker processes. Defaults to the number of processors.
+    """
+    if hasattr(solver, "solve_all"):
+        # The solver manages it's own workers, eg. :class:`ooc.cplex_session.CplexSessionPool`.
+        solver.solve_all(lp_paths, sol_paths, processes)
+    elif processes == 1 or len(lp_paths) == 1:
+        for lp_path, sol_path in zip(lp_paths, sol_paths):
+            solver.solve(lp_path, sol_path)
+    else:
+        # Imported here, since importing multiprocessing takes about as long as importing the rest of the package.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            # Consume the results, so exceptions raised by the workers are raised here.
+            list(pool.map(solver.solve, lp_paths, sol_paths))
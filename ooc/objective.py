@@ -0,0 +1,205 @@
+"""
+The functions in here evaluate the objective functions of the bay and gate assignment for any
+assignment, eg. a manual plan, a heuristic plan or a solver plan, without generating or solving
+the lp code. The terms and weights are the same as the ones in :class:`ooc.BayAssignment` and
+:class:`ooc.GateAssignment`. The penalty variables get the smallest value allowed by their
+constraints, which is the value the solver would pick for the same assignment.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from ooc import ft, GateAssignment
+from ooc.decomposition import time_conflicting_pairs
+
+
+BayObjectiveType = namedtuple("BayObjectiveType", ("passenger_distance",
+                                                   "preference",
+                                                   "towing_penalties",
+                                                   "adjacency_penalties",
+                                                   "total",
+                                                   "towings",
+                                                   "adjacency_conflicts"))
+"""
+Named tuple holding the terms of the bay assignment objective function (minimized), their
+total and the number of towings and adjacency conflicts.
+"""
+
+GateObjectiveType = namedtuple("GateObjectiveType", ("bay_gate_distance",
+                                                     "preference",
+                                                     "conflict_penalties",
+                                                     "total",
+                                                     "gate_conflicts"))
+"""
+Named tuple holding the terms of the gate assignment objective function (maximized), their
+total and the number of gate conflicts.
+"""
+
+
+def passengers(flights):
+    """
+    :param ooc.Flights flights: Flights object.
+    :return: Array with the number of passengers of each flight.
+    :rtype: numpy.ndarray
+    """
+    return np.array([flights.n_passengers(i) for i in range(flights.n_flights)], dtype=float)
+
+
+def terminal_distances(flights, alpha=1):
+    """
+    :param ooc.Flights flights: Flights object.
+    :param float alpha: Weight of the passenger transport distance.
+    :return: Array with the weighted distance between the terminal of each flight (rows) and each bay (columns).
+    :rtype: numpy.ndarray
+    """
+    airport = flights.airport
+    distances = np.array([[airport.terminal_bay_distance(terminal, k) for k in range(airport.n_bays)]
+                          for terminal in airport.terminal_names], dtype=float)
+    terminals = [airport.terminal_names.index(flights.terminal(i)) for i in range(flights.n_flights)]
+    return distances[terminals] * alpha
+
+
+def bay_objective(flights, bays, alpha=1, beta=None, gamma=None):
+    """
+    Evaluates the bay assignment objective function, see :class:`ooc.BayAssignment`.
+
+    :param ooc.Flights flights: Flights object.
+    :param bays: Sequence with the bay index of each flight.
+    :param float alpha: Weight of the passenger transport distance.
+    :param float beta: Weight of the airline preference. Defaults to :meth:`ooc.Flights.beta`.
+    :param float gamma: Weight of the towing penalties. Defaults to :meth:`ooc.Flights.gamma`.
+    :return: Objective function terms.
+    :rtype: BayObjectiveType
+    """
+    airport = flights.airport
+    beta = flights.beta() if beta is None else beta
+    gamma = flights.gamma() if gamma is None else gamma
+    bays = np.asarray(bays, dtype=int)
+    n = flights.n_flights
+    schedule = flights.flight_schedule
+
+    distances = terminal_distances(flights, alpha)
+    n_passengers = passengers(flights)
+    passenger_distance = float((n_passengers * distances[np.arange(n), bays]).sum())
+
+    # Only full and departing flights get a bonus for being at a preferred bay.
+    preferred = sum(1 for i, flight in enumerate(schedule)
+                    if flight.preference is not None and flight.flight_type in [ft.Full, ft.Dep] and
+                    bays[i] in flight.preference.bays)
+    preference = -beta * preferred
+
+    # Towings of long stay flights. Each towing sets two of the penalty values of the splitted
+    # flight constraints to one, except for the towing from the current bay of overnight flights.
+    towings = 0
+    n_penalties = 0
+    for group in flights.groups:
+        if len(group.flight_idx) == 1:
+            continue
+        arrival, park, departure = group.flight_idx
+        park_towed = int(bays[park] != bays[departure])
+        if group.overnight:
+            arrival_towed = int(bays[park] != schedule[arrival].current.bay)
+            n_penalties += arrival_towed + 2 * park_towed
+        else:
+            arrival_towed = int(bays[arrival] != bays[park])
+            n_penalties += 2 * arrival_towed + 2 * park_towed
+        towings += arrival_towed + park_towed
+    towing_penalties = gamma * n_penalties
+
+    # Adjacency penalties. Like the adjacency constraints, this doesn't check for time conflicts.
+    # A penalty variable is shared by all adjacent bay pairs with the same first bay.
+    departing_per_bay = {}
+    for i in range(n):
+        if flights.departing(i):
+            departing_per_bay.setdefault(int(bays[i]), []).append(i)
+
+    s_variables = set()
+    for bay_pair in airport.adjacency:
+        for bay_1, bay_2 in [bay_pair, bay_pair[::-1]]:
+            for i in departing_per_bay.get(bay_1, []):
+                for j in departing_per_bay.get(bay_2, []):
+                    if i < j:
+                        s_variables.add((i, j, bay_1))
+
+    # The penalty is the smallest cost of putting one of the flights on a remote bay. Just like
+    # in the lp code, the terminal of the first flight is used for both flights.
+    remote = list(airport.remote_bays)
+    adjacency_penalties = 0
+    for i, j, _ in s_variables:
+        min_distance = distances[i, remote].min() if remote else float("inf")
+        adjacency_penalties += float(min(n_passengers[i], n_passengers[j]) * min_distance)
+
+    return BayObjectiveType(passenger_distance=passenger_distance,
+                            preference=preference,
+                            towing_penalties=towing_penalties,
+                            adjacency_penalties=adjacency_penalties,
+                            total=passenger_distance + preference + towing_penalties + adjacency_penalties,
+                            towings=towings,
+                            adjacency_conflicts=len(s_variables))
+
+
+def gate_objective(flights, bays, gates, weights=None):
+    """
+    Evaluates the gate assignment objective function, see :class:`ooc.GateAssignment`.
+
+    :param ooc.Flights flights: Flights object.
+    :param bays: Sequence with the bay index of each flight.
+    :param gates: Sequence with the gate index of each flight, or None for flights without a gate.
+    :param tuple weights: Optional tuple with the ``(epsilon, eta)`` weights. Defaults to
+       :meth:`ooc.GateAssignment.weights`.
+    :return: Objective function terms.
+    :rtype: GateObjectiveType
+    """
+    airport = flights.airport
+    bays = [int(k) for k in bays]
+    gate_assignment = GateAssignment(flights, bays)
+    epsilon, eta = gate_assignment.weights() if weights is None else weights
+
+    departing = [i for i in range(flights.n_flights) if flights.departing(i)]
+    for i in departing:
+        if gates[i] is None:
+            raise Exception("Flight {} has no gate assigned to it.".format(i))
+
+    distances = np.array([airport.bay_gate_distance[bays[i]][gates[i]] for i in departing], dtype=float)
+    bay_gate_distance = -float((passengers(flights)[departing] * distances).sum()) * gate_assignment.delta
+
+    preference = 0
+    for i in departing:
+        value = gate_assignment.preference(i, gates[i])
+        if value is not None:
+            preference += epsilon * value
+
+    # A penalty for each pair of time conflicting flights at the same gate.
+    flights_per_gate = {}
+    for i in departing:
+        flights_per_gate.setdefault(gates[i], []).append(i)
+    gate_conflicts = sum(1 for flight_idx in flights_per_gate.values()
+                         for _ in time_conflicting_pairs(flights, flight_idx))
+    conflict_penalties = -eta * gate_conflicts
+
+    return GateObjectiveType(bay_gate_distance=bay_gate_distance,
+                             preference=preference,
+                             conflict_penalties=conflict_penalties,
+                             total=bay_gate_distance + preference + conflict_penalties,
+                             gate_conflicts=gate_conflicts)
+
+
+def evaluate(solutions):
+    """
+    Evaluates the bay and gate assignment objective functions of the loaded solutions.
+
+    :param list solutions: List of :class:`ooc.FlightSolution` objects, eg.
+       :attr:`ooc.BayGateSolver.solutions`.
+    :return: Tuple with the :class:`BayObjectiveType` and :class:`GateObjectiveType`. The
+       latter is ``None`` if no gate assignment has been loaded.
+    """
+    flights = solutions[0].flights
+    bays = [solution.bay_idx for solution in solutions]
+    if None in bays:
+        raise Exception("No bay assignment solutions has been loaded.")
+
+    gates = [solution.gate_idx for solution in solutions]
+    if all(gate is None for gate in gates):
+        return bay_objective(flights, bays), None
+    return bay_objective(flights, bays), gate_objective(flights, bays, gates)
@@ -0,0 +1,128 @@
+"""
+The functions in here check whether the bay assignment of a day can be feasible at all, before
+any lp code is generated. Only the flights, airport and a sweep line over the buffered flight
+times are used, so the checks take milliseconds instead of waiting for cplex to give up on an
+infeasible model. Passing the checks doesn't guarantee a feasible model, failing them does
+guarantee an infeasible one.
+"""
+
+from collections import namedtuple
+
+from ooc import ft
+from ooc.decomposition import compliant_bays
+from ooc.validation import fueling_bays
+
+
+IssueType = namedtuple("IssueType", ("check", "flights", "bays", "start", "end", "demand", "message"))
+"""
+Named tuple holding a single issue found by :func:`precheck`. ``check`` is the name of the
+failed check, ``flights`` a tuple with the indices of the flights involved and ``bays`` a tuple
+with the indices of the bays involved. ``start`` and ``end`` are the time window of a capacity
+issue and ``demand`` the largest number of flights at the same time in it, otherwise ``None``.
+"""
+
+checks = ["compliance",
+          "capacity",
+          "fueling",
+          "overnight"]
+"""
+Names of the checks done by :func:`precheck` in the order they are done.
+"""
+
+
+def overloaded_windows(starts, ends, capacity):
+    """
+    Finds the time windows in which more intervals overlap than the capacity with a sweep line.
+    Intervals are closed, just like in :meth:`ooc.Flights.time_conflict`.
+
+    :param list starts: Start of each interval.
+    :param list ends: End of each interval.
+    :param int capacity: Maximum number of overlapping intervals.
+    :return: Generator yielding tuples with the start and end of each window, the largest number
+       of overlapping intervals in it and the sorted list with the indices of the intervals
+       active in it.
+    """
+    # Starts are sorted before ends at the same moment, since closed intervals touching each other overlap.
+    events = sorted([(start, 0, i) for i, start in enumerate(starts)] +
+                    [(end, 1, i) for i, end in enumerate(ends)])
+    active = set()
+    window = None
+    for time, is_end, i in events:
+        if is_end:
+            active.discard(i)
+            if window is not None and len(active) <= capacity:
+                yield window[0], time, window[1], sorted(window[2])
+                window = None
+        else:
+            active.add(i)
+            if len(active) > capacity:
+                if window is None:
+                    window = [time, 0, set()]
+                window[1] = max(window[1], len(active))
+                window[2].update(active)
+
+
+def precheck(flights):
+    """
+    Checks whether the bay assignment can be feasible. The checks done are
+
+     - every flight has at least one compliant, non spare bay (``compliance``),
+     - the number of flights at the same time that can only use a set of bays never exceeds
+       the number of bays in it (``capacity``). This is checked for the compliant bays of each
+       aircraft group,
+     - every flight that has to be fueled has a compliant bay with fueling pits (``fueling``),
+     - the current bay of overnight long stay flights is known and compliant (``overnight``).
+
+    :param ooc.Flights flights: Flights object.
+    :return: List with the issues found.
+    :rtype: list
+    """
+    airport = flights.airport
+    issues = []
+    bays = compliant_bays(flights)
+    windows = [flights.buffered_window(i) for i in range(flights.n_flights)]
+
+    for i, flight_bays in enumerate(bays):
+        if not flight_bays:
+            issues.append(IssueType("compliance", (i,), (), None, None, None,
+                                    "Flight {} ({}) has no compliant bay.".format(
+                                        i, flights.flight_schedule[i].ac_type)))
+
+    # The flights that can only use bays in a set compete for these bays. By Hall's theorem
+    # there is no assignment if at some moment there are more of them than bays.
+    for bay_set in sorted(set(bays), key=sorted):
+        if not bay_set:
+            continue
+        flight_idx = [i for i, flight_bays in enumerate(bays) if flight_bays <= bay_set]
+        for start, end, demand, active in overloaded_windows([windows[i][0] for i in flight_idx],
+                                                             [windows[i][1] for i in flight_idx],
+                                                             len(bay_set)):
+            issues.append(IssueType("capacity", tuple(flight_idx[n] for n in active), tuple(sorted(bay_set)),
+                                    start, end, demand,
+                                    "{} flights are at the same time between {:%H:%M} and {:%H:%M}, but only {} "
+                                    "bays are compliant with them: {}.".format(
+                                        demand, start, end, len(bay_set),
+                                        ", ".join(airport.bay_names[k] for k in sorted(bay_set)))))
+
+    for i in range(flights.n_flights):
+        fueled = fueling_bays(flights, i)
+        if fueled and bays[i] and not any(airport.fueling[k] for k in bays[i]):
+            issues.append(IssueType("fueling", fueled, (), None, None, None,
+                                    "Flight {} has to be fueled, but none of it's compliant bays "
+                                    "has fueling pits.".format(i)))
+
+    for group in flights.groups:
+        i = group.flight_idx[0]
+        flight = flights.flight_schedule[i]
+        if not group.overnight or flight.flight_type != ft.Arr:
+            continue
+        if flight.current is None:
+            issues.append(IssueType("overnight", group.flight_idx, (), None, None, None,
+                                    "The current location of overnight flight {} is unknown.".format(
+                                        flight.in_flight_no)))
+        elif flight.current.bay not in bays[i]:
+            issues.append(IssueType("overnight", group.flight_idx, (flight.current.bay,), None, None, None,
+                                    "Overnight flight {} is at bay {}, which is not compliant with it.".format(
+                                        flight.in_flight_no, airport.bay_names[flight.current.bay])))
+
+    return issues
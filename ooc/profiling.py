@@ -0,0 +1,182 @@
+"""
+The classes in here are used to profile the different stages of generating and solving the
+bay and gate assignment problems.
+"""
+
+import json
+import re
+from contextlib import contextmanager
+from time import perf_counter, time
+
+
+variable_name_pattern = re.compile(r"\b[XUVWSMO](?:_\d+)+\b")
+"""
+Regular expression matching the names of the decision variables and penalty values in the lp code.
+"""
+
+constraint_name_pattern = re.compile(r"^\s*[A-Za-z]\w*:", re.MULTILINE)
+"""
+Regular expression matching the name of a constraint at the start of a row in the lp code.
+"""
+
+
+def lp_statistics(code):
+    """
+    Counts the rows, variables and nonzeros in a snippet of generated lp code.
+
+    :param string code: Snippet of lp code.
+    :return: Dictionary with the number of 'rows' (named constraints), unique 'variables'
+       and 'nonzeros' (variable terms).
+    :rtype: dict
+    """
+    variables = variable_name_pattern.findall(code)
+    return {"rows": len(constraint_name_pattern.findall(code)),
+            "variables": len(set(variables)),
+            "nonzeros": len(variables)}
+
+
+class Section(dict):
+    """
+    Dictionary holding the record of a single profiled section. It's yielded by
+    :meth:`Profiler.section` so the code in the section can add information to it.
+    """
+
+    def lp_statistics(self, code):
+        """
+        Adds the number of rows, variables and nonzeros of the lp code generated in this section.
+
+        :param string code: Generated lp code.
+        """
+        self.update(lp_statistics(code))
+
+
+class NullSection:
+    """
+    Section of the :class:`NullProfiler`. It ignores all information added to it.
+    """
+
+    def lp_statistics(self, code):
+        pass
+
+    def __setitem__(self, key, value):
+        pass
+
+    def update(self, *args, **kwargs):
+        pass
+
+
+class Profiler:
+    """
+    Records the wall time of profiled sections together with extra information like
+    the number of lp rows, variables and nonzeros generated and bytes written.
+
+    :param recorder: Optional callable that is called with each finished section record,
+       eg. a :class:`JsonLinesRecorder`. The records are always kept in :attr:`records` as well.
+    """
+
+    enabled = True
+
+    def __init__(self, recorder=None):
+        self.recorder = recorder
+        self.records = []  #: List holding the records of all finished sections.
+
+    @contextmanager
+    def section(self, name, **info):
+        """
+        Context manager used to profile a section of code.
+
+        :param string name: Name of the section, eg. 'bay.constraint_fueling'.
+        :param info: Extra information to add to the record.
+        :return: Context manager yielding the :class:`Section` record.
+        """
+        section = Section(name=name, start=time(), wall_time=None)
+        section.update(info)
+        t0 = perf_counter()
+        try:
+            yield section
+        finally:
+            section["wall_time"] = perf_counter() - t0
+            self.records.append(section)
+            if self.recorder is not None:
+                self.recorder(section)
+
+    def lp_section(self, name, builder):
+        """
+        Runs a function generating a section of lp code in a profiled section and adds the
+        lp statistics of the generated code to the record.
+
+        :param string name: Name of the section, eg. 'bay.constraint_fueling'.
+        :param builder: Function returning the lp code of the section.
+        :return: The generated lp code.
+        :rtype: string
+        """
+        with self.section(name) as section:
+            code = builder()
+            section.lp_statistics(code)
+        return code
+
+    def totals(self):
+        """
+        :return: Dictionary with the total wall time per section name.
+        :rtype: dict
+        """
+        totals = {}
+        for record in self.records:
+            totals[record["name"]] = totals.get(record["name"], 0) + record["wall_time"]
+        return totals
+
+    def write_json_lines(self, f):
+        """
+        Writes all records to a file, one JSON object per line.
+
+        :param f: Text file like object.
+        """
+        for record in self.records:
+            f.write(json.dumps(record) + "\n")
+
+    def save_json_lines(self, path):
+        """
+        Saves all records to a JSON lines file.
+
+        :param string path: Path to the file.
+        """
+        with open(path, "w") as f:
+            self.write_json_lines(f)
+
+
+class NullProfiler:
+    """
+    Profiler that doesn't record anything. This is the default profiler, so profiling
+    adds virtually no overhead when it's not used.
+    """
+
+    enabled = False
+    records = ()
+
+    _section = NullSection()
+
+    @contextmanager
+    def section(self, name, **info):
+        yield self._section
+
+    def lp_section(self, name, builder):
+        return builder()
+
+    def totals(self):
+        return {}
+
+
+class JsonLinesRecorder:
+    """
+    Recorder for :class:`Profiler` that appends each finished section to a
+    JSON lines file as soon as it's finished.
+
+    :param string path: Path to the JSON lines file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, record):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
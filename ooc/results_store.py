@@ -0,0 +1,307 @@
+"""
+The class in here stores the solutions of multiple runs in a local SQLite database, so they can be
+queried afterwards.
+"""
+
+import sqlite3
+from collections import namedtuple
+from datetime import datetime
+from os.path import abspath
+
+import numpy as np
+
+from ooc.flights import ft
+
+
+RunType = namedtuple("RunType", ("run_id",
+                                 "jid",
+                                 "date",
+                                 "created",
+                                 "airport_data_path",
+                                 "flight_data_path",
+                                 "buffer_time",
+                                 "spare_bays",
+                                 "bay_code_generation",
+                                 "bay_solving",
+                                 "gate_code_generation",
+                                 "gate_solving"))
+"""
+Named tuple holding the information of a single run.
+"""
+
+StoredSolutionType = namedtuple("StoredSolutionType", ("run_id",
+                                                       "idx",
+                                                       "flight_type",
+                                                       "in_flight_no",
+                                                       "origin",
+                                                       "eta",
+                                                       "bay",
+                                                       "gate",
+                                                       "reg_no",
+                                                       "out_flight_no",
+                                                       "dest",
+                                                       "etd",
+                                                       "ac_type",
+                                                       "bay_idx",
+                                                       "gate_idx"))
+"""
+Named tuple holding the stored solution of a single flight. It has the same fields
+as :class:`ooc.FlightSolution`.
+"""
+
+schema = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id               INTEGER PRIMARY KEY,
+    jid                  TEXT,
+    date                 TEXT,
+    created              TEXT,
+    airport_data_path    TEXT,
+    flight_data_path     TEXT,
+    buffer_time          REAL,
+    spare_bays           TEXT,
+    bay_code_generation  REAL,
+    bay_solving          REAL,
+    gate_code_generation REAL,
+    gate_solving         REAL
+);
+
+CREATE TABLE IF NOT EXISTS flights (
+    run_id        INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    idx           INTEGER NOT NULL,
+    flight_type   TEXT,
+    in_flight_no  TEXT,
+    origin        TEXT,
+    eta           TEXT,
+    reg_no        TEXT,
+    out_flight_no TEXT,
+    dest          TEXT,
+    etd           TEXT,
+    ac_type       TEXT,
+    PRIMARY KEY (run_id, idx)
+);
+
+CREATE TABLE IF NOT EXISTS assignments (
+    run_id   INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    idx      INTEGER NOT NULL,
+    bay      TEXT,
+    bay_idx  INTEGER,
+    gate     TEXT,
+    gate_idx INTEGER,
+    PRIMARY KEY (run_id, idx)
+);
+
+CREATE INDEX IF NOT EXISTS runs_date ON runs (date);
+CREATE INDEX IF NOT EXISTS flights_in_flight_no ON flights (in_flight_no);
+CREATE INDEX IF NOT EXISTS flights_out_flight_no ON flights (out_flight_no);
+CREATE INDEX IF NOT EXISTS assignments_bay ON assignments (bay);
+CREATE INDEX IF NOT EXISTS assignments_gate ON assignments (gate);
+"""
+"""
+SQL code used to create the tables and indices of the results database.
+"""
+
+
+class ResultsStore:
+    """
+    Class used to store the solutions of :class:`ooc.BayGateSolver` runs in a SQLite
+    database and to query them afterwards.
+
+    :param string path: Path to the SQLite database file. It will be created if it
+       doesn't exist yet. Use ``":memory:"`` for a temporary in memory database.
+    """
+
+    def __init__(self, path):
+        self.path = path if path == ":memory:" else abspath(path)
+        """Path to the SQLite database file."""
+
+        self.connection = sqlite3.connect(self.path)
+        """:class:`sqlite3.Connection` to the database."""
+
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(schema)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        """
+        self.connection.close()
+
+    def add_run(self, solver, timings=None, created=None):
+        """
+        Stores the flights and bay/gate assignments of a solver in the database. All rows
+        are inserted in a single transaction.
+
+        :param ooc.BayGateSolver solver: Solver with the solutions loaded in.
+        :param dict timings: Dictionary with the code generation and solving times. By
+           default the timings recorded by the solver are used.
+        :param datetime.datetime created: Time the run was created. Defaults to now.
+        :return: Id of the new run.
+        :rtype: int
+        """
+        timings = solver.timings if timings is None else timings
+        created = datetime.now() if created is None else created
+
+        flights = solver.flights
+        spare_bays = ";".join(solver.airport.bay_names[k] for k in flights.spare_bays)
+
+        # Using the connection as a context manager commits the transaction at the end or
+        # rolls it back if something went wrong.
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (jid, date, created, airport_data_path, flight_data_path, buffer_time, "
+                "spare_bays, bay_code_generation, bay_solving, gate_code_generation, gate_solving) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (solver.jid,
+                 flights.config['date'].isoformat(),
+                 created.isoformat(),
+                 solver.airport_data_path,
+                 solver.flights_data_path,
+                 flights.buffer_time.total_seconds(),
+                 spare_bays,
+                 timings.get("bay_code_generation"),
+                 timings.get("bay_solving"),
+                 timings.get("gate_code_generation"),
+                 timings.get("gate_solving")))
+            run_id = cursor.lastrowid
+
+            self.connection.executemany(
+                "INSERT INTO flights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((run_id,
+                  solution.idx,
+                  solution.flight_type.name,
+                  solution.in_flight_no,
+                  solution.origin,
+                  solution.eta.isoformat(),
+                  solution.reg_no,
+                  solution.out_flight_no,
+                  solution.dest,
+                  solution.etd.isoformat(),
+                  solution.ac_type) for solution in solver.solutions))
+
+            self.connection.executemany(
+                "INSERT INTO assignments VALUES (?, ?, ?, ?, ?, ?)",
+                ((run_id,
+                  solution.idx,
+                  solution.bay,
+                  solution.bay_idx,
+                  solution.gate,
+                  solution.gate_idx) for solution in solver.solutions))
+
+        return run_id
+
+    def delete_run(self, run_id):
+        """
+        Deletes a run and all of it's flights and assignments.
+
+        :param int run_id: Id of the run.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def runs(self, since=None):
+        """
+        :param datetime.date since: If given, only the runs of schedules on or after this date are returned.
+        :return: List with the stored runs sorted by schedule date.
+        :rtype: list of RunType
+        """
+        rows = self.connection.execute("SELECT * FROM runs WHERE date >= ? ORDER BY date, run_id",
+                                       (self._date_string(since),))
+        return [RunType(*row) for row in rows]
+
+    def solutions(self, run_id):
+        """
+        :param int run_id: Id of the run.
+        :return: List with the solution of each flight of the run.
+        :rtype: list of StoredSolutionType
+        """
+        rows = self.connection.execute(
+            "SELECT f.run_id, f.idx, f.flight_type, f.in_flight_no, f.origin, f.eta, a.bay, a.gate, f.reg_no, "
+            "f.out_flight_no, f.dest, f.etd, f.ac_type, a.bay_idx, a.gate_idx "
+            "FROM flights f JOIN assignments a ON f.run_id = a.run_id AND f.idx = a.idx "
+            "WHERE f.run_id = ? ORDER BY f.idx", (run_id,))
+        return [self._stored_solution(row) for row in rows]
+
+    def flight_bays(self, flight_no, since=None):
+        """
+        Looks up the bays and gates a flight has been assigned to in all stored runs.
+
+        :param string flight_no: Inbound or outbound flight number.
+        :param datetime.date since: If given, only runs of schedules on or after this date are searched.
+        :return: List with the solutions of the flight sorted by schedule date.
+        :rtype: list of StoredSolutionType
+        """
+        rows = self.connection.execute(
+            "SELECT f.run_id, f.idx, f.flight_type, f.in_flight_no, f.origin, f.eta, a.bay, a.gate, f.reg_no, "
+            "f.out_flight_no, f.dest, f.etd, f.ac_type, a.bay_idx, a.gate_idx "
+            "FROM flights f "
+            "JOIN assignments a ON f.run_id = a.run_id AND f.idx = a.idx "
+            "JOIN runs r ON f.run_id = r.run_id "
+            "WHERE (f.in_flight_no = ? OR f.out_flight_no = ?) AND r.date >= ? "
+            "ORDER BY r.date, f.run_id, f.idx", (flight_no, flight_no, self._date_string(since)))
+        return [self._stored_solution(row) for row in rows]
+
+    def bay_usage(self, bay, since=None):
+        """
+        :param string bay: Bay name.
+        :param datetime.date since: If given, only runs of schedules on or after this date are counted.
+        :return: Number of flights that have been assigned to this bay.
+        :rtype: int
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM assignments a JOIN runs r ON a.run_id = r.run_id "
+            "WHERE a.bay = ? AND r.date >= ?", (bay, self._date_string(since))).fetchone()[0]
+
+    def gate_usage(self, gate, since=None):
+        """
+        :param string gate: Gate name.
+        :param datetime.date since: If given, only runs of schedules on or after this date are counted.
+        :return: Number of flights that have been assigned to this gate.
+        :rtype: int
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM assignments a JOIN runs r ON a.run_id = r.run_id "
+            "WHERE a.gate = ? AND r.date >= ?", (gate, self._date_string(since))).fetchone()[0]
+
+    def bay_idx_array(self, run_id):
+        """
+        :param int run_id: Id of the run.
+        :return: Array with the assigned bay index of each flight. Unassigned flights are -1.
+        :rtype: numpy.ndarray
+        """
+        return self._idx_array(run_id, "bay_idx")
+
+    def gate_idx_array(self, run_id):
+        """
+        :param int run_id: Id of the run.
+        :return: Array with the assigned gate index of each flight. Flights without a gate are -1.
+        :rtype: numpy.ndarray
+        """
+        return self._idx_array(run_id, "gate_idx")
+
+    def _idx_array(self, run_id, column):
+        rows = self.connection.execute(
+            "SELECT IFNULL({}, -1) FROM assignments WHERE run_id = ? ORDER BY idx".format(column), (run_id,))
+        return np.fromiter((row[0] for row in rows), dtype=np.int64)
+
+    @staticmethod
+    def _date_string(since):
+        # An empty string is smaller than any iso date, so all runs match.
+        if since is None:
+            return ""
+        if isinstance(since, datetime):
+            since = since.date()
+        return since.isoformat()
+
+    @staticmethod
+    def _stored_solution(row):
+        row = list(row)
+        row[2] = ft[row[2]]  # flight_type
+        row[5] = datetime.strptime(row[5], "%Y-%m-%dT%H:%M:%S")  # eta
+        row[11] = datetime.strptime(row[11], "%Y-%m-%dT%H:%M:%S")  # etd
+        return StoredSolutionType(*row)
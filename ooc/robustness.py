@@ -0,0 +1,257 @@
+"""
+The functions in here measure how robust a solved bay and gate assignment is against delays.
+Thousands of delay scenarios are sampled at once and the resulting bay and gate overlaps are
+counted for all scenarios at the same time using numpy arrays, so a plan can be scored in
+seconds without solving the assignment again.
+
+Delays are given in minutes by delay distributions. These are functions called with a
+:class:`numpy.random.Generator` and the shape of the array to sample, eg.
+:func:`exponential_delay`. A positive delay means a late arrival or departure.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from ooc import ft
+from ooc.intervals import overlapping_pairs
+
+
+DelayModelType = namedtuple("DelayModelType", ("arrival", "departure"))
+"""
+Named tuple holding the arrival and departure delay distributions of a group of flights.
+"""
+
+RobustnessType = namedtuple("RobustnessType", ("bay_conflicts",
+                                               "gate_conflicts",
+                                               "retowings",
+                                               "conflict_probability"))
+"""
+Named tuple holding the results of :func:`evaluate_robustness`. ``bay_conflicts``,
+``gate_conflicts`` and ``retowings`` hold the number of overlapping flight pairs on the bays
+and gates and the number of flights that have to be moved to another bay in each scenario.
+``conflict_probability`` holds the fraction of the scenarios in which each flight is involved
+in a bay conflict.
+"""
+
+
+def no_delay():
+    """
+    :return: Delay distribution that is always zero.
+    """
+    def sample(rng, shape):
+        return np.zeros(shape)
+    return sample
+
+
+def exponential_delay(mean):
+    """
+    :param float mean: Mean delay in minutes.
+    :return: Exponentially distributed delay distribution.
+    """
+    def sample(rng, shape):
+        return rng.exponential(mean, shape)
+    return sample
+
+
+def normal_delay(mean, std, minimum=None):
+    """
+    :param float mean: Mean delay in minutes.
+    :param float std: Standard deviation in minutes.
+    :param float minimum: Optional minimum delay in minutes, eg. to limit how early flights arrive.
+    :return: Normally distributed delay distribution.
+    """
+    def sample(rng, shape):
+        delays = rng.normal(mean, std, shape)
+        return delays if minimum is None else np.maximum(delays, minimum)
+    return sample
+
+
+default_delay_model = DelayModelType(arrival=exponential_delay(15), departure=exponential_delay(10))
+"""
+Delay model used for the flights without a delay model of their own.
+"""
+
+
+def delay_models(solutions, models, default):
+    """
+    Looks up the delay model of each flight. The airline of a flight is looked up first, then
+    it's flight type.
+
+    :param list solutions: List of :class:`ooc.FlightSolution` objects.
+    :param dict models: Dictionary with the delay models per airline code or :class:`ooc.ft` flight type.
+    :param DelayModelType default: Delay model of the flights not found in ``models``.
+    :return: Dictionary with the flight indices per delay model.
+    :rtype: dict
+    """
+    flights = solutions[0].flights
+    groups = {}
+    for i, solution in enumerate(solutions):
+        model = models.get(flights.airline(i), models.get(solution.flight_type, default))
+        groups.setdefault(model, []).append(i)
+    return groups
+
+
+def sample_times(eta, etd, flight_types, groups, split_flights, rng, n_scenarios):
+    """
+    Samples the delayed eta and etd of all flights. Only the arrival of full and arriving flights
+    and the departure of full and departing flights are delayed. The other times of a long stay
+    flight are the moments it's towed. These are pushed back if needed, so the parts of a long
+    stay flight stay in order.
+
+    :param numpy.ndarray eta: Scheduled eta of each flight in minutes.
+    :param numpy.ndarray etd: Scheduled etd of each flight in minutes.
+    :param list flight_types: Flight type of each flight.
+    :param dict groups: Dictionary with the flight indices per delay model.
+    :param list split_flights: Flight indices of the parts of each long stay flight, see :attr:`ooc.Flights.groups`.
+    :param numpy.random.Generator rng: Random number generator.
+    :param int n_scenarios: Number of scenarios.
+    :return: Tuple with the (n_scenarios, n_flights) arrays of delayed etas and etds.
+    """
+    n = len(eta)
+    arrival = np.zeros((n_scenarios, n))
+    departure = np.zeros((n_scenarios, n))
+    for model, idx in groups.items():
+        idx = np.asarray(idx)
+        arrival[:, idx] = model.arrival(rng, (n_scenarios, len(idx)))
+        departure[:, idx] = model.departure(rng, (n_scenarios, len(idx)))
+
+    arriving = np.array([flight_type in [ft.Full, ft.Arr] for flight_type in flight_types])
+    departing = np.array([flight_type in [ft.Full, ft.Dep] for flight_type in flight_types])
+    eta = eta + np.where(arriving, arrival, 0)
+    etd = etd + np.where(departing, departure, 0)
+
+    # Keep the parts of the long stay flights in order.
+    for flight_idx in split_flights:
+        for k, j in enumerate(flight_idx):
+            if k:
+                eta[:, j] = np.maximum(eta[:, j], etd[:, flight_idx[k - 1]])
+            etd[:, j] = np.maximum(etd[:, j], eta[:, j])
+
+    return eta, etd
+
+
+def shared_pairs(resources, group, starts, ends):
+    """
+    Finds the pairs of flights sharing a resource whose time windows overlap with a sweep line
+    per resource, see :func:`ooc.intervals.overlapping_pairs`. So the number of pairs grows with
+    the number of near conflicts instead of quadratically with the number of flights per resource.
+
+    :param list resources: Resource (bay or gate) index of each flight, or None if it has none.
+    :param list group: Long stay flight group of each flight. Flights of the same group are never paired.
+    :param numpy.ndarray starts: Start of the time window of each flight.
+    :param numpy.ndarray ends: End of the time window of each flight.
+    :return: Tuple with the arrays of the first and second flight of each pair.
+    """
+    flights_per_resource = {}
+    for i, resource in enumerate(resources):
+        if resource is not None:
+            flights_per_resource.setdefault(resource, []).append(i)
+
+    first = []
+    second = []
+    for idx in flights_per_resource.values():
+        for a, b in overlapping_pairs(starts[idx].tolist(), ends[idx].tolist()):
+            i, j = idx[a], idx[b]
+            if group[i] != group[j]:
+                first.append(i)
+                second.append(j)
+    return np.array(first, dtype=int), np.array(second, dtype=int)
+
+
+def evaluate_robustness(solutions, n_scenarios=1000, models=None, default=default_delay_model, seed=None,
+                        batch_size=1000):
+    """
+    Evaluates a solved bay and gate assignment for random delay scenarios. In each scenario
+    two flights conflict if they share a bay (or gate) and their delayed time windows overlap.
+    Just like in :meth:`ooc.Flights.time_conflict` the time windows are closed. Of each
+    conflicting pair of flights on a bay, the flight arriving last has to be towed to another bay.
+
+    :param list solutions: List of :class:`ooc.FlightSolution` objects with the bay (and optionally
+       gate) assignment loaded in, eg. :attr:`ooc.BayGateSolver.solutions`.
+    :param int n_scenarios: Number of delay scenarios.
+    :param dict models: Optional dictionary with the :class:`DelayModelType` per airline code or
+       :class:`ooc.ft` flight type. Airlines take precedence over flight types.
+    :param DelayModelType default: Delay model of the flights not found in ``models``.
+    :param int seed: Optional seed of the random number generator.
+    :param int batch_size: Number of scenarios evaluated at the same time. Limits the memory used.
+    :return: Results per scenario.
+    :rtype: RobustnessType
+    """
+    if not solutions:
+        raise Exception("There are no solutions to evaluate.")
+    if any(solution.bay_idx is None for solution in solutions):
+        raise Exception("No bay assignment solutions has been loaded.")
+
+    rng = np.random.default_rng(seed)
+    groups = delay_models(solutions, models or {}, default)
+
+    # Scheduled times in minutes since the start of the schedule's day.
+    day = datetime.combine(solutions[0].flights.config["date"], datetime.min.time())
+    eta = np.array([(solution.eta - day).total_seconds() / 60 for solution in solutions])
+    etd = np.array([(solution.etd - day).total_seconds() / 60 for solution in solutions])
+    flight_types = [solution.flight_type for solution in solutions]
+
+    # Group of the long stay flight each flight belongs to.
+    flights = solutions[0].flights
+    group = flights.flight_group
+    split_flights = [g.flight_idx for g in flights.groups if len(g.flight_idx) > 1]
+
+    bays = [solution.bay_idx for solution in solutions]
+    gates = [solution.gate_idx for solution in solutions]
+
+    bay_conflicts = np.zeros(n_scenarios, dtype=int)
+    gate_conflicts = np.zeros(n_scenarios, dtype=int)
+    retowings = np.zeros(n_scenarios, dtype=int)
+    involved = np.zeros(len(solutions), dtype=int)
+
+    for start in range(0, n_scenarios, batch_size):
+        n = min(batch_size, n_scenarios - start)
+        eta_s, etd_s = sample_times(eta, etd, flight_types, groups, split_flights, rng, n)
+
+        # Two flights can only conflict in a scenario if the windows spanning their delayed times
+        # in all scenarios of the batch overlap. Only these pairs are checked.
+        earliest = eta_s.min(axis=0)
+        latest = etd_s.max(axis=0)
+        bay_i, bay_j = shared_pairs(bays, group, earliest, latest)
+        gate_i, gate_j = shared_pairs(gates, group, earliest, latest)
+
+        # (scenario, pair) matrices with the conflicts.
+        bay_overlap = (eta_s[:, bay_i] <= etd_s[:, bay_j]) & (eta_s[:, bay_j] <= etd_s[:, bay_i])
+        gate_overlap = (eta_s[:, gate_i] <= etd_s[:, gate_j]) & (eta_s[:, gate_j] <= etd_s[:, gate_i])
+        bay_conflicts[start:start + n] = bay_overlap.sum(axis=1)
+        gate_conflicts[start:start + n] = gate_overlap.sum(axis=1)
+
+        # Mark the flights that have to be towed. A flight is only counted once per scenario.
+        scenario, pair = np.nonzero(bay_overlap)
+        last = np.where(eta_s[scenario, bay_i[pair]] >= eta_s[scenario, bay_j[pair]], bay_i[pair], bay_j[pair])
+        towed = np.zeros((n, len(solutions)), dtype=bool)
+        towed[scenario, last] = True
+        retowings[start:start + n] = towed.sum(axis=1)
+
+        conflicting = np.zeros((n, len(solutions)), dtype=bool)
+        conflicting[scenario, bay_i[pair]] = True
+        conflicting[scenario, bay_j[pair]] = True
+        involved += conflicting.sum(axis=0)
+
+    return RobustnessType(bay_conflicts=bay_conflicts,
+                          gate_conflicts=gate_conflicts,
+                          retowings=retowings,
+                          conflict_probability=involved / n_scenarios)
+
+
+def summary(result):
+    """
+    :param RobustnessType result: Results of :func:`evaluate_robustness`.
+    :return: Dictionary with the mean and 95th percentile of the conflicts and retowings and the
+       fraction of the scenarios without any bay conflicts.
+    :rtype: dict
+    """
+    return {"bay_conflicts_mean": float(result.bay_conflicts.mean()),
+            "bay_conflicts_p95": float(np.percentile(result.bay_conflicts, 95)),
+            "gate_conflicts_mean": float(result.gate_conflicts.mean()),
+            "gate_conflicts_p95": float(np.percentile(result.gate_conflicts, 95)),
+            "retowings_mean": float(result.retowings.mean()),
+            "retowings_p95": float(np.percentile(result.retowings, 95)),
+            "conflict_free": float((result.bay_conflicts == 0).mean())}
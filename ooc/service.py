@@ -0,0 +1,506 @@
+"""
+Long running local service that solves bay and gate assignments. Parsed airports are cached
+by path, so only the schedule has to be processed for each request. The schedules are posted
+as json holding the rows of the 'flight_schedule.csv', 'preferences.csv' and 'current.csv'
+files and are solved by a pool of worker threads.
+
+The service listens on localhost and has the following endpoints:
+
+- ``POST /assign``: Solves a schedule, see :func:`write_schedule` for the payload.
+- ``GET /metrics``: Returns the queue depth, concurrency limits and request latencies.
+- ``GET /airports``: Returns the paths of the cached airports.
+
+Invalid requests are answered with status 400, failures while solving them with status 500.
+The service is started with the 'ooc-serve' command, eg.
+
+    ooc-serve --port 8441 --workers 2 --backend cplex-session
+"""
+
+import argparse
+import copy
+import json
+import shutil
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from os import makedirs
+from os.path import abspath, join
+from time import perf_counter
+
+from ooc import Airport, Flights, BayGateSolver
+from ooc.print_color import pr_g
+
+
+schedule_columns = ["flight_type", "in_flight_no", "origin", "eta", "bay", "gate", "reg_no", "out_flight_no",
+                    "dest", "etd", "ac_type"]
+"""
+Columns of the 'flight_schedule.csv' file.
+"""
+
+preferences_columns = ["flight", "dest", "bays", "gates"]
+"""
+Columns of the 'preferences.csv' file. Multiple bays or gates are separated by a semicolon.
+"""
+
+current_columns = ["flight", "bay"]
+"""
+Columns of the 'current.csv' file.
+"""
+
+
+class ServiceBusyError(Exception):
+    """
+    Raised when a request is rejected because the queue is full.
+    """
+    pass
+
+
+class RequestError(Exception):
+    """
+    Raised when a request is invalid, eg. when the schedule can't be parsed.
+    """
+    pass
+
+
+class AirportCache:
+    """
+    Cache holding the parsed airports by path. An airport is only parsed the first time it's requested.
+    """
+
+    def __init__(self):
+        self.airports = {}  #: Dictionary with the airport per absolute path.
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        """
+        :param string path: Path to the directory holding the airport data.
+        :return: The cached airport.
+        :rtype: ooc.Airport
+        """
+        path = abspath(path)
+        with self.lock:
+            if path not in self.airports:
+                self.airports[path] = Airport(path)
+            return self.airports[path]
+
+    def paths(self):
+        """
+        :return: Sorted list with the paths of the cached airports.
+        :rtype: list
+        """
+        with self.lock:
+            return sorted(self.airports)
+
+    def clear(self):
+        """
+        Removes all airports from the cache, so they are parsed again on the next request.
+        """
+        with self.lock:
+            self.airports.clear()
+
+
+class ServiceMetrics:
+    """
+    Keeps track of the number of queued and running requests and the latency of the last requests.
+
+    :param int workers: Maximum number of requests solved at the same time.
+    :param int max_queue: Maximum number of requests waiting for a worker.
+    :param int window: Number of requests the latency statistics are calculated over.
+    """
+
+    def __init__(self, workers, max_queue, window=1000):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=window)  #: (queue wait, run time) of the last requests in seconds.
+
+    def enqueue(self):
+        """
+        Registers a new request. Raises :class:`ServiceBusyError` if the queue is full.
+        """
+        with self.lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise ServiceBusyError("The queue is full, {} requests are waiting.".format(self.queued))
+            self.queued += 1
+
+    def start(self):
+        with self.lock:
+            self.queued -= 1
+            self.running += 1
+
+    def finish(self, wait, run, failed=False):
+        with self.lock:
+            self.running -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self.latencies.append((wait, run))
+
+    def summary(self):
+        """
+        :return: Dictionary with the current metrics. The latencies are in seconds.
+        :rtype: dict
+        """
+        with self.lock:
+            latencies = list(self.latencies)
+            summary = {"workers": self.workers,
+                       "max_queue": self.max_queue,
+                       "queue_depth": self.queued,
+                       "running": self.running,
+                       "completed": self.completed,
+                       "failed": self.failed,
+                       "rejected": self.rejected}
+        summary["latency"] = latency_statistics([wait + run for wait, run in latencies])
+        summary["queue_wait"] = latency_statistics([wait for wait, _ in latencies])
+        return summary
+
+
+def latency_statistics(values):
+    """
+    :param list values: Latencies in seconds.
+    :return: Dictionary with the 'count', 'mean', 'p50', 'p95' and 'max' latency.
+    :rtype: dict
+    """
+    if not values:
+        return {"count": 0, "mean": None, "p50": None, "p95": None, "max": None}
+    values = sorted(values)
+
+    def percentile(p):
+        return values[min(int(p * len(values)), len(values) - 1)]
+
+    return {"count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": values[-1]}
+
+
+def write_csv_rows(path, columns, rows):
+    """
+    Writes rows to a csv file in the format read by :class:`ooc.Flights`.
+
+    :param string path: Path to the csv file.
+    :param list columns: Column names.
+    :param list rows: List of rows. A row is a dictionary with the value per column name or a
+       list with the values in the order of the columns. Missing values are left empty.
+    """
+    with open(path, "w") as f:
+        f.write(",".join(columns) + "\n")
+        for row in rows:
+            if isinstance(row, dict):
+                row = [row.get(column) for column in columns]
+            if len(row) != len(columns):
+                raise Exception("Expected {} values in the row '{}' for '{}'.".format(len(columns), row, path))
+            f.write(",".join("" if value is None else str(value) for value in row) + "\n")
+
+
+def write_schedule(path, payload):
+    """
+    Writes the schedule of a request to a directory in the format read by :class:`ooc.Flights`.
+
+    The payload is a dictionary with the following items:
+
+    - 'date': Date of the schedule, eg. '2015 06 02'.
+    - 'flight_schedule': Rows of the 'flight_schedule.csv' file.
+    - 'preferences': Optional rows of the 'preferences.csv' file.
+    - 'current': Optional rows of the 'current.csv' file.
+
+    :param string path: Path to the directory. It's created if it doesn't exist.
+    :param dict payload: Schedule payload.
+    """
+    if "date" not in payload or "flight_schedule" not in payload:
+        raise Exception("The schedule payload needs a 'date' and 'flight_schedule'.")
+    makedirs(path, exist_ok=True)
+    with open(join(path, "config.json"), "w") as f:
+        json.dump({"date": payload["date"]}, f)
+    write_csv_rows(join(path, "flight_schedule.csv"), schedule_columns, payload["flight_schedule"])
+    write_csv_rows(join(path, "preferences.csv"), preferences_columns, payload.get("preferences", []))
+    write_csv_rows(join(path, "current.csv"), current_columns, payload.get("current", []))
+
+
+def read_csv_rows(path):
+    """
+    :param string path: Path to a csv file of a schedule.
+    :return: List with a dictionary per row with the values per column name.
+    :rtype: list
+    """
+    with open(path) as f:
+        columns = [x.strip() for x in f.readline().split(",")]
+        return [dict(zip(columns, [x.strip() for x in line.split(",")])) for line in f if line.strip()]
+
+
+def schedule_payload(flights_data_path):
+    """
+    Creates the payload of a request from a directory holding the flights data.
+
+    :param string flights_data_path: Path to the directory holding the flights data.
+    :return: Schedule payload, see :func:`write_schedule`.
+    :rtype: dict
+    """
+    with open(join(flights_data_path, "config.json")) as f:
+        date = json.load(f)["date"]
+    return {"date": date,
+            "flight_schedule": read_csv_rows(join(flights_data_path, "flight_schedule.csv")),
+            "preferences": read_csv_rows(join(flights_data_path, "preferences.csv")),
+            "current": read_csv_rows(join(flights_data_path, "current.csv"))}
+
+
+class AssignmentService:
+    """
+    Solves the bay and gate assignment of the requested schedules on a pool of worker threads.
+
+    :param string workspace: Directory in which the workspaces of the requests are created. It's
+       relative to the current working directory, like the job ids of :class:`ooc.BayGateSolver`.
+    :param lp_solver: Solver used to solve the lp files, eg. :class:`ooc.lp_solvers.ScipySolver`
+       or :class:`ooc.cplex_session.CplexSessionPool`. Defaults to the cplex interactive solver.
+    :param int workers: Maximum number of requests solved at the same time.
+    :param int max_queue: Maximum number of requests waiting for a worker. Other requests are rejected.
+    :param bool keep_workspaces: True to keep the workspaces of the requests.
+    """
+
+    def __init__(self, workspace="service", lp_solver=None, workers=1, max_queue=16, keep_workspaces=False):
+        self.workspace = workspace
+        self.lp_solver = lp_solver
+        self.keep_workspaces = keep_workspaces
+        self.airports = AirportCache()
+        self.metrics = ServiceMetrics(workers, max_queue)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        self.n_requests = 0
+        makedirs(workspace, exist_ok=True)
+
+    def submit(self, request):
+        """
+        Queues a request.
+
+        :param dict request: Request holding the 'airport' path and 'schedule' payload (see
+           :func:`write_schedule`). Optionally the 'buffer_time' in minutes, the names of
+           the 'spare_bays' and 'decompose'.
+        :return: Future of the response, see :meth:`assign`.
+        :rtype: concurrent.futures.Future
+        """
+        self.metrics.enqueue()
+        with self.lock:
+            self.n_requests += 1
+            request_id = self.n_requests
+        return self.executor.submit(self.run, request_id, request, perf_counter())
+
+    def assign(self, request):
+        """
+        Solves a request and waits for the response.
+
+        :param dict request: Request, see :meth:`submit`.
+        :return: Dictionary with the request 'id', the 'assignments' of each flight, the
+           'objective' values, the solver 'timings' and the 'queue_wait' and 'run_time' in seconds.
+        :rtype: dict
+        """
+        return self.submit(request).result()
+
+    def run(self, request_id, request, t_submitted):
+        t_started = perf_counter()
+        self.metrics.start()
+        failed = True
+        try:
+            response = self.solve(request_id, request)
+            failed = False
+        finally:
+            run_time = perf_counter() - t_started
+            self.metrics.finish(t_started - t_submitted, run_time, failed)
+        response["queue_wait"] = t_started - t_submitted
+        response["run_time"] = run_time
+        return response
+
+    def solve(self, request_id, request):
+        """
+        Runs the bay and gate assignment pipeline for a single request. Raises :class:`RequestError`
+        if the airport or schedule of the request can't be loaded.
+
+        :param int request_id: Id of the request. The workspace is named after it.
+        :param dict request: Request, see :meth:`submit`.
+        :return: Response without the latencies.
+        :rtype: dict
+        """
+        if "airport" not in request or "schedule" not in request:
+            raise RequestError("The request needs an 'airport' path and a 'schedule'.")
+
+        jid = join(self.workspace, "request_{}".format(request_id))
+        schedule_path = join(jid, "schedule")
+        try:
+            try:
+                # The flights attach themselves to the airport, so each request works on a shallow
+                # copy. The parsed airport data itself is shared.
+                airport = copy.copy(self.airports.get(request["airport"]))
+                write_schedule(schedule_path, request["schedule"])
+                flights = Flights(schedule_path, airport,
+                                  buffer_time=timedelta(minutes=request.get("buffer_time", 0)),
+                                  spare_bays=request.get("spare_bays"))
+            except Exception as e:
+                raise RequestError("Invalid request: {}".format(e)) from e
+
+            solver = BayGateSolver.from_flights(flights, jid, lp_solver=self.lp_solver)
+            decompose = request.get("decompose", False)
+            solver.solve_bay_assignment(decompose=decompose, processes=1)
+            solver.load_bay_assignment_solution()
+            solver.solve_gate_assignment(decompose=decompose, processes=1)
+            solver.load_gate_assignment_solution()
+
+            return {"id": request_id,
+                    "assignments": [{"idx": solution.idx,
+                                     "flight_type": solution.flight_type.name,
+                                     "in_flight_no": solution.in_flight_no,
+                                     "out_flight_no": solution.out_flight_no,
+                                     "eta": solution.eta.isoformat(),
+                                     "etd": solution.etd.isoformat(),
+                                     "bay": solution.bay,
+                                     "gate": solution.gate} for solution in solver.solutions],
+                    "objective": {"bay": solver.objective_value("bay"),
+                                  "gate": solver.objective_value("gate")},
+                    "timings": solver.timings}
+        finally:
+            if not self.keep_workspaces:
+                shutil.rmtree(jid, ignore_errors=True)
+
+    def close(self):
+        """
+        Waits for the queued requests and stops the workers.
+        """
+        self.executor.shutdown(wait=True)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the http requests of the :class:`AssignmentService`.
+    """
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/metrics":
+            self.send_json(200, service.metrics.summary())
+        elif self.path == "/airports":
+            self.send_json(200, service.airports.paths())
+        else:
+            self.send_json(404, {"error": "Unknown path '{}'.".format(self.path)})
+
+    def do_POST(self):
+        if self.path != "/assign":
+            self.send_json(404, {"error": "Unknown path '{}'.".format(self.path)})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+        except ValueError as e:
+            self.send_json(400, {"error": "Invalid json: {}".format(e)})
+            return
+
+        try:
+            self.send_json(200, self.server.service.assign(request))
+        except ServiceBusyError as e:
+            self.send_json(503, {"error": str(e)})
+        except RequestError as e:
+            self.send_json(400, {"error": str(e)})
+        except Exception as e:
+            self.send_json(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        # Don't log every request to stderr.
+        pass
+
+
+def create_server(service, port=8441, host="127.0.0.1"):
+    """
+    Creates the http server of a service. Call ``serve_forever()`` on the server to start
+    handling requests.
+
+    :param AssignmentService service: Service handling the requests.
+    :param int port: Port to listen on. Use 0 to pick a free port.
+    :param string host: Address to listen on. Defaults to localhost only.
+    :return: Http server.
+    :rtype: http.server.ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.service = service
+    return server
+
+
+def create_parser():
+    """
+    :return: Parser of the command line arguments.
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="ooc-serve", description="Serves the bay and gate assignment over http.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("-p", "--port", type=int, default=8441, help="Port to listen on.")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Maximum number of requests solved at the same time.")
+    parser.add_argument("--max-queue", type=int, default=16,
+                        help="Maximum number of requests waiting for a worker. Other requests are rejected.")
+    parser.add_argument("--backend", choices=["cplex", "cplex-session", "scipy"], default="cplex",
+                        help="Solver used to solve the lp files.")
+    parser.add_argument("--cplex-command", default="cplex",
+                        help="Terminal command to access the cplex interactive solver.")
+    parser.add_argument("--workspace", default="service",
+                        help="Directory in which the workspaces of the requests are created.")
+    parser.add_argument("--keep-workspaces", action="store_true", help="Keep the workspaces of the requests.")
+    return parser
+
+
+def create_lp_solver(args):
+    """
+    :param argparse.Namespace args: Parsed command line arguments.
+    :return: Solver used to solve the lp files of all requests.
+    """
+    if args.backend == "scipy":
+        from ooc.lp_solvers import ScipySolver
+        return ScipySolver()
+    if args.backend == "cplex-session":
+        from ooc.cplex_session import CplexSessionPool
+        return CplexSessionPool(args.cplex_command, size=args.workers)
+    from ooc.lp_solvers import CplexSolver
+    return CplexSolver(args.cplex_command)
+
+
+def main(argv=None):
+    """
+    Entry point of the 'ooc-serve' command. Serves requests until it's interrupted.
+
+    :param list argv: Command line arguments. Defaults to ``sys.argv[1:]``.
+    :return: Exit code.
+    :rtype: int
+    """
+    args = create_parser().parse_args(argv)
+    lp_solver = create_lp_solver(args)
+    service = AssignmentService(args.workspace, lp_solver, workers=args.workers, max_queue=args.max_queue,
+                                keep_workspaces=args.keep_workspaces)
+    server = create_server(service, port=args.port, host=args.host)
+    pr_g("Listening on http://{}:{}".format(*server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if hasattr(lp_solver, "close"):
+            lp_solver.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
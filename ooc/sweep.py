@@ -0,0 +1,187 @@
+"""
+The functions in here run the bay and gate assignment for multiple combinations of parameters,
+eg. different buffer times and spare bays, and compare the results. The airport and flight data
+are only parsed once. The combinations are run in forked worker processes which share the
+parsed data copy-on-write.
+"""
+
+import copy
+import multiprocessing
+from collections import namedtuple
+from datetime import timedelta
+from itertools import product
+from os import makedirs
+from os.path import join
+
+from ooc import Airport, Flights, BayGateSolver
+
+
+SweepResultType = namedtuple("SweepResultType", ("run",
+                                                 "buffer_time",
+                                                 "spare_bays",
+                                                 "bay_objective",
+                                                 "gate_objective",
+                                                 "towings",
+                                                 "remote",
+                                                 "timings",
+                                                 "error"))
+"""
+Named tuple holding the results of a single parameter combination. ``towings`` is the number of
+times long stay aircraft are moved to another bay, ``remote`` the number of flights on remote
+bays and ``timings`` the timings dictionary of :class:`ooc.BayGateSolver`. If the run failed
+``error`` holds the error message and the other results are ``None``.
+"""
+
+_flights = None
+"""
+Flights object shared with the worker processes. It's set before the workers are forked.
+"""
+
+_options = None
+"""
+Dictionary with the options shared with the worker processes.
+"""
+
+
+def towings(solver):
+    """
+    :param ooc.BayGateSolver solver: Solver with the bay assignment solution loaded in.
+    :return: Number of times long stay aircraft are towed to another bay.
+    :rtype: int
+    """
+    bays = [solution.bay_idx for solution in solver.solutions]
+    n = 0
+    for group in solver.flights.groups:
+        n += sum(bays[i] != bays[j] for i, j in zip(group.flight_idx, group.flight_idx[1:]))
+    return n
+
+
+def remote_usage(solver):
+    """
+    :param ooc.BayGateSolver solver: Solver with the bay assignment solution loaded in.
+    :return: Number of flights assigned to remote bays.
+    :rtype: int
+    """
+    return sum(solution.bay_idx in solver.airport.remote_bays for solution in solver.solutions)
+
+
+def run_combination(run, buffer_time, spare_bays):
+    """
+    Runs the bay and gate assignment for a single parameter combination. This is the function
+    run by the workers.
+
+    :param int run: Index of the combination. The workspace of the run is named after it.
+    :param datetime.timedelta buffer_time: Buffer time.
+    :param tuple spare_bays: Names of the spare bays.
+    :return: Results of the run.
+    :rtype: SweepResultType
+    """
+    # Work on a shallow copy, so the shared schedule and airport data are not copied.
+    flights = copy.copy(_flights)
+    flights.buffer_time = buffer_time
+    flights.spare_bays = []
+    for bay_name in spare_bays:
+        if bay_name not in flights.airport.bay_names:
+            return SweepResultType(run, buffer_time, spare_bays, None, None, None, None, None,
+                                   "Spare bay '{}' is invalid.".format(bay_name))
+        flights.spare_bays.append(flights.airport.bay_names.index(bay_name))
+
+    try:
+        solver = BayGateSolver.from_flights(flights, join(_options["jid"], "run_{}".format(run)),
+                                            cplex_command=_options["cplex_command"],
+                                            lp_solver=_options["lp_solver"])
+        solver.solve_bay_assignment(decompose=_options["decompose"], processes=1)
+        solver.load_bay_assignment_solution()
+        solver.solve_gate_assignment(decompose=_options["decompose"], processes=1)
+        solver.load_gate_assignment_solution()
+        solver.save_csv()
+
+        return SweepResultType(run=run,
+                               buffer_time=buffer_time,
+                               spare_bays=spare_bays,
+                               bay_objective=solver.objective_value("bay"),
+                               gate_objective=solver.objective_value("gate"),
+                               towings=towings(solver),
+                               remote=remote_usage(solver),
+                               timings=solver.timings,
+                               error=None)
+    except Exception as e:
+        return SweepResultType(run, buffer_time, spare_bays, None, None, None, None, None, str(e))
+
+
+def sweep(airport_data_path, flights_data_path, jid, buffer_times=(timedelta(0),), spare_bay_sets=((),),
+          lp_solver=None, cplex_command="cplex", decompose=False, processes=None):
+    """
+    Runs the bay and gate assignment for all combinations of buffer times and spare bays.
+
+    :param string airport_data_path: Path to directory holding the airport data.
+    :param string flights_data_path: Path to directory holding the flights data.
+    :param string jid: Job id. The workspace of each run is created in this directory.
+    :param buffer_times: Iterable with the buffer times (datetime.timedelta) to run.
+    :param spare_bay_sets: Iterable with the sets of spare bay names to run.
+    :param lp_solver: Optional solver used to solve the lp files, see :class:`ooc.BayGateSolver`.
+    :param string cplex_command: Terminal command to access the cplex interactive solver.
+    :param bool decompose: True to split the problems in independent components.
+    :param int processes: Maximum number of worker processes. Defaults to the number of processors.
+    :return: List with the results of each combination.
+    :rtype: list
+    """
+    global _flights, _options
+
+    airport = Airport(airport_data_path)
+    _flights = Flights(flights_data_path, airport)
+    _options = {"jid": jid,
+                "cplex_command": cplex_command,
+                "lp_solver": lp_solver,
+                "decompose": decompose}
+
+    # The workspaces of the runs are created inside the sweep's directory.
+    makedirs(jid, exist_ok=True)
+
+    combinations = [(run, buffer_time, tuple(spare_bays)) for run, (buffer_time, spare_bays)
+                    in enumerate(product(buffer_times, spare_bay_sets))]
+
+    try:
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            # Forking is not available on this platform, so run the combinations one by one.
+            context = None
+
+        if context is None or processes == 1 or len(combinations) == 1:
+            return [run_combination(*combination) for combination in combinations]
+
+        with context.Pool(processes) as pool:
+            return pool.starmap(run_combination, combinations)
+    finally:
+        _flights = None
+        _options = None
+
+
+def write_table(results, f):
+    """
+    Writes a table comparing the results of a sweep.
+
+    :param list results: List with the results returned by :func:`sweep`.
+    :param f: Text file like object.
+    """
+    f.write("{:>4s} {:>7s} {:20s} {:>16s} {:>14s} {:>7s} {:>6s} {:>9s} {:>9s} {:>9s} {:>9s}\n".format(
+        "run", "buffer", "spare bays", "bay objective", "gate objective", "towings", "remote",
+        "bay code", "bay solve", "gate code", "gate solve"))
+    for result in results:
+        head = "{:>4d} {:>7s} {:20s} ".format(result.run,
+                                              "{:.0f}m".format(result.buffer_time.total_seconds() / 60),
+                                              ";".join(result.spare_bays) or "-")
+        if result.error is not None:
+            f.write(head + "error: {}\n".format(result.error))
+            continue
+
+        f.write(head + "{:>16.4f} {:>14.4f} {:>7d} {:>6d} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f}\n".format(
+            result.bay_objective,
+            result.gate_objective,
+            result.towings,
+            result.remote,
+            result.timings.get("bay_code_generation", 0),
+            result.timings.get("bay_solving", 0),
+            result.timings.get("gate_code_generation", 0),
+            result.timings.get("gate_solving", 0)))
@@ -0,0 +1,327 @@
+"""
+The functions in here generate synthetic airports and flight schedules. They write the same csv
+files as the real airport and schedule data, so they can be loaded in by :class:`ooc.Airport` and
+:class:`ooc.Flights`. They are used to test and benchmark how the code scales with the size of the
+airport and schedule.
+"""
+
+import json
+import random
+from collections import namedtuple
+from datetime import date
+from os import makedirs
+from os.path import join
+
+
+SyntheticAirportType = namedtuple("SyntheticAirportType", ("path",
+                                                           "bay_names",
+                                                           "gate_names",
+                                                           "groups",
+                                                           "bay_groups",
+                                                           "aircraft",
+                                                           "airlines",
+                                                           "domestic_airports",
+                                                           "international_airports"))
+"""
+Named tuple holding the information of a generated airport that is needed to generate schedules for it.
+"""
+
+
+def group_names(n_groups):
+    """
+    :param int n_groups: Number of aircraft groups.
+    :return: List with the aircraft group names sorted from the largest to the smallest aircraft, eg.
+       ['H', 'G', ..., 'A'].
+    """
+    if not 0 < n_groups <= 26:
+        raise Exception("The number of aircraft groups must be between 1 and 26.")
+    return [chr(ord("A") + x) for x in reversed(range(n_groups))]
+
+
+def generate_airport(path, n_bays=47, n_gates=23, n_remote_bays=22, n_groups=8, n_terminals=3,
+                     n_airlines=20, n_domestic_gates=3, n_adjacent_pairs=2, seed=0):
+    """
+    Generates a synthetic airport and writes it's data files to a directory.
+
+    The contact bays are placed along a line next to the gates. Each contact bay is
+    connected to the closest gate. Remote bays are far away from all gates and terminals.
+    Each bay is compliant with all aircraft groups up to a random maximum size.
+
+    :param string path: Path to the directory the csv files will be written to. It's created
+       if it doesn't exist.
+    :param int n_bays: Total number of bays.
+    :param int n_gates: Number of gates.
+    :param int n_remote_bays: Number of remote bays. These are included in ``n_bays``.
+    :param int n_groups: Number of aircraft (compliance) groups.
+    :param int n_terminals: Number of international terminals. A domestic terminal 'D' is always added.
+    :param int n_airlines: Number of airlines. The first airline is always 'KQ'.
+    :param int n_domestic_gates: Number of domestic gates.
+    :param int n_adjacent_pairs: Number of pairs of adjacent contact bays.
+    :param int seed: Seed of the random number generator.
+    :return: Information about the generated airport.
+    :rtype: SyntheticAirportType
+    """
+    if n_remote_bays >= n_bays:
+        raise Exception("There must be at least one contact bay.")
+    if not 0 < n_domestic_gates < n_gates:
+        raise Exception("There must be at least one domestic and one international gate.")
+    if not 0 < n_terminals < 26:
+        raise Exception("The number of terminals must be between 1 and 25.")
+
+    rng = random.Random(seed)
+    makedirs(path, exist_ok=True)
+
+    groups = group_names(n_groups)
+    n_contact_bays = n_bays - n_remote_bays
+    bay_names = ["C{}".format(k + 1) for k in range(n_contact_bays)] + \
+                ["R{}".format(k + 1) for k in range(n_remote_bays)]
+    gate_names = [str(l + 1) for l in range(n_gates)]
+    terminal_names = [chr(ord("A") + x) for x in range(n_terminals)]
+    if "D" in terminal_names:
+        terminal_names.remove("D")
+        terminal_names.append(chr(ord("A") + n_terminals))
+    terminal_names.append("D")
+
+    # The largest group a bay is compliant with. It's compliant with all smaller groups as well.
+    # Make sure the largest group fits on at least one bay.
+    bay_groups = [rng.randrange(n_groups) for _ in range(n_bays)]
+    bay_groups[rng.randrange(n_bays)] = 0
+
+    # Aircraft types. One or two types per group. The number of passengers increases with the size.
+    aircraft = []
+    for g, group in enumerate(groups):
+        base = 50 + 600 * (n_groups - g) // n_groups
+        for x in range(rng.randint(1, 2)):
+            aircraft.append(("AC{}{}".format(group, x), group, base + rng.randrange(40)))
+
+    # Airlines.
+    airlines = ["KQ"]
+    while len(airlines) < n_airlines:
+        code = rng.choice("ABCDEFGHIJLMNOPRSTUVWXYZ") + rng.choice("ABCDEFGHIJLMNOPRSTUVWXYZ0123456789")
+        if code not in airlines:
+            airlines.append(code)
+
+    domestic_airports = ["D{:02}".format(x) for x in range(10)]
+    international_airports = ["I{:02}".format(x) for x in range(40)]
+
+    # Positions along the terminal building. The gates are spread evenly and the contact bays too.
+    gate_positions = [50.0 * l for l in range(n_gates)]
+    contact_positions = [50.0 * n_gates * k / n_contact_bays for k in range(n_contact_bays)]
+    terminal_positions = [50.0 * n_gates * (t + 0.5) / len(terminal_names) for t in range(len(terminal_names))]
+    remote_distance = 50.0 * n_gates + 500
+
+    with open(join(path, "aircraft.csv"), "w") as f:
+        f.write("ac_type, group, n_passengers\n")
+        for ac_type, group, n_passengers in aircraft:
+            f.write("{}, {}, {}\n".format(ac_type, group, n_passengers))
+
+    with open(join(path, "airlines.csv"), "w") as f:
+        f.write("airline, group, terminal\n")
+        for airline in airlines:
+            f.write("{}, 999, {}\n".format(airline, rng.choice(terminal_names[:-1])))
+
+    with open(join(path, "bay_compliance_matrix.csv"), "w") as f:
+        f.write("bay, {}\n".format(", ".join(groups)))
+        for bay_name, bay_group in zip(bay_names, bay_groups):
+            f.write("{}, {}\n".format(bay_name, ", ".join("1" if g >= bay_group else "0" for g in range(n_groups))))
+
+    with open(join(path, "bay_terminal_distance.csv"), "w") as f:
+        f.write("bay, {}\n".format(", ".join(terminal_names)))
+        for k, bay_name in enumerate(bay_names):
+            if k < n_contact_bays:
+                distances = [abs(contact_positions[k] - position) for position in terminal_positions]
+            else:
+                distances = [remote_distance + 10 * (k - n_contact_bays)] * len(terminal_names)
+            f.write("{}, {}\n".format(bay_name, ", ".join("{:.0f}".format(d) for d in distances)))
+
+    with open(join(path, "bay_gate_distance.csv"), "w") as f:
+        f.write("bay, {}\n".format(", ".join(gate_names)))
+        for k, bay_name in enumerate(bay_names):
+            if k < n_contact_bays:
+                # Snap the contact bay to it's closest gate, so it's directly connected to it.
+                closest = min(range(n_gates), key=lambda l: abs(gate_positions[l] - contact_positions[k]))
+                distances = [abs(gate_positions[closest] - position) for position in gate_positions]
+            else:
+                distances = [remote_distance] * n_gates
+            f.write("{}, {}\n".format(bay_name, ", ".join("{:.0f}".format(d) for d in distances)))
+
+    with open(join(path, "fueling.csv"), "w") as f:
+        f.write("bay, fueling\n")
+        for k, bay_name in enumerate(bay_names):
+            fueling = 1 if (k < n_contact_bays or rng.random() < 0.5) else 0
+            f.write("{}, {}\n".format(bay_name, fueling))
+
+    with open(join(path, "adjacency.csv"), "w") as f:
+        f.write("bay_1, bay_2\n")
+        for k in rng.sample(range(n_contact_bays - 1), min(n_adjacent_pairs, n_contact_bays - 1)):
+            f.write("{}, {}\n".format(bay_names[k], bay_names[k + 1]))
+
+    with open(join(path, "remote_bays.csv"), "w") as f:
+        f.writelines(bay_name + "\n" for bay_name in bay_names[n_contact_bays:])
+
+    with open(join(path, "domestic_airports.csv"), "w") as f:
+        f.writelines(airport + "\n" for airport in domestic_airports)
+
+    with open(join(path, "domestic_gates.csv"), "w") as f:
+        f.writelines(gate_name + "\n" for gate_name in gate_names[:n_domestic_gates])
+
+    with open(join(path, "bussing_gates.csv"), "w") as f:
+        f.writelines(gate_name + "\n" for gate_name in gate_names[-2:])
+
+    return SyntheticAirportType(path=path,
+                                bay_names=bay_names,
+                                gate_names=gate_names,
+                                groups=groups,
+                                bay_groups=bay_groups,
+                                aircraft=aircraft,
+                                airlines=airlines,
+                                domestic_airports=domestic_airports,
+                                international_airports=international_airports)
+
+
+def minutes_to_str(minutes):
+    """
+    :param int minutes: Minutes since midnight. Values outside of the day wrap around.
+    :return: Time as a 'HH:MM' string.
+    """
+    minutes %= 24 * 60
+    return "{}:{:02}".format(minutes // 60, minutes % 60)
+
+
+def generate_schedule(path, airport, n_flights=100, schedule_date=date(2015, 6, 2), long_stay_fraction=0.15,
+                      overnight_fraction=0.3, domestic_fraction=0.3, preference_fraction=0.2, seed=0):
+    """
+    Generates a synthetic flight schedule for an airport generated with :func:`generate_airport` and
+    writes it to a directory.
+
+    A part of the aircraft are long stay flights, which are split in an arrival, parking and
+    departure flight. Some of these and some full flights are overnight flights, ie. they arrived
+    the previous day. The current location of all overnight long stay flights is written to
+    current.csv. Each of them is parked at a different compliant bay.
+
+    :param string path: Path to the directory the csv files will be written to. It's created
+       if it doesn't exist.
+    :param SyntheticAirportType airport: Airport information returned by :func:`generate_airport`.
+    :param int n_flights: Approximate number of flights (rows) in the schedule.
+    :param datetime.date schedule_date: Date of the schedule.
+    :param float long_stay_fraction: Fraction of the aircraft that are long stay, split flights.
+    :param float overnight_fraction: Fraction of the long stay flights that stayed overnight.
+    :param float domestic_fraction: Fraction of domestic flights.
+    :param float preference_fraction: Fraction of the flights with a bay and gate preference.
+    :param int seed: Seed of the random number generator.
+    :return: Number of flights in the schedule.
+    :rtype: int
+    """
+    rng = random.Random(seed)
+    makedirs(path, exist_ok=True)
+
+    n_groups = len(airport.groups)
+    day = 24 * 60
+
+    # Bays that can be used as the current location of overnight flights per aircraft group index.
+    free_current_bays = [[k for k, bay_group in enumerate(airport.bay_groups) if g >= bay_group]
+                         for g in range(n_groups)]
+    for bays in free_current_bays:
+        rng.shuffle(bays)
+    used_current_bays = set()
+
+    rows = []
+    current = []
+    preferences = []
+    flight_numbers = set()
+
+    def flight_number(airline):
+        while True:
+            number = "{}{}".format(airline, rng.randrange(100, 10000))
+            if number not in flight_numbers:
+                flight_numbers.add(number)
+                return number
+
+    while len(rows) < n_flights:
+        airline = rng.choice(airport.airlines)
+        ac_type, group, _ = rng.choice(airport.aircraft)
+        g = airport.groups.index(group)
+        domestic = rng.random() < domestic_fraction
+        airports = airport.domestic_airports if domestic else airport.international_airports
+        origin = rng.choice(airports)
+        dest = rng.choice(airports)
+        reg_no = "5Y{}".format(rng.randrange(100, 1000))
+        in_flight_no = flight_number(airline)
+        out_flight_no = flight_number(airline)
+
+        if rng.random() < long_stay_fraction and n_flights - len(rows) >= 3:
+            # Long stay flight split in an arrival, parking and departure flight.
+            overnight = rng.random() < overnight_fraction
+            arr_duration = rng.randint(40, 90)
+            park_duration = rng.randint(180, 600)
+            dep_duration = rng.randint(40, 90)
+
+            # Overnight flights that arrived the previous day, but are still at the airport
+            # in the morning. Their location is known.
+            current_bay = None
+            if overnight:
+                while free_current_bays[g] and current_bay is None:
+                    k = free_current_bays[g].pop()
+                    if k not in used_current_bays:
+                        current_bay = k
+                        used_current_bays.add(k)
+                overnight = current_bay is not None
+
+            if overnight:
+                # Midnight has to fall within the parking flight. Otherwise it can't be
+                # detected as an overnight flight, since the schedule only holds the times.
+                eta = rng.randint(day - 300, day - arr_duration - 30)
+                park_duration = max(park_duration, day - eta - arr_duration + rng.randint(30, 300))
+            else:
+                eta = rng.randint(0, day - arr_duration - park_duration - dep_duration - 30)
+
+            arr_etd = eta + arr_duration
+            park_eta = arr_etd + 6
+            park_etd = park_eta + park_duration
+            dep_eta = park_etd + 6
+            dep_etd = dep_eta + dep_duration
+
+            rows.append(("Arr", in_flight_no, origin, eta, reg_no, "", dest, arr_etd, ac_type))
+            rows.append(("Park", "", origin, park_eta, reg_no, "", dest, park_etd, ac_type))
+            rows.append(("Dep", "", origin, dep_eta, reg_no, out_flight_no, dest, dep_etd, ac_type))
+
+            if overnight:
+                current.append((in_flight_no, airport.bay_names[current_bay]))
+        else:
+            # Full flight.
+            duration = rng.randint(45, 150)
+            eta = rng.randint(0, day - 1)
+            if eta + duration >= day and rng.random() > overnight_fraction:
+                # Only keep a part of the flights wrapping around midnight as overnight flights.
+                eta = day - duration - 1
+            rows.append(("Full", in_flight_no, origin, eta, reg_no, out_flight_no, dest, eta + duration, ac_type))
+
+        if rng.random() < preference_fraction:
+            bays = [k for k, bay_group in enumerate(airport.bay_groups) if g >= bay_group]
+            preferences.append((out_flight_no,
+                                dest,
+                                ";".join(airport.bay_names[k] for k in rng.sample(bays, min(2, len(bays)))),
+                                ";".join(rng.sample(airport.gate_names, 2))))
+
+    with open(join(path, "config.json"), "w") as f:
+        json.dump({"date": schedule_date.strftime("%Y %m %d")}, f, indent=2)
+
+    with open(join(path, "flight_schedule.csv"), "w") as f:
+        f.write("flight_type,in_flight_no,origin,eta,bay,gate,reg_no,out_flight_no,dest,etd,ac_type\n")
+        for flight_type, in_flight_no, origin, eta, reg_no, out_flight_no, dest, etd, ac_type in rows:
+            f.write("{},{},{},{},,,{},{},{},{},{}\n".format(flight_type, in_flight_no, origin,
+                                                            minutes_to_str(eta), reg_no, out_flight_no,
+                                                            dest, minutes_to_str(etd), ac_type))
+
+    with open(join(path, "preferences.csv"), "w") as f:
+        f.write("flight, dest, bays, gates\n")
+        for preference in preferences:
+            f.write("{},{},{},{}\n".format(*preference))
+
+    with open(join(path, "current.csv"), "w") as f:
+        f.write("flight, bay\n")
+        for flight_no, bay_name in current:
+            f.write("{}, {}\n".format(flight_no, bay_name))
+
+    return len(rows)
+
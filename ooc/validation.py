@@ -0,0 +1,146 @@
+"""
+The functions in here check a complete bay and gate assignment against the hard rules encoded
+in the lp code generated by :class:`ooc.BayAssignment` and :class:`ooc.GateAssignment`. Soft
+constraints, eg. towings, adjacent bays and gate time conflicts, are not checked.
+"""
+
+from collections import namedtuple
+from datetime import datetime, time
+
+from ooc import ft, GateAssignment
+from ooc.decomposition import time_conflicting_pairs
+
+
+ViolationType = namedtuple("ViolationType", ("rule", "flights", "bay", "gate", "message"))
+"""
+Named tuple holding a single rule violation. ``rule`` is the name of the violated rule,
+``flights`` a tuple with the indices of the flights involved and ``bay`` and ``gate`` the
+indices of the bay and gate involved, or ``None``.
+"""
+
+rules = ["unassigned_bay",
+         "compliance",
+         "time_slot",
+         "fueling",
+         "overnight",
+         "unassigned_gate",
+         "domestic_gate",
+         "bay_gate",
+         "terminal_a"]
+"""
+Names of the rules checked by :func:`validate` in the order they are checked.
+"""
+
+
+def fueling_bays(flights, i):
+    """
+    Returns the flights of which at least one has to be on a bay with fueling pits, following
+    :meth:`ooc.BayAssignment.constraint_fueling`. Departing non-domestic and full domestic
+    flights have to be fueled at their own bay. Long stay domestic flights can be fueled at
+    the parking or the departure bay.
+
+    :param ooc.Flights flights: Flights object.
+    :param int i: Flight index
+    :return: Tuple with the flight indices, or an empty tuple if the flight does not need fueling.
+    """
+    if not flights.departing(i):
+        return ()
+    if not flights.domestic(i) or flights.flight_schedule[i].flight_type == ft.Full:
+        return i,
+    return i - 1, i
+
+
+def validate(solutions, check_gates=None):
+    """
+    Checks a loaded bay and gate assignment. The rules checked are
+
+     - every flight has a bay (``unassigned_bay``),
+     - the bays are compliant with the aircraft and are not spare bays (``compliance``),
+     - no two time conflicting flights share a bay (``time_slot``),
+     - departing flights are fueled (``fueling``),
+     - overnight long stay flights arrive at their current bay (``overnight``),
+     - every departing flight has a gate (``unassigned_gate``),
+     - domestic flights only use domestic gates and international flights never (``domestic_gate``),
+     - the gate can be reached from the bay (``bay_gate``),
+     - KQ flights departing after 18:00 use terminal A gates (``terminal_a``).
+
+    The time conflicts are found with a sweep line over the flights of each bay.
+
+    :param list solutions: List of :class:`ooc.FlightSolution` objects, eg.
+       :attr:`ooc.BayGateSolver.solutions`.
+    :param bool check_gates: True to check the gate assignment. By default the gates are only
+       checked if a gate assignment has been loaded.
+    :return: List with the violations.
+    :rtype: list
+    """
+    violations = []
+    if not solutions:
+        return violations
+
+    flights = solutions[0].flights
+    airport = flights.airport
+    bays = [solution.bay_idx for solution in solutions]
+
+    # Bay assignment.
+    flights_per_bay = {}
+    for i, k in enumerate(bays):
+        if k is None:
+            violations.append(ViolationType("unassigned_bay", (i,), None, None,
+                                            "Flight {} has no bay assigned to it.".format(i)))
+            continue
+        flights_per_bay.setdefault(k, []).append(i)
+        if not flights.bay_compliance(i, k):
+            violations.append(ViolationType("compliance", (i,), k, None,
+                                            "Flight {} is not compliant with bay {}.".format(i, airport.bay_names[k])))
+
+    for k, flight_idx in sorted(flights_per_bay.items()):
+        for i, j in sorted(time_conflicting_pairs(flights, flight_idx)):
+            violations.append(ViolationType("time_slot", (i, j), k, None,
+                                            "Flights {} and {} are both at bay {} at the same time.".format(
+                                                i, j, airport.bay_names[k])))
+
+    for i in range(flights.n_flights):
+        fueled = fueling_bays(flights, i)
+        if fueled and not any(bays[j] is not None and airport.fueling[bays[j]] for j in fueled):
+            violations.append(ViolationType("fueling", fueled, bays[i], None,
+                                            "Flight {} is not at a bay with fueling pits.".format(i)))
+
+        flight = flights.flight_schedule[i]
+        if flight.flight_type == ft.Arr and flights.is_overnight(i) and flight.current is not None and \
+                bays[i] != flight.current.bay:
+            violations.append(ViolationType("overnight", (i,), bays[i], None,
+                                            "Overnight flight {} is not at it's current bay {}.".format(
+                                                i, airport.bay_names[flight.current.bay])))
+
+    # Gate assignment.
+    if check_gates is None:
+        check_gates = any(solution.gate_idx is not None for solution in solutions)
+    if not check_gates:
+        return violations
+
+    terminal_a_gates = GateAssignment(flights, bays).terminal_a_gates
+    time_6pm = datetime.combine(flights.config['date'], time(hour=18))
+    for i, solution in enumerate(solutions):
+        if not flights.departing(i):
+            continue
+        l = solution.gate_idx
+        if l is None:
+            violations.append(ViolationType("unassigned_gate", (i,), bays[i], None,
+                                            "Flight {} has no gate assigned to it.".format(i)))
+            continue
+
+        gate_name = airport.gate_names[l]
+        if flights.domestic(i, departing=True) != (l in airport.domestic_gates):
+            violations.append(ViolationType("domestic_gate", (i,), bays[i], l,
+                                            "Flight {} can't use gate {}, since it's {}domestic.".format(
+                                                i, gate_name, "" if flights.domestic(i, departing=True) else "not ")))
+        if bays[i] is not None and airport.bay_gate_distance[bays[i]][l] is None:
+            violations.append(ViolationType("bay_gate", (i,), bays[i], l,
+                                            "Gate {} can't be reached from bay {}.".format(
+                                                gate_name, airport.bay_names[bays[i]])))
+        if not flights.domestic(i, departing=True) and flights.flight_schedule[i].etd >= time_6pm and \
+                flights.airline(i) == "KQ" and l not in terminal_a_gates:
+            message = "KQ flight {} departs after 18:00, but gate {} is not in terminal A.".format(i, gate_name)
+            violations.append(ViolationType("terminal_a", (i,), bays[i], l, message))
+
+    return violations
@@ -15,6 +15,9 @@ setup(
 
     install_requires=['numpy', 'scipy', 'recordclass'],
     packages=find_packages('.', exclude=["test"]),
+    entry_points={
+        'console_scripts': ['ooc-assign = ooc.cli:main', 'ooc-serve = ooc.service:main'],
+    },
 
     classifiers=[
         'Programming Language :: Python :: 3 :: Only',
@@ -0,0 +1,84 @@
+"""
+Scripted stand-in for the cplex interactive solver used by the cplex session tests. It
+supports the 'read', 'optimize', 'write', 'conflict', 'display conflict all', 'help' and 'quit'
+commands. It solves the lp files with :class:`ooc.lp_solvers.ScipySolver` and refines conflicts
+with :func:`ooc.conflicts.deletion_filter`.
+
+If the file given by the 'FAKE_CPLEX_CRASH' environment variable exists, it's removed and the
+process exits while optimizing, which simulates a crashed session. If the file given by the
+'FAKE_CPLEX_NO_LICENSE' environment variable exists, the process exits before the first prompt,
+which simulates cplex failing to start.
+"""
+
+import os
+import sys
+from os.path import abspath, dirname, join, isfile
+
+sys.path.append(join(dirname(abspath(__file__)), ".."))
+
+from ooc.lp_solvers import ScipySolver, read_lp
+from ooc.conflicts import deletion_filter, is_feasible
+
+
+def main():
+    lp_path = None
+    conflict = []
+    feasible = False
+    solver = ScipySolver()
+    crash_path = os.environ.get("FAKE_CPLEX_CRASH")
+    counter_path = os.environ.get("FAKE_CPLEX_STARTS")
+    if counter_path:
+        with open(counter_path, "a") as f:
+            f.write("start\n")
+    license_path = os.environ.get("FAKE_CPLEX_NO_LICENSE")
+    if license_path and isfile(license_path):
+        print("CPLEX Error  32201: No license found.")
+        sys.exit(1)
+
+    while True:
+        sys.stdout.write("CPLEX> ")
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            return
+        command, _, argument = line.strip().partition(" ")
+        if command == "quit":
+            return
+        elif command == "help":
+            print("read      read problem or advanced start information from a file")
+        elif command == "read":
+            if isfile(argument):
+                lp_path = argument
+                print("Problem '{}' read.".format(argument))
+            else:
+                print("CPLEX Error  1422: Could not open file '{}'.".format(argument))
+        elif command == "optimize":
+            if crash_path and isfile(crash_path):
+                os.remove(crash_path)
+                sys.exit(1)
+            with open(lp_path) as f:
+                model = read_lp(f.read())
+            feasible = is_feasible(model, list(range(len(model.rows))))
+            print("MIP - Integer optimal solution." if feasible else "MIP - Integer infeasible.")
+        elif command == "conflict":
+            with open(lp_path) as f:
+                model = read_lp(f.read())
+            conflict = [model.row_names[row] for row in deletion_filter(model)]
+            print("Minimal conflict:   {} linear constraint(s)".format(len(conflict)))
+        elif command == "display" and argument == "conflict all":
+            print("Minimize\n obj:\nSubject To")
+            for name in conflict:
+                print(" {}:  <= 1".format(name))
+            print("End")
+        elif command == "write":
+            if not feasible:
+                print("CPLEX Error  1217: No solution exists.")
+                continue
+            solver.solve(lp_path, argument)
+            print("Solution written to file '{}'.".format(argument))
+        else:
+            print("Command '{}' does not exist.".format(command))
+
+
+if __name__ == '__main__':
+    main()
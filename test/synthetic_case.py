@@ -0,0 +1,40 @@
+"""
+Base class for the tests running on a synthetic airport and flight schedule generated in a temporary directory.
+"""
+
+import unittest
+import os
+import tempfile
+
+from ooc.synthetic import generate_airport, generate_schedule
+
+
+class SyntheticTestCase(unittest.TestCase):
+    """
+    Generates a synthetic airport in ``airport_path`` and a flight schedule in ``flights_path`` inside
+    a temporary directory before each test. The tests are run from the temporary directory, because
+    the workspaces are created relative to the current working directory.
+
+    The keyword arguments passed to :func:`generate_airport` and :func:`generate_schedule` are given by
+    ``airport_args`` and ``schedule_args``. Nothing is generated if they are None.
+    """
+
+    airport_args = None
+    schedule_args = None
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.airport_path = os.path.join(self.directory.name, "airport")
+        self.flights_path = os.path.join(self.directory.name, "flights")
+        self.airport_info = None
+        if self.airport_args is not None:
+            self.airport_info = generate_airport(self.airport_path, **self.airport_args)
+            if self.schedule_args is not None:
+                generate_schedule(self.flights_path, self.airport_info, **self.schedule_args)
+
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
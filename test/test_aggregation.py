@@ -0,0 +1,146 @@
+"""
+These tests check the pooling of identical bays and gates and the aggregated assignment problems.
+"""
+
+import unittest
+import os
+
+from ooc import Airport, Flights, BayAssignment, GateAssignment, BayGateSolver
+from ooc.aggregation import group_resources, bay_pools, gate_pools, disaggregate
+from ooc.lp_solvers import ScipySolver
+
+from synthetic_case import SyntheticTestCase
+
+
+def copy_bay(path, source, targets):
+    """
+    Copies the row of a bay in an airport csv file to other bays.
+
+    :param string path: Path to the csv file.
+    :param string source: Name of the bay to copy.
+    :param list targets: Names of the bays to copy it to.
+    """
+    with open(path) as f:
+        lines = f.readlines()
+    row = next(line for line in lines if line.startswith(source + ","))
+    with open(path, "w") as f:
+        for line in lines:
+            name = line.split(",")[0]
+            f.write(name + row[len(source):] if name in targets else line)
+
+
+class TestAggregation(SyntheticTestCase):
+    airport_args = dict(n_bays=16, n_remote_bays=10, n_adjacent_pairs=0, seed=2)
+    schedule_args = dict(n_flights=60, long_stay_fraction=0.2, seed=2)
+
+    def setUp(self):
+        super().setUp()
+
+        # Make all remote bays identical and compliant with all aircraft, so there are more flights
+        # than contact bays.
+        compliance_path = os.path.join(self.airport_path, "bay_compliance_matrix.csv")
+        with open(compliance_path) as f:
+            lines = f.readlines()
+        with open(compliance_path, "w") as f:
+            for line in lines:
+                f.write("R1" + ", 1" * line.count(",") + "\n" if line.startswith("R1,") else line)
+        self.remote_bays = ["R{}".format(k + 1) for k in range(10)]
+        for name in ["bay_compliance_matrix", "bay_terminal_distance", "bay_gate_distance", "fueling"]:
+            copy_bay(os.path.join(self.airport_path, name + ".csv"), "R1", self.remote_bays[1:])
+
+    def test_group_resources(self):
+        self.assertEqual(group_resources(["a", "b", "a", "a", "b"], {3}), [[0, 2], [1, 4], [3]])
+
+    def test_bay_pools(self):
+        flights = Flights(self.flights_path, Airport(self.airport_path))
+        pools = bay_pools(flights)
+        self.assertEqual(sorted(k for pool in pools for k in pool), list(range(flights.airport.n_bays)))
+
+        # The current bays of overnight flights and the bays in preferences are never pooled with other bays.
+        pooled = [pool for pool in pools if len(pool) > 1]
+        self.assertEqual(len(pooled), 1)
+        names = {flights.airport.bay_names[k] for k in pooled[0]}
+        self.assertLess(names, set(self.remote_bays))
+        for flight in flights.flight_schedule:
+            if flight.current is not None:
+                self.assertNotIn(flights.airport.bay_names[flight.current.bay], names)
+
+    def test_lp_code(self):
+        flights = Flights(self.flights_path, Airport(self.airport_path))
+        pools = bay_pools(flights)
+        pool = next(pool for pool in pools if len(pool) > 1)
+
+        code = BayAssignment(flights, pools=pools).lp_code()
+        self.assertNotIn("X_0_{} ".format(pool[1]), code)
+        self.assertNotRegex(code, r"tc_\d+_\d+_{}:".format(pool[0]))
+        self.assertRegex(code, r"cc_{}_\d+:".format(pool[0]))
+
+        # Without pools the code is the same as before.
+        self.assertEqual(BayAssignment(flights, pools=[[k] for k in range(flights.airport.n_bays)]).lp_code(),
+                         BayAssignment(flights).lp_code())
+
+    def test_disaggregate(self):
+        flights = Flights(self.flights_path, Airport(self.airport_path))
+        pool = next(pool for pool in bay_pools(flights) if len(pool) > 1)
+        bays = disaggregate(flights, [pool], [pool[0]] * flights.n_flights)
+        self.assertTrue(set(bays) <= set(pool))
+
+    def test_solver(self):
+        plain = BayGateSolver(self.airport_path, self.flights_path, "plain", lp_solver=ScipySolver())
+        plain.solve_bay_assignment()
+        plain.load_bay_assignment_solution()
+
+        aggregated = BayGateSolver(self.airport_path, self.flights_path, "aggregated", lp_solver=ScipySolver())
+        aggregated.solve_bay_assignment(aggregate=True)
+        aggregated.load_bay_assignment_solution()
+        aggregated.solve_gate_assignment(aggregate=True)
+        aggregated.load_gate_assignment_solution()
+
+        self.assertTrue(os.path.isfile("aggregated/bay_pools.json"))
+        self.assertLess(os.path.getsize("aggregated/bay.lp"), os.path.getsize("plain/bay.lp"))
+        self.assertAlmostEqual(aggregated.objective_value("bay"), plain.objective_value("bay"))
+        self.assertEqual(aggregated.validate(), [])
+
+        # The flights are spread over the bays of the pool when the solution is loaded in again.
+        loaded = BayGateSolver(self.airport_path, self.flights_path, "aggregated", cplex_command=None)
+        loaded.load_bay_assignment_solution()
+        self.assertEqual([solution.bay for solution in loaded.solutions],
+                         [solution.bay for solution in aggregated.solutions])
+        self.assertGreater(len({solution.bay for solution in loaded.solutions} & set(self.remote_bays)), 1)
+
+        # Solving without aggregation removes the pools again.
+        aggregated.solve_bay_assignment()
+        self.assertFalse(os.path.isfile("aggregated/bay_pools.json"))
+
+    def test_gate_weights(self):
+        # Make gates 4 and 5 identical and connected to bay C1, so the flights at C1 prefer both of them.
+        path = os.path.join(self.airport_path, "bay_gate_distance.csv")
+        with open(path) as f:
+            rows = [line.rstrip("\n").split(",") for line in f]
+        for row in rows[1:]:
+            row[5] = row[4] = " 0" if row[0] == "C1" else row[4]
+        with open(path, "w") as f:
+            f.writelines(",".join(row) + "\n" for row in rows)
+
+        solver = BayGateSolver(self.airport_path, self.flights_path, "weights", lp_solver=ScipySolver())
+        solver.solve_bay_assignment()
+        solver.load_bay_assignment_solution()
+        bays = [solution.bay_idx for solution in solver.solutions]
+        gate_assignment = GateAssignment(solver.flights, bays)
+        pools = gate_pools(gate_assignment)
+        self.assertIn([3, 4], pools)
+
+        # The weights of the pooled problem differ, but the ones of the unpooled problem are used.
+        epsilon, eta = gate_assignment.weights()
+        self.assertNotEqual(GateAssignment(solver.flights, bays, pools=pools).weights(), (epsilon, eta))
+
+        solver.solve_gate_assignment()
+        plain = solver.objective_value("gate")
+        solver.solve_gate_assignment(aggregate=True)
+        with open(solver.gate_lp_path) as f:
+            self.assertIn(" -{:<20.4f}M_".format(eta), f.read())
+        self.assertAlmostEqual(solver.objective_value("gate"), plain, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ This test just runs the small flight schedule and print the results. It doesn't
 
 import unittest
 import os
+import tempfile
 
 from ooc import BayGateSolver
 
@@ -31,3 +32,25 @@ class TestBayGateSolver(unittest.TestCase):
         solver.load_gate_assignment_solution()
 
         solver.print_solution()
+
+    def test_charts(self):
+        solver = BayGateSolver(abs_path("./airport_data"),
+                               abs_path("./flight_data_small"), "test_case",
+                               cplex_command=None)
+        solver.load_bay_assignment_solution()
+        solver.load_gate_assignment_solution()
+
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in ["png", "svg"]:
+                bay_path = os.path.join(directory, "bay." + extension)
+                gate_path = os.path.join(directory, "gate." + extension)
+                bay_fig = solver.create_bay_assignment_chart("Bay assignment", bay_path)
+                gate_fig = solver.create_gate_assignment_chart("Gate assignment", gate_path)
+                self.assertTrue(os.path.getsize(bay_path) > 0)
+                self.assertTrue(os.path.getsize(gate_path) > 0)
+
+            # One LineCollection per color/linestyle combination.
+            n_lines = sum(len(collection.get_segments()) for collection in bay_fig.axes[0].collections)
+            self.assertEqual(n_lines, solver.flights.n_flights)
+            n_lines = sum(len(collection.get_segments()) for collection in gate_fig.axes[0].collections)
+            self.assertEqual(n_lines, sum(solution.gate_idx is not None for solution in solver.solutions))
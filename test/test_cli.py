@@ -0,0 +1,90 @@
+"""
+These tests check the command line interface solving a batch of flight schedules.
+"""
+
+import unittest
+import json
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+
+from ooc.cli import main, workspace_name
+from ooc.synthetic import generate_schedule
+
+from synthetic_case import SyntheticTestCase
+
+
+class TestCli(SyntheticTestCase):
+    airport_args = dict(n_bays=20, n_remote_bays=5, n_adjacent_pairs=0, seed=6)
+
+    def setUp(self):
+        super().setUp()
+        self.schedule_paths = []
+        for seed in range(2):
+            path = os.path.join(self.directory.name, "schedule_{}".format(seed))
+            generate_schedule(path, self.airport_info, n_flights=10, long_stay_fraction=0.2, seed=seed)
+            self.schedule_paths.append(path)
+
+    def run_main(self, *args):
+        output = StringIO()
+        with redirect_stdout(output):
+            code = main([self.airport_path] + list(args))
+        return code, output.getvalue()
+
+    def test_workspace_name(self):
+        self.assertEqual(workspace_name("data/schedule_2015_06_02/"), "workspace_2015_06_02")
+        self.assertEqual(workspace_name("day_1"), "workspace_day_1")
+
+    def test_batch(self):
+        code, output = self.run_main(*self.schedule_paths, "--backend", "scipy", "--no-plot", "--profile",
+                                     "-o", "out", "-j", "1", "-b", "15", "-q")
+        self.assertEqual(code, 0)
+        for seed in range(2):
+            workspace = os.path.join("out", "workspace_{}".format(seed))
+            self.assertTrue(os.path.isfile(os.path.join(workspace, "result.csv")))
+            self.assertFalse(os.path.isfile(os.path.join(workspace, "bay_assignment.png")))
+            with open(os.path.join(workspace, "profile.json")) as f:
+                profile = json.load(f)
+            self.assertIn("bay.solve", profile["stages"])
+            self.assertIn("gate_solving", profile["timings"])
+
+        # The stage timings are also printed as json.
+        lines = [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+        self.assertEqual([line["schedule"] for line in lines], self.schedule_paths)
+
+        # Load the existing solutions and create the charts.
+        code, _ = self.run_main(self.schedule_paths[0], "--backend", "none", "--load-only", "-o", "out", "-q")
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.isfile(os.path.join("out", "workspace_0", "bay_assignment.png")))
+
+    def test_absolute_output(self):
+        output_path = os.path.join(self.directory.name, "absolute")
+        os.mkdir("work")
+        os.chdir("work")
+        code, _ = self.run_main(self.schedule_paths[0], "--backend", "scipy", "--no-plot", "-q", "-o", output_path)
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.isfile(os.path.join(output_path, "workspace_0", "result.csv")))
+        self.assertEqual(os.listdir("."), [])
+
+    def test_failure(self):
+        # The other schedules are still solved if one fails.
+        code, output = self.run_main("missing", self.schedule_paths[0], "--backend", "scipy", "--no-plot", "-q")
+        self.assertEqual(code, 1)
+        self.assertIn("1 of 2 schedules failed", output)
+        self.assertTrue(os.path.isfile(os.path.join("workspace_0", "result.csv")))
+
+        # The pre-check skips schedules that can't be feasible, since all bays are spare bays.
+        spare_bays = ["C{}".format(k + 1) for k in range(15)] + ["R{}".format(k + 1) for k in range(5)]
+        code, output = self.run_main(self.schedule_paths[0], "--backend", "scipy", "--no-plot", "-q", "-o", "pre",
+                                     "--precheck", "-s", *spare_bays)
+        self.assertEqual(code, 1)
+        self.assertIn("has no compliant bay", output)
+        self.assertFalse(os.path.isfile(os.path.join("pre", "workspace_0", "bay.lp")))
+
+        with self.assertRaises(SystemExit):
+            with redirect_stdout(StringIO()):
+                main([self.airport_path, self.schedule_paths[0], "--backend", "gurobi"])
+
+
+if __name__ == '__main__':
+    unittest.main()
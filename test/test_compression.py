@@ -0,0 +1,72 @@
+"""
+These tests check the compression of the workspace files and reading them back in.
+"""
+
+import unittest
+import os
+
+from ooc import BayGateSolver
+from ooc.compression import open_file, compress_file
+from ooc.lp_solvers import ScipySolver
+
+from synthetic_case import SyntheticTestCase
+
+
+class TestCompression(SyntheticTestCase):
+    airport_args = dict(n_bays=20, n_remote_bays=5, n_adjacent_pairs=0, seed=2)
+    schedule_args = dict(n_flights=16, long_stay_fraction=0.2, seed=2)
+
+    def test_files(self):
+        with open_file("a.txt.gz", "w") as f:
+            f.write("Hello\n")
+        with open_file("a.txt.gz") as f:
+            self.assertEqual(f.read(), "Hello\n")
+
+        with open_file("b.txt", "w") as f:
+            f.write("World\n")
+        path = compress_file("b.txt")
+        self.assertEqual(path, "b.txt.gz")
+        self.assertFalse(os.path.isfile("b.txt"))
+        with open_file(path, "rb") as f:
+            self.assertEqual(f.read(), b"World\n")
+
+    def solve(self, jid, compress, decompose=False):
+        solver = BayGateSolver(self.airport_path, self.flights_path, jid, lp_solver=ScipySolver(), compress=compress)
+        solver.solve_bay_assignment(decompose=decompose, processes=1)
+        solver.load_bay_assignment_solution()
+        solver.solve_gate_assignment(decompose=decompose, processes=1)
+        solver.load_gate_assignment_solution()
+        return solver
+
+    def assignment(self, solver):
+        return [(solution.bay_idx, solution.gate_idx) for solution in solver.solutions]
+
+    def test_solver(self):
+        plain = self.solve("plain", False)
+        compressed = self.solve("compressed", True)
+        self.assertEqual(self.assignment(plain), self.assignment(compressed))
+        self.assertEqual(sorted(name for name in os.listdir("compressed") if not name.startswith(".")),
+                         ["bay.lp.gz", "bay.sol.gz", "gate.lp.gz", "gate.sol.gz"])
+        self.assertLess(os.path.getsize("compressed/bay.lp.gz"), os.path.getsize("plain/bay.lp"))
+        self.assertAlmostEqual(compressed.objective_value("bay"), plain.objective_value("bay"))
+
+        # The compressed solutions are read transparently.
+        loaded = BayGateSolver(self.airport_path, self.flights_path, "compressed", cplex_command=None)
+        loaded.load_bay_assignment_solution()
+        loaded.load_gate_assignment_solution()
+        self.assertEqual(self.assignment(loaded), self.assignment(plain))
+
+    def test_decomposed(self):
+        plain = self.solve("plain", False, decompose=True)
+        compressed = self.solve("compressed", True, decompose=True)
+        self.assertEqual(self.assignment(plain), self.assignment(compressed))
+        self.assertTrue(all(path.endswith(".sol.gz") for path in compressed.solution_paths("bay")))
+        self.assertEqual(len(compressed.solution_paths("bay")), len(plain.solution_paths("bay")))
+
+        # Solving again replaces the compressed solutions.
+        compressed.solve_bay_assignment(decompose=True, processes=1)
+        self.assertTrue(all(path.endswith(".sol") for path in compressed.solution_paths("bay")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+These tests check finding the constraints which make the bay assignment infeasible.
+"""
+
+import unittest
+import os
+import shlex
+import sys
+
+from ooc import Airport, Flights, BayAssignment, BayGateSolver, ft
+from ooc.conflicts import deletion_filter, parse_conflict, describe_row, refine_conflict, constraint_names
+from ooc.cplex_session import CplexSessionPool
+from ooc.lp_solvers import ScipySolver, InfeasibleError, read_lp
+
+from synthetic_case import SyntheticTestCase
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+fake_cplex_command = "{} {}".format(shlex.quote(sys.executable), shlex.quote(abs_path("fake_cplex.py")))
+
+
+class FailingSolver:
+    """
+    Solver that fails for another reason than the model being infeasible.
+    """
+
+    def solve(self, lp_path, sol_path):
+        raise Exception("The solver crashed.")
+
+
+class TestConflicts(SyntheticTestCase):
+    def setUp(self):
+        super().setUp()
+        self.airport = Airport(abs_path("./airport_data"))
+
+        # Only leave the bay compliant with most flights and the current bays of the overnight
+        # flights, so the bay assignment is infeasible.
+        flights = Flights(abs_path("./flight_data_small"), self.airport)
+        k = max(range(self.airport.n_bays),
+                key=lambda k: sum(flights.bay_compliance(i, k) for i in range(flights.n_flights)))
+        bays = {k} | {flight.current.bay for i, flight in enumerate(flights.flight_schedule)
+                      if flight.flight_type == ft.Arr and flights.is_overnight(i)}
+        self.spare_bays = [name for k, name in enumerate(self.airport.bay_names) if k not in bays]
+        self.flights = Flights(abs_path("./flight_data_small"), self.airport, spare_bays=self.spare_bays)
+
+        self.lp_path = os.path.join(self.directory.name, "bay.lp")
+        BayAssignment(self.flights).save_lp_file(self.lp_path)
+
+    def test_deletion_filter(self):
+        model = read_lp("Minimize\n x + y + z\nSubject To\n"
+                        " a: x + y >= 2\n b: z <= 1\n c: x + y <= 1\n d: y + z >= 1\n"
+                        "Binary\n x y z\nEnd\n")
+        self.assertEqual(deletion_filter(model), [0, 2])
+
+        model = read_lp("Minimize\n x\nSubject To\n a: x <= 1\nBinary\n x\nEnd\n")
+        with self.assertRaises(Exception):
+            deletion_filter(model)
+
+    def test_parse_conflict(self):
+        output = ("Minimize\n obj:\nSubject To\n tc_1_2_3: X_1_3 + X_2_3 <= 1\n"
+                  " bc_1:  X_1_3\n     + X_1_4 = 1\nBounds\n 0 <= X_1_3 <= 1\nBinaries\n X_1_3\nEnd\n")
+        self.assertEqual(parse_conflict(output), ["tc_1_2_3", "bc_1"])
+
+    def test_describe_row(self):
+        row = describe_row("tc_3_5_2", "bay", self.flights)
+        self.assertEqual((row.constraint, row.flights, row.bays, row.gates), ("single_time_slot", (3, 5), (2,), ()))
+        self.assertIn(self.airport.bay_names[2], row.message)
+
+        row = describe_row("tc_3_5_2", "gate", self.flights)
+        self.assertEqual((row.bays, row.gates), ((), (2,)))
+
+        group = self.flights.groups[self.flights.flight_group[5]].flight_idx
+        self.assertEqual(describe_row("sp_5_1", "bay", self.flights).flights, group)
+        self.assertEqual(describe_row("cc_4_7", "bay", self.flights)[1:4], ("capacity", (7,), (4,)))
+        self.assertIsNone(describe_row("xx_1", "bay", self.flights).constraint)
+        self.assertIsNone(describe_row("bc_a", "bay", self.flights).constraint)
+
+    def test_refine_conflict(self):
+        rows = refine_conflict(self.lp_path, "bay", self.flights)
+        self.assertGreater(len(rows), 1)
+        self.assertTrue(all(row.constraint in constraint_names.values() for row in rows))
+
+        # The conflict is infeasible on it's own, so there are more flights than bays.
+        flight_idx = {i for row in rows for i in row.flights}
+        self.assertGreater(len(flight_idx), 1)
+
+        # The cplex conflict refiner finds the same conflict.
+        cplex_rows = refine_conflict(self.lp_path, "bay", self.flights, cplex_command=fake_cplex_command)
+        self.assertEqual(cplex_rows, rows)
+
+    def test_solver(self):
+        solver = BayGateSolver(None, None, "conflict", flights=self.flights, lp_solver=ScipySolver(),
+                               refine_conflicts=True)
+        with self.assertRaisesRegex(Exception, "bay_conflict.txt"):
+            solver.solve_bay_assignment()
+
+        with open(os.path.join("conflict", "bay_conflict.txt")) as f:
+            report = f.read()
+        self.assertIn("bay.lp", report)
+        self.assertRegex(report, r"\n(bc|tc|fc)_[\d_]+ ")
+
+        # Without refining the conflict, the solver's exception is raised.
+        solver.refine_conflicts = False
+        with self.assertRaises(InfeasibleError):
+            solver.solve_bay_assignment()
+
+        # Other solver errors are raised as they are.
+        solver = BayGateSolver(None, None, "failing", flights=self.flights, lp_solver=FailingSolver(),
+                               refine_conflicts=True)
+        with self.assertRaisesRegex(Exception, "The solver crashed"):
+            solver.solve_bay_assignment()
+        self.assertFalse(os.path.isfile(os.path.join("failing", "bay_conflict.txt")))
+
+    def test_session_pool(self):
+        # The conflict refiner runs in the session the model was solved in.
+        with CplexSessionPool(fake_cplex_command, size=1, timeout=60) as pool:
+            solver = BayGateSolver(None, None, "pool", flights=self.flights, lp_solver=pool, refine_conflicts=True)
+            with self.assertRaisesRegex(Exception, "bay_conflict.txt") as context:
+                solver.solve_bay_assignment()
+            self.assertIsInstance(context.exception.__cause__, InfeasibleError)
+            self.assertEqual(len(pool.sessions), 1)
+            self.assertEqual(pool.n_restarts, 0)
+
+        with open(os.path.join("pool", "bay_conflict.txt")) as f:
+            self.assertRegex(f.read(), r"\n(bc|tc|fc)_[\d_]+ ")
+
+
+if __name__ == '__main__':
+    unittest.main()
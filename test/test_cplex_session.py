@@ -0,0 +1,165 @@
+"""
+These tests check solving the lp files in long running cplex sessions, using a fake cplex executable.
+"""
+
+import unittest
+import os
+import shlex
+import sys
+
+from ooc import BayGateSolver
+from ooc.cplex_session import CplexSession, CplexSessionPool, CplexSessionError
+from ooc.lp_solvers import ScipySolver, cplex_available
+
+from synthetic_case import SyntheticTestCase
+
+
+def abs_path(path):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+fake_cplex_command = "{} {}".format(shlex.quote(sys.executable), shlex.quote(abs_path("fake_cplex.py")))
+
+
+class TestCplexSession(SyntheticTestCase):
+    airport_args = dict(n_bays=20, n_remote_bays=5, n_adjacent_pairs=0, seed=4)
+    schedule_args = dict(n_flights=16, long_stay_fraction=0.2, seed=4)
+
+    def setUp(self):
+        super().setUp()
+        self.crash_path = os.path.join(self.directory.name, "crash")
+        self.starts_path = os.path.join(self.directory.name, "starts")
+        self.environ = dict(os.environ)
+        os.environ["FAKE_CPLEX_CRASH"] = self.crash_path
+        os.environ["FAKE_CPLEX_STARTS"] = self.starts_path
+        self.license_path = os.path.join(self.directory.name, "no_license")
+        os.environ["FAKE_CPLEX_NO_LICENSE"] = self.license_path
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        super().tearDown()
+
+    def n_starts(self):
+        with open(self.starts_path) as f:
+            return len(f.readlines())
+
+    def write_lp(self):
+        solver = BayGateSolver(self.airport_path, self.flights_path, "lp", lp_solver=ScipySolver())
+        solver.solve_bay_assignment()
+        os.rename(solver.bay_lp_path, "bay.lp")
+        os.rename(solver.bay_sol_path, "expected.sol")
+
+    def test_session(self):
+        self.write_lp()
+        session = CplexSession(fake_cplex_command, timeout=60)
+        session.start()
+        try:
+            self.assertTrue(session.ping())
+            session.solve("bay.lp", "bay_1.sol")
+            session.solve("bay.lp", "bay_2.sol")
+            self.assertEqual(session.n_solved, 2)
+            with open("bay_2.sol") as f, open("expected.sol") as g:
+                self.assertEqual(f.read(), g.read())
+
+            with self.assertRaises(Exception):
+                session.execute("read missing.lp")
+
+            # A crash is reported and the session can be restarted.
+            open(self.crash_path, "w").close()
+            with self.assertRaises(CplexSessionError):
+                session.solve("bay.lp", "bay_3.sol")
+            self.assertFalse(session.ping())
+            session.restart()
+            session.solve("bay.lp", "bay_3.sol")
+            self.assertEqual(self.n_starts(), 2)
+        finally:
+            session.close()
+        self.assertFalse(session.is_alive())
+
+    def test_pool_restart(self):
+        self.write_lp()
+        with CplexSessionPool(fake_cplex_command, size=1, timeout=60) as pool:
+            pool.solve("bay.lp", "bay_1.sol")
+
+            # The session crashes while solving, is restarted and the lp file is solved again.
+            open(self.crash_path, "w").close()
+            pool.solve("bay.lp", "bay_2.sol")
+            self.assertTrue(os.path.isfile("bay_2.sol"))
+            self.assertEqual(pool.n_restarts, 1)
+            self.assertEqual(len(pool.sessions), 1)
+        self.assertEqual(self.n_starts(), 2)
+        self.assertEqual(pool.sessions, [])
+
+    def test_pool_failed_restart(self):
+        self.write_lp()
+        with CplexSessionPool(fake_cplex_command, size=1, timeout=60) as pool:
+            pool.solve("bay.lp", "bay_1.sol")
+
+            # The session fails the health check and can't be restarted, so it's removed from the pool.
+            session = pool.sessions[0]
+            session.process.kill()
+            session.process.wait()
+            open(self.license_path, "w").close()
+            with self.assertRaises(CplexSessionError):
+                pool.solve("bay.lp", "bay_2.sol")
+            self.assertEqual(pool.sessions, [])
+            self.assertFalse(session.is_alive())
+
+            # Later solves start a new session instead of waiting for the removed one.
+            with self.assertRaises(CplexSessionError):
+                pool.solve("bay.lp", "bay_2.sol")
+            os.remove(self.license_path)
+            pool.solve("bay.lp", "bay_2.sol")
+            self.assertTrue(os.path.isfile("bay_2.sol"))
+            self.assertEqual(len(pool.sessions), 1)
+
+    def test_solver(self):
+        expected = BayGateSolver(self.airport_path, self.flights_path, "expected", lp_solver=ScipySolver())
+        expected.solve_bay_assignment(decompose=True, processes=1)
+        expected.load_bay_assignment_solution()
+
+        with CplexSessionPool(fake_cplex_command, size=2, timeout=60) as pool:
+            solver = BayGateSolver(self.airport_path, self.flights_path, "pool", lp_solver=pool)
+            solver.solve_bay_assignment(decompose=True)
+            solver.solve_bay_assignment(decompose=True)
+            solver.load_bay_assignment_solution()
+
+            # The sessions are reused, so at most two processes were started.
+            self.assertLessEqual(len(pool.sessions), 2)
+        self.assertLessEqual(self.n_starts(), 2)
+        self.assertEqual([solution.bay_idx for solution in solver.solutions],
+                         [solution.bay_idx for solution in expected.solutions])
+
+    def test_cplex_sessions(self):
+        with BayGateSolver(self.airport_path, self.flights_path, "sessions", cplex_command=fake_cplex_command,
+                           cplex_sessions=1) as solver:
+            pool = solver.lp_solver
+            self.assertIsInstance(pool, CplexSessionPool)
+            solver.solve_bay_assignment()
+            solver.solve_bay_assignment()
+            session = pool.sessions[0]
+            self.assertTrue(session.is_alive())
+
+        # The sessions started by the solver are closed with it, a pool passed in is left open.
+        self.assertFalse(session.is_alive())
+        self.assertEqual(pool.sessions, [])
+        self.assertEqual(self.n_starts(), 1)
+
+        with CplexSessionPool(fake_cplex_command, size=1, timeout=60) as pool:
+            BayGateSolver(self.airport_path, self.flights_path, "shared", lp_solver=pool).close()
+            self.assertFalse(pool.sessions)
+            self.write_lp()
+            pool.solve("bay.lp", "bay.sol")
+            self.assertTrue(pool.sessions[0].is_alive())
+
+    def test_cplex_available(self):
+        cplex_available.cache_clear()
+        self.assertTrue(cplex_available(fake_cplex_command))
+        self.assertTrue(cplex_available(fake_cplex_command))
+        self.assertEqual(cplex_available.cache_info().misses, 1)
+        self.assertEqual(cplex_available.cache_info().hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+These tests check splitting the bay and gate assignments into independent components and solving those separately.
+"""
+
+import unittest
+import os
+import xml.etree.ElementTree as ET
+
+from ooc import Airport, Flights, BayAssignment, GateAssignment, BayGateSolver, ft
+from ooc.decomposition import DisjointSet, bay_components, gate_components
+from ooc.lp_solvers import ScipySolver
+
+from synthetic_case import SyntheticTestCase
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+class TestDecomposition(SyntheticTestCase):
+    airport_args = dict(n_bays=20, n_remote_bays=5, n_adjacent_pairs=0, seed=2)
+    schedule_args = dict(n_flights=16, long_stay_fraction=0.2, seed=2)
+
+    def test_disjoint_set(self):
+        sets = DisjointSet(6)
+        sets.union(4, 1)
+        sets.union_all([2, 5, 4])
+        self.assertEqual(sets.sets(), [[0], [1, 2, 4, 5], [3]])
+
+    def test_bay_components(self):
+        flights = Flights(self.flights_path, Airport(self.airport_path))
+        components = bay_components(flights)
+        self.assertGreater(len(components), 1)
+        self.assertEqual(sorted(i for component in components for i in component), list(range(flights.n_flights)))
+
+        # Every constraint in the lp code of a component only holds flights of that component.
+        component_of = {i: c for c, component in enumerate(components) for i in component}
+        code = BayAssignment(flights).lp_code()
+        for line in code.split("\n"):
+            if line.startswith("tc_") or line.startswith("ad_"):
+                i, j = [int(x) for x in line.split(":")[0].split("_")[1:3]]
+                if line.startswith("ad_"):
+                    i, j = [int(x) for x in line.split(":")[0].split("_")[2:4]]
+                self.assertEqual(component_of[i], component_of[j])
+
+        # Long stay flights are in the same component.
+        for i, flight in enumerate(flights.flight_schedule):
+            if flight.flight_type == ft.Arr:
+                self.assertEqual(component_of[i], component_of[i + 2])
+
+    def test_adjacency_components(self):
+        # The test airport has adjacent bays, which link all departing flights compliant with them.
+        flights = Flights(abs_path("./flight_data_small"), Airport(abs_path("./airport_data")))
+        self.assertEqual(len(bay_components(flights)), 1)
+
+    def test_flight_subset(self):
+        flights = Flights(self.flights_path, Airport(self.airport_path))
+        self.assertEqual(BayAssignment(flights, flight_subset=range(flights.n_flights)).lp_code(),
+                         BayAssignment(flights).lp_code())
+
+        arrival = next(i for i, flight in enumerate(flights.flight_schedule) if flight.flight_type == ft.Arr)
+        with self.assertRaises(Exception):
+            BayAssignment(flights, flight_subset=[arrival])
+
+    def test_decomposed_solve(self):
+        objective_values = []
+        bays = []
+        for decompose in [False, True]:
+            solver = BayGateSolver(self.airport_path, self.flights_path, "workspace", lp_solver=ScipySolver())
+            solver.solve_bay_assignment(decompose=decompose, processes=2)
+            solver.load_bay_assignment_solution()
+            paths = solver.solution_paths("bay")
+            self.assertEqual(len(paths), 1 if not decompose else len(bay_components(solver.flights)))
+            objective_values.append(sum(float(ET.parse(path).getroot().find("header").get("objectiveValue"))
+                                        for path in paths))
+            bays.append([solution.bay_idx for solution in solver.solutions])
+
+        self.assertAlmostEqual(objective_values[0], objective_values[1], 3)
+        self.assertNotIn(None, bays[1])
+
+
+    def test_gate_components(self):
+        airport = Airport(abs_path("./airport_data"))
+        flights = Flights(abs_path("./flight_data_small"), airport)
+        bays = [airport.bay_names.index(name) for name in
+                ["11", "8", "8", "8", "14", "14", "14", "16", "2B", "4L", "3B", "3C", "16"]]
+        gate_assignment = GateAssignment(flights, bays)
+        components = gate_components(gate_assignment)
+
+        departing = [i for i in range(flights.n_flights) if flights.departing(i)]
+        self.assertEqual(sorted(i for component in components for i in component), departing)
+
+        # Domestic and international flights are never in the same component.
+        for component in components:
+            self.assertEqual(len({flights.domestic(i, departing=True) for i in component}), 1)
+
+        # The weights are the same as the ones calculated while generating the complete lp code.
+        gate_assignment.lp_code()
+        epsilon, eta = GateAssignment(flights, bays).weights()
+        self.assertAlmostEqual(epsilon, gate_assignment.epsilon)
+        self.assertAlmostEqual(eta, gate_assignment.eta)
+
+    def test_decomposed_gate_solve(self):
+        solver = BayGateSolver(self.airport_path, self.flights_path, "workspace", lp_solver=ScipySolver())
+        solver.solve_bay_assignment()
+        solver.load_bay_assignment_solution()
+
+        objective_values = []
+        for decompose in [False, True]:
+            solver.solve_gate_assignment(decompose=decompose, processes=2)
+            paths = solver.solution_paths("gate")
+            objective_values.append(sum(float(ET.parse(path).getroot().find("header").get("objectiveValue"))
+                                        for path in paths))
+        self.assertGreater(len(paths), 1)
+        self.assertAlmostEqual(objective_values[0], objective_values[1], 3)
+
+        solver.load_gate_assignment_solution()
+        for i, solution in enumerate(solver.solutions):
+            self.assertEqual(solution.gate_idx is not None, solver.flights.departing(i))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+These tests check inserting, updating and cancelling flights of a loaded flight schedule.
+"""
+
+import unittest
+import os
+import shutil
+from datetime import timedelta
+
+from ooc import Airport, Flights, BayAssignment, ft
+from ooc.decomposition import time_conflicting_pairs, compliant_bays
+
+from synthetic_case import SyntheticTestCase
+
+
+class TestFlightIndex(SyntheticTestCase):
+    airport_args = dict(n_bays=20, n_remote_bays=5, n_adjacent_pairs=0, seed=7)
+    schedule_args = dict(n_flights=40, long_stay_fraction=0.4, overnight_fraction=0.5, preference_fraction=0.5, seed=7)
+
+    def setUp(self):
+        super().setUp()
+        self.partial_path = os.path.join(self.directory.name, "partial")
+        self.airport = Airport(self.airport_path)
+
+        # Copy of the schedule without the last flights, which are inserted later on.
+        shutil.copytree(self.flights_path, self.partial_path)
+        with open(os.path.join(self.flights_path, "flight_schedule.csv")) as f:
+            lines = f.readlines()
+        self.n_partial = len(lines) - 1 - 12
+        while lines[1 + self.n_partial].split(",")[0] in ["Park", "Dep"]:
+            self.n_partial += 1
+        with open(os.path.join(self.partial_path, "flight_schedule.csv"), "w") as f:
+            f.writelines(lines[:1 + self.n_partial])
+        self.inserted_rows = [[x.strip() for x in line.split(",")] for line in lines[1 + self.n_partial:]]
+
+    def schedule(self, flights):
+        return [tuple(flight) for flight in flights.flight_schedule]
+
+    def test_insert(self):
+        expected = Flights(self.flights_path, self.airport)
+        flights = Flights(self.partial_path, self.airport)
+        flights.build_index()
+
+        flight_idx = flights.insert_flights(self.inserted_rows)
+        self.assertEqual(flight_idx, list(range(self.n_partial, expected.n_flights)))
+        self.assertEqual(self.schedule(flights), self.schedule(expected))
+        self.assertEqual([tuple(group) for group in flights.groups], [tuple(group) for group in expected.groups])
+
+        # The incrementally maintained index is the same as one built from scratch.
+        self.assertEqual(sorted(time_conflicting_pairs(flights)),
+                         sorted(time_conflicting_pairs(expected)))
+        self.assertEqual(compliant_bays(flights), compliant_bays(expected))
+        self.assertEqual(BayAssignment(flights).lp_code(), BayAssignment(expected).lp_code())
+
+        with self.assertRaises(Exception):
+            flights.insert_flights([["Arr", "KQ100", "ADD", "10:00", "", "", "", "", "", "11:00", "B738"]])
+
+    def test_update(self):
+        flights = Flights(self.flights_path, self.airport)
+        flights.build_index()
+
+        # Move the park part of an overnight split flight to the same day.
+        i = next(i for i, flight in enumerate(flights.flight_schedule)
+                 if flight.flight_type == ft.Park and flights.is_overnight(i) and flight.etd.hour >= 1)
+        eta = (flights.flight_schedule[i].etd - timedelta(minutes=30)).strftime("%H:%M")
+        group = flights.update_flight(i, eta=eta)
+        self.assertEqual(group, [i - 1, i, i + 1])
+        schedule = flights.flight_schedule
+        self.assertEqual(schedule[i].eta.day, schedule[i].etd.day)
+        self.assertLessEqual(schedule[i - 1].eta, schedule[i - 1].etd)
+
+        # An update gives the same result as reloading the changed schedule.
+        with open(os.path.join(self.flights_path, "flight_schedule.csv")) as f:
+            lines = f.readlines()
+        values = lines[1 + i].split(",")
+        values[3] = eta
+        lines[1 + i] = ",".join(values)
+        with open(os.path.join(self.flights_path, "flight_schedule.csv"), "w") as f:
+            f.writelines(lines)
+        expected = Flights(self.flights_path, self.airport)
+        self.assertEqual(self.schedule(flights), self.schedule(expected))
+        self.assertEqual(sorted(time_conflicting_pairs(flights)),
+                         sorted(time_conflicting_pairs(expected, use_index=False)))
+
+        with self.assertRaises(Exception):
+            flights.update_flight(0, flight_type="Arr")
+
+    def test_cancel(self):
+        flights = Flights(self.flights_path, self.airport)
+        flights.build_index()
+        n = flights.n_flights
+        i = next(i for i, flight in enumerate(flights.flight_schedule) if flight.flight_type == ft.Dep)
+        remaining = self.schedule(flights)[:i - 2] + self.schedule(flights)[i + 1:]
+
+        self.assertEqual(flights.cancel_flight(i), [i - 2, i - 1, i])
+        self.assertEqual(flights.n_flights, n - 3)
+        self.assertEqual(self.schedule(flights), remaining)
+        self.assertEqual(sorted(time_conflicting_pairs(flights)),
+                         sorted(time_conflicting_pairs(flights, use_index=False)))
+
+        # The group table is the same as one built from scratch.
+        groups = [tuple(group) for group in flights.groups]
+        flights.build_groups()
+        self.assertEqual([tuple(group) for group in flights.groups], groups)
+
+    def test_stale_index(self):
+        flights = Flights(self.flights_path, self.airport)
+        index = flights.build_index()
+        self.assertIs(flights.valid_index(), index)
+
+        # The index is not used once the buffer time changes.
+        flights.buffer_time = timedelta(minutes=30)
+        self.assertIsNone(flights.valid_index())
+        self.assertEqual(BayAssignment(flights).lp_code(), BayAssignment(Flights(
+            self.flights_path, self.airport, buffer_time=timedelta(minutes=30))).lp_code())
+
+
+if __name__ == '__main__':
+    unittest.main()
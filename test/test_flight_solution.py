@@ -0,0 +1,90 @@
+"""
+These tests check the table, csv and npz output of the flight solutions.
+"""
+
+import unittest
+import os
+import csv
+import io
+import tempfile
+
+import numpy as np
+
+from ooc import BayGateSolver, FlightSolution
+from ooc.flight_solution import write_table, write_csv, save_npz
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+class TestFlightSolution(unittest.TestCase):
+    @staticmethod
+    def load_solver():
+        """
+        This is not a unit test. Loads in the small case together with the stored solutions.
+        """
+        solver = BayGateSolver(abs_path("./airport_data"),
+                               abs_path("./flight_data_small"), "test_case",
+                               cplex_command=None)
+        solver.load_bay_assignment_solution()
+        solver.load_gate_assignment_solution()
+        return solver
+
+    def test_slots(self):
+        solver = self.load_solver()
+        with self.assertRaises(AttributeError):
+            solver.solutions[0].unknown_attribute = 1
+
+    def test_str_data(self):
+        solver = self.load_solver()
+        solution = solver.solutions[0]
+        row = solution.str_data()
+        self.assertTrue(row.startswith("  0      ft.Full         BA065     LHR  20:30"))
+        self.assertEqual(len(row), len(FlightSolution.str_heading().split("\n")[0]) + 1)
+
+        table = io.StringIO()
+        write_table(solver.solutions, table)
+        self.assertEqual(table.getvalue(),
+                         FlightSolution.str_heading() + "".join(s.str_data() for s in solver.solutions))
+
+    def test_write_csv(self):
+        solver = self.load_solver()
+        f = io.StringIO(newline="")
+        write_csv(solver.solutions, f)
+        f.seek(0)
+        rows = list(csv.reader(f))
+        self.assertEqual(rows[0], [name for name, _, _ in FlightSolution.cols])
+        self.assertEqual(len(rows), solver.flights.n_flights + 1)
+        for row, solution in zip(rows[1:], solver.solutions):
+            self.assertEqual(row[0], str(solution.idx))
+            self.assertEqual(row[4], solution.eta.strftime("%H:%M"))
+            self.assertEqual(row[5], solution.bay)
+            self.assertEqual(row[6], solution.gate or "")
+
+        # The rows of a single solution use the same format.
+        self.assertEqual(f.getvalue(),
+                         FlightSolution.csv_heading() + "".join(s.csv_data() for s in solver.solutions))
+
+    def test_save_npz(self):
+        solver = self.load_solver()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "result.npz")
+            save_npz(solver.solutions, path)
+            with np.load(path) as data:
+                self.assertEqual(data["bay_idx"].tolist(), [s.bay_idx for s in solver.solutions])
+                self.assertEqual(data["gate_idx"].tolist(),
+                                 [-1 if s.gate_idx is None else s.gate_idx for s in solver.solutions])
+                self.assertEqual(data["in_flight_no"][0], "BA065")
+                self.assertEqual(data["eta"][0], np.datetime64(solver.solutions[0].eta, "m"))
+                self.assertEqual(data["flight_type"].tolist(), [s.flight_type.value for s in solver.solutions])
+
+
+if __name__ == '__main__':
+    unittest.main()
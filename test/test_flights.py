@@ -7,6 +7,7 @@ import os
 import datetime
 
 from ooc import Flights, Airport, ft
+from ooc.flights import parse_minutes
 
 
 def abs_path(rel_path):
@@ -141,5 +142,39 @@ class TestFlights(unittest.TestCase):
         self.assertIs(flights.is_overnight(6), True)
         self.assertIs(flights.is_overnight(2), False)
 
+    def test_groups(self):
+        airport = Airport(abs_path("./airport_data"))
+        flights = Flights(abs_path("./flight_data_small"), airport)
+
+        self.assertEqual(sum(len(group.flight_idx) for group in flights.groups), flights.n_flights)
+        self.assertEqual(flights.groups[flights.flight_group[5]].flight_idx, (4, 5, 6))
+        self.assertIs(flights.groups[flights.flight_group[5]].overnight, True)
+        self.assertEqual(flights.groups[flights.flight_group[0]].flight_idx, (0,))
+        self.assertIs(flights.groups[flights.flight_group[0]].overnight, False)
+        self.assertEqual(flights.groups_of([0, 4, 5, 6]), [flights.flight_group[0], flights.flight_group[4]])
+
+    def test_lazy_records(self):
+        airport = Airport(abs_path("./airport_data"))
+        flights = Flights(abs_path("./flight_data_small"), airport)
+        schedule = flights.flight_schedule
+
+        # The records are only created when they are accessed.
+        self.assertIsNone(schedule.records[5])
+        self.assertEqual(schedule.value(5, "eta"), -75)
+        self.assertIs(schedule[5], schedule[5])
+        self.assertEqual(schedule.value(5, "eta"), -75)
+
+        schedule.set_value(5, "etd", 6 * 60)
+        self.assertEqual(schedule[5].etd, datetime.datetime(2015, 6, 2, 6, 0))
+        self.assertEqual(len(schedule[2:4]), 2)
+        self.assertEqual(len(list(schedule)), flights.n_flights)
+
+    def test_parse_minutes(self):
+        self.assertEqual(parse_minutes(["00:00", "5:07", "23:59"]), [0, 307, 1439])
+        self.assertEqual(parse_minutes([]), [])
+        with self.assertRaises(Exception):
+            parse_minutes(["12h30"])
+
+
 if __name__ == '__main__':
     unittest.main()
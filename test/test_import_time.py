@@ -0,0 +1,56 @@
+"""
+Checks that importing the package stays fast. The charting dependencies should only be
+imported when the first chart is created.
+"""
+
+import unittest
+import os
+import subprocess
+import sys
+import json
+
+
+repository_path = os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), ".."))
+
+import_time_budget = 0.15
+"""
+Maximum time in seconds importing the package may take. The import takes a few tens of
+milliseconds with cached bytecode and about a hundred without, the rest is margin for slow machines.
+"""
+
+lazy_modules = ["matplotlib", "numpy", "scipy", "concurrent.futures", "multiprocessing", "gzip"]
+"""
+Modules that are only imported when they are first used.
+"""
+
+script = """
+import json
+import sys
+from time import perf_counter
+t0 = perf_counter()
+import ooc
+dt = perf_counter() - t0
+print(json.dumps({"dt": dt, "modules": sorted(sys.modules)}))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    def import_ooc(self):
+        # Run it in a new interpreter, since the test runner might have imported matplotlib already.
+        result = subprocess.run([sys.executable, "-c", script], cwd=repository_path,
+                                stdout=subprocess.PIPE, check=True)
+        return json.loads(result.stdout.decode())
+
+    def test_no_plotting_imports(self):
+        modules = self.import_ooc()["modules"]
+        for module in lazy_modules:
+            self.assertNotIn(module, modules)
+
+    def test_import_time(self):
+        # Take the fastest of a few imports to filter out noise.
+        dt = min(self.import_ooc()["dt"] for _ in range(3))
+        self.assertLess(dt, import_time_budget)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+These tests check the functions working on sets of time intervals.
+"""
+
+import unittest
+
+from ooc.intervals import interval_lanes, overlapping_pairs, maximal_cliques, assign_lanes
+
+
+class TestIntervals(unittest.TestCase):
+    def test_interval_lanes(self):
+        starts = [0, 1, 2, 6, 5, 10]
+        ends = [4, 3, 5, 8, 7, 11]
+        lanes = interval_lanes(starts, ends)
+
+        # Intervals in the same lane may not overlap.
+        for i in range(len(starts)):
+            for j in range(i + 1, len(starts)):
+                if lanes[i] == lanes[j]:
+                    self.assertFalse(starts[i] <= ends[j] and starts[j] <= ends[i])
+
+        # At most three intervals overlap at the same time, so three lanes are enough.
+        self.assertEqual(max(lanes) + 1, 3)
+        self.assertEqual(lanes[0], 0)
+        self.assertEqual(lanes[5], 0)
+
+    def test_touching_intervals(self):
+        # Intervals are closed, so touching intervals are overlapping.
+        self.assertEqual(interval_lanes([0, 5], [5, 10]), [0, 1])
+        self.assertEqual(interval_lanes([0, 6], [5, 10]), [0, 0])
+
+    def test_many_overlapping(self):
+        # More than 20 overlapping intervals used to crash the gate chart.
+        lanes = interval_lanes([0] * 50, [10] * 50)
+        self.assertEqual(sorted(lanes), list(range(50)))
+
+    def test_overlapping_pairs(self):
+        starts = [0, 1, 2, 6, 5, 10]
+        ends = [4, 3, 5, 8, 7, 11]
+        expected = {(i, j) for i in range(len(starts)) for j in range(i + 1, len(starts))
+                    if starts[i] <= ends[j] and starts[j] <= ends[i]}
+        pairs = list(overlapping_pairs(starts, ends))
+        self.assertEqual(len(pairs), len(expected))
+        self.assertEqual(set(pairs), expected)
+
+        # Touching intervals overlap.
+        self.assertEqual(list(overlapping_pairs([5, 0], [10, 5])), [(0, 1)])
+
+    def test_maximal_cliques(self):
+        starts = [0, 1, 2, 6, 5, 10]
+        ends = [4, 3, 5, 8, 7, 11]
+        self.assertEqual(list(maximal_cliques(starts, ends)), [(2, [0, 1, 2]), (4, [2, 4]), (3, [3, 4]), (5, [5])])
+
+        # Touching intervals overlap.
+        self.assertEqual(list(maximal_cliques([5, 0], [10, 5])), [(0, [0, 1])])
+
+    def test_assign_lanes(self):
+        starts = [0, 1, 2, 6, 5, 10]
+        ends = [4, 3, 5, 8, 7, 11]
+        lanes = assign_lanes(starts, ends, 3)
+        for i in range(len(starts)):
+            for j in range(i + 1, len(starts)):
+                if lanes[i] == lanes[j]:
+                    self.assertFalse(starts[i] <= ends[j] and starts[j] <= ends[i])
+
+        # Intervals are kept in the lane of the interval they follow up on, if it's free.
+        self.assertEqual(assign_lanes([0, 1, 6], [4, 5, 8], 2, follows=[None, None, 1]), [0, 1, 1])
+
+        # An interval starting in the gap between an interval and its follow up doesn't take the
+        # lane held for the follow up, unless it ends before the follow up starts.
+        self.assertEqual(assign_lanes([0, 15, 12], [10, 50, 20], 2, follows=[None, 0, None]), [0, 0, 1])
+        self.assertEqual(assign_lanes([0, 15, 12], [10, 50, 14], 2, follows=[None, 0, None]), [0, 0, 0])
+
+        # Without a free lane the interval is put in the lane that was freed up first.
+        self.assertEqual(assign_lanes([0, 1, 2], [4, 3, 5], 2), [0, 1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
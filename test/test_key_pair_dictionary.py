@@ -0,0 +1,69 @@
+"""
+These tests check the KeyPairDictionary used to store values for unordered pairs.
+"""
+
+import unittest
+import pickle
+
+import numpy as np
+
+from ooc.key_pair_dictionary import KeyPairDictionary
+
+
+class TestKeyPairDictionary(unittest.TestCase):
+    def test_order_ignored(self):
+        d = KeyPairDictionary()
+        d[3, 1] = "a"
+        self.assertEqual(d[1, 3], "a")
+        self.assertEqual(d[3, 1], "a")
+        self.assertIn((1, 3), d)
+        self.assertIn((3, 1), d)
+        self.assertNotIn((1, 2), d)
+
+        d[1, 3] = "b"
+        self.assertEqual(len(d), 1)
+        self.assertEqual(d[3, 1], "b")
+        with self.assertRaises(KeyError):
+            d[1, 2]
+
+    def test_pairs(self):
+        d = KeyPairDictionary()
+        d[0, 1] = None
+        d[2, 0] = None
+        d[1, 2] = None
+        d[4, 4] = None
+        self.assertEqual(list(d.pairs(0)), [1, 2])
+        self.assertEqual(list(d.pairs(2)), [0, 1])
+        self.assertEqual(list(d.pairs(4)), [4])
+        self.assertEqual(list(d.pairs(5)), [])
+        self.assertTrue(d.contains(1))
+        self.assertFalse(d.contains(3))
+        self.assertEqual(d.degree(0), 2)
+
+        del d[0, 2]
+        self.assertEqual(list(d.pairs(0)), [1])
+        self.assertEqual(d.pop((1, 0)), None)
+        self.assertFalse(d.contains(0))
+        self.assertEqual(d.pop((0, 1), "missing"), "missing")
+
+        d.clear()
+        self.assertFalse(d.contains(1))
+
+    def test_from_arrays(self):
+        i = np.array([0, 5, 3])
+        j = np.array([1, 2, 3])
+        d = KeyPairDictionary.from_arrays(i, j, np.array([1.0, 2.0, 3.0]))
+        self.assertEqual(d[2, 5], 2.0)
+        self.assertEqual(list(d.pairs(2)), [5])
+        self.assertIsInstance(next(iter(d))[0], int)
+
+    def test_pickle(self):
+        d = KeyPairDictionary({(2, 1): "a", (3, 4): "b"})
+        d2 = pickle.loads(pickle.dumps(d))
+        self.assertEqual(d2[1, 2], "a")
+        self.assertEqual(list(d2.pairs(4)), [3])
+        self.assertEqual(list(d.copy().pairs(1)), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
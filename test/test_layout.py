@@ -0,0 +1,82 @@
+"""
+These tests check computing the distance tables of an airport from a graph of its layout.
+"""
+
+import unittest
+import os
+import tempfile
+
+from ooc import Airport
+from ooc.layout import Layout, format_distance
+from ooc.synthetic import generate_airport
+
+
+class TestLayout(unittest.TestCase):
+    def layout(self):
+        #   T - a --10-- b --20-- c
+        #       |               |
+        #      G1 (0)          G2 (5)
+        layout = Layout()
+        layout.add_edge("a", "b", 10)
+        layout.add_edge("b", "c", 20)
+        layout.add_edge("a", "c", 50)
+        layout.add_edge("a", "c", 40)  # Only the shortest path between two nodes is kept.
+        layout.add_edge("a", "G1", 0)
+        layout.add_edge("c", "G2", 5)
+        layout.add_edge("a", "T", 1.5)
+        layout.add_gate("G1")
+        layout.add_gate("G2")
+        layout.add_gate("G3", "island")
+        layout.add_gate("G4", "b", active=False)
+        layout.add_bay("B1", "a")
+        layout.add_bay("B2", "c")
+        layout.add_terminal("T")
+        return layout
+
+    def test_distances(self):
+        distances = self.layout().bay_gate_distances()
+        self.assertEqual(distances.tolist(), [[0, 35, float("inf"), 10],
+                                              [30, 5, float("inf"), 20]])
+        self.assertEqual(self.layout().bay_terminal_distances().tolist(), [[1.5], [31.5]])
+
+    def test_format_distance(self):
+        self.assertEqual(format_distance(12.0), "12")
+        self.assertEqual(format_distance(12.25), "12.2")
+        self.assertEqual(format_distance(float("inf")), "x")
+
+    def test_tables(self):
+        lines = self.layout().bay_gate_distance_table().splitlines()
+        self.assertEqual([x.strip() for x in lines[0].split(",")], ["bay", "G1", "G2", "G3", "G4"])
+        self.assertEqual([x.strip() for x in lines[2].split(",")], ["B2", "30", "5", "x", "x"])
+
+        with self.assertRaises(Exception):
+            layout = self.layout()
+            layout.add_terminal("U", "island")
+            layout.bay_terminal_distance_table()
+
+    def test_airport(self):
+        # Replace the distance tables of a synthetic airport and load it.
+        with tempfile.TemporaryDirectory() as directory:
+            airport_info = generate_airport(directory, n_bays=6, n_gates=3, n_remote_bays=2, n_terminals=2,
+                                            n_domestic_gates=1, n_adjacent_pairs=0, seed=0)
+            layout = Layout()
+            for j, gate_name in enumerate(airport_info.gate_names):
+                layout.add_gate(gate_name, "p{}".format(j))
+                if j:
+                    layout.add_edge("p{}".format(j - 1), "p{}".format(j), 50)
+            for k, bay_name in enumerate(airport_info.bay_names):
+                layout.add_edge(bay_name, "p{}".format(k % 3), 10 * k)
+                layout.add_bay(bay_name)
+            airport = Airport(directory)
+            for terminal_name in airport.terminal_names:
+                layout.add_terminal(terminal_name, "p0")
+            layout.write_bay_gate_distance(os.path.join(directory, "bay_gate_distance.csv"))
+            layout.write_bay_terminal_distance(os.path.join(directory, "bay_terminal_distance.csv"))
+
+            airport = Airport(directory)
+            self.assertEqual(airport.bay_gate_distance[4][0], 90)
+            self.assertEqual(airport.terminal_bay_distance(airport.terminal_names[0], 5), 150)
+
+
+if __name__ == '__main__':
+    unittest.main()
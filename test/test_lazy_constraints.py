@@ -0,0 +1,55 @@
+"""
+These tests check adding the time conflict constraints of the bay assignment lazily.
+"""
+
+import unittest
+
+from ooc import Airport, Flights, BayAssignment, BayGateSolver
+from ooc.decomposition import time_conflicting_pairs
+from ooc.lp_solvers import ScipySolver
+
+from synthetic_case import SyntheticTestCase
+
+
+class TestLazyConstraints(SyntheticTestCase):
+    airport_args = dict(n_bays=8, n_remote_bays=2, n_adjacent_pairs=1, seed=8)
+    schedule_args = dict(n_flights=30, long_stay_fraction=0.5, seed=8)
+
+    def test_time_conflicts(self):
+        flights = Flights(self.flights_path, Airport(self.airport_path))
+        pairs = list(time_conflicting_pairs(flights))
+
+        # Giving all pairs generates the same code as the default.
+        self.assertEqual(BayAssignment(flights, time_conflicts=pairs).lp_code(), BayAssignment(flights).lp_code())
+
+        code = BayAssignment(flights, time_conflicts=[]).lp_code()
+        self.assertNotIn("tc_", code)
+
+    def test_lazy(self):
+        solver = BayGateSolver(self.airport_path, self.flights_path, "full", lp_solver=ScipySolver())
+        solver.solve_bay_assignment()
+        solver.load_bay_assignment_solution()
+
+        lazy_solver = BayGateSolver(self.airport_path, self.flights_path, "lazy", lp_solver=ScipySolver())
+        lazy_solver.solve_bay_assignment_lazy()
+
+        rounds = lazy_solver.lazy_rounds
+        self.assertGreater(len(rounds), 1)
+        self.assertEqual(rounds[0].n_time_conflicts, 0)
+        self.assertEqual(rounds[-1].n_violated, 0)
+        self.assertEqual(lazy_solver.validate(), [])
+        self.assertAlmostEqual(lazy_solver.objective_value("bay"), solver.objective_value("bay"),
+                               delta=1e-6 * abs(solver.objective_value("bay")))
+
+        # The gate assignment can be solved on top of it.
+        lazy_solver.solve_gate_assignment()
+        lazy_solver.load_gate_assignment_solution()
+
+    def test_no_solver(self):
+        solver = BayGateSolver(self.airport_path, self.flights_path, "none", cplex_command=None)
+        with self.assertRaises(Exception):
+            solver.solve_bay_assignment_lazy()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+These tests check reading lp files and solving them without cplex.
+"""
+
+import unittest
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+
+from ooc.lp_solvers import read_lp, ScipySolver, InfeasibleError, solve_all
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+def objective_value(path):
+    return float(ET.parse(path).getroot().find("header").get("objectiveValue"))
+
+
+class TestLpSolvers(unittest.TestCase):
+    def test_read_lp(self):
+        model = read_lp("Maximize\n"
+                        "\\ Comment\n"
+                        "    -2.5000 X_0_1  +1.0000 X_0_2\n"
+                        "   - M_0_1_2\n"
+                        "Subject To\n"
+                        "sg_0:\n"
+                        " + X_0_1 + X_0_2\n"
+                        " = 1\n"
+                        "   tc_0_1_2: X_0_1 - M_0_1_2 <= 1\n"
+                        "   nt_1: - X_0_2 >= -1\n"
+                        "BINARY\n"
+                        "    X_0_1  X_0_2  M_0_1_2\n"
+                        "END\n")
+        self.assertEqual(model.sense, -1)
+        self.assertEqual(model.variables, ["X_0_1", "X_0_2", "M_0_1_2"])
+        self.assertEqual(model.objective, {0: -2.5, 1: 1.0, 2: -1})
+        self.assertEqual(model.row_names, ["sg_0", "tc_0_1_2", "nt_1"])
+        self.assertEqual(model.rows, [{0: 1, 1: 1}, {0: 1, 2: -1}, {1: -1}])
+        self.assertEqual(model.row_lower, [1, -float("inf"), -1])
+        self.assertEqual(model.row_upper, [1, 1, float("inf")])
+        self.assertEqual(model.binary, {0, 1, 2})
+
+    def test_scipy_solver(self):
+        # The objective values should be the same as the ones found by cplex.
+        with tempfile.TemporaryDirectory() as directory:
+            lp_paths = [abs_path("test_case/bay.lp"), abs_path("test_case/gate.lp")]
+            sol_paths = [os.path.join(directory, "bay.sol"), os.path.join(directory, "gate.sol")]
+            solve_all(ScipySolver(), lp_paths, sol_paths, processes=2)
+
+            for sol_path, cplex_sol_path in zip(sol_paths, ["test_case/bay.sol", "test_case/gate.sol"]):
+                self.assertAlmostEqual(objective_value(sol_path), objective_value(abs_path(cplex_sol_path)), 3)
+
+    def test_infeasible(self):
+        with tempfile.TemporaryDirectory() as directory:
+            lp_paths = [os.path.join(directory, "{}.lp".format(n)) for n in range(2)]
+            sol_paths = [os.path.join(directory, "{}.sol".format(n)) for n in range(2)]
+            for lp_path, rhs in zip(lp_paths, [1, 2]):
+                with open(lp_path, "w") as f:
+                    f.write("Minimize\n x\nSubject To\n a: x >= {}\nBinary\n x\nEnd\n".format(rhs))
+
+            # The path of the infeasible lp file is kept when it's raised in a worker process.
+            with self.assertRaises(InfeasibleError) as context:
+                solve_all(ScipySolver(), lp_paths, sol_paths, processes=2)
+            self.assertEqual(context.exception.lp_path, lp_paths[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
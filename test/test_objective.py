@@ -0,0 +1,76 @@
+"""
+These tests check recomputing the terms of the objective functions from the solutions.
+"""
+
+import unittest
+import os
+
+from ooc import BayGateSolver, ft
+from ooc.lp_solvers import ScipySolver
+from ooc.objective import evaluate, bay_objective
+
+from synthetic_case import SyntheticTestCase
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+class ObjectiveChecks:
+    """
+    Checks whether the recomputed objective values match the ones of the solver.
+    """
+
+    def check_solver(self, solver):
+        bay, gate = evaluate(solver.solutions)
+        self.assertAlmostEqual(bay.total, solver.objective_value("bay"), delta=1e-6 * abs(bay.total))
+        self.assertAlmostEqual(gate.total, solver.objective_value("gate"), delta=1e-6 * abs(gate.total))
+        return bay, gate
+
+
+class TestObjective(ObjectiveChecks, unittest.TestCase):
+    def test_case(self):
+        solver = BayGateSolver(abs_path("./airport_data"),
+                               abs_path("./flight_data_small"), "test_case",
+                               cplex_command=None)
+        solver.load_bay_assignment_solution()
+        solver.load_gate_assignment_solution()
+        bay, gate = self.check_solver(solver)
+        self.assertEqual(bay.towings, 0)
+        self.assertEqual(gate.gate_conflicts, 2)
+
+        # Towing the parked aircraft of a long stay flight adds two penalties.
+        bays = [solution.bay_idx for solution in solver.solutions]
+        i = next(i for i, flight in enumerate(solver.flights.flight_schedule)
+                 if flight.flight_type == ft.Arr and not solver.flights.is_overnight(i))
+        bays[i + 2] = next(k for k in range(solver.airport.n_bays)
+                           if k != bays[i + 1] and solver.flights.bay_compliance(i + 2, k))
+        towed = bay_objective(solver.flights, bays)
+        self.assertEqual(towed.towings, 1)
+        self.assertAlmostEqual(towed.towing_penalties, 2 * solver.flights.gamma())
+
+
+class TestSyntheticObjective(ObjectiveChecks, SyntheticTestCase):
+    # A crowded airport, so some adjacent bays are used at the same time.
+    airport_args = dict(n_bays=8, n_remote_bays=2, n_adjacent_pairs=3, seed=8)
+    schedule_args = dict(n_flights=30, long_stay_fraction=0.5, seed=8)
+
+    def test_synthetic(self):
+        solver = BayGateSolver(self.airport_path, self.flights_path, "workspace", lp_solver=ScipySolver())
+        solver.solve_bay_assignment()
+        solver.load_bay_assignment_solution()
+        solver.solve_gate_assignment()
+        solver.load_gate_assignment_solution()
+
+        bay, gate = self.check_solver(solver)
+        self.assertGreater(bay.adjacency_conflicts, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+These tests check the checks finding flight schedules which cannot be assigned before solving them.
+"""
+
+import unittest
+import os
+
+from ooc import Airport, Flights, ft
+from ooc.precheck import precheck, overloaded_windows, checks
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+class TestPrecheck(unittest.TestCase):
+    def setUp(self):
+        self.airport = Airport(abs_path("./airport_data"))
+
+    def flights(self, spare_bays=None):
+        return Flights(abs_path("./flight_data_small"), self.airport, spare_bays=spare_bays)
+
+    def test_feasible(self):
+        self.assertEqual(precheck(self.flights()), [])
+
+    def test_overloaded_windows(self):
+        starts = [0, 1, 2, 6, 5, 10]
+        ends = [4, 3, 5, 8, 7, 11]
+        self.assertEqual(list(overloaded_windows(starts, ends, 2)), [(2, 3, 3, [0, 1, 2])])
+        self.assertEqual(list(overloaded_windows(starts, ends, 1)), [(1, 4, 3, [0, 1, 2]),
+                                                                     (5, 5, 2, [2, 4]),
+                                                                     (6, 7, 2, [3, 4])])
+        self.assertEqual(list(overloaded_windows(starts, ends, 3)), [])
+
+    def test_capacity(self):
+        # Only leave the bay compliant with most flights, so the time conflicting flights compete for it.
+        flights = self.flights()
+        k = max(range(self.airport.n_bays),
+                key=lambda k: sum(flights.bay_compliance(i, k) for i in range(flights.n_flights)))
+        flights = self.flights(spare_bays=self.airport.bay_names[:k] + self.airport.bay_names[k + 1:])
+        issues = precheck(flights)
+        self.assertEqual({issue.check for issue in issues} - set(checks), set())
+
+        capacity = [issue for issue in issues if issue.check == "capacity"]
+        self.assertGreater(len(capacity), 0)
+        for issue in capacity:
+            self.assertEqual(issue.bays, (k,))
+            self.assertLessEqual(issue.start, issue.end)
+            self.assertGreater(issue.demand, 1)
+            for i in issue.flights:
+                window = flights.buffered_window(i)
+                self.assertTrue(window[0] <= issue.end and issue.start <= window[1])
+
+    def test_compliance(self):
+        issues = precheck(self.flights(spare_bays=self.airport.bay_names))
+        compliance = [issue for issue in issues if issue.check == "compliance"]
+        self.assertEqual(len(compliance), self.flights().n_flights)
+        self.assertNotIn("capacity", [issue.check for issue in issues])
+
+    def test_fueling(self):
+        flights = self.flights()
+        fueling = self.airport.fueling
+        self.airport.fueling = [False] * self.airport.n_bays
+        try:
+            issues = precheck(flights)
+        finally:
+            self.airport.fueling = fueling
+        self.assertEqual([issue.flights[-1] for issue in issues],
+                         [i for i in range(flights.n_flights) if flights.departing(i)])
+        self.assertEqual({issue.check for issue in issues}, {"fueling"})
+
+    def test_overnight(self):
+        flights = self.flights()
+        i = next(i for i, flight in enumerate(flights.flight_schedule)
+                 if flight.flight_type == ft.Arr and flights.is_overnight(i))
+        current_bay = flights.flight_schedule[i].current.bay
+
+        issues = precheck(self.flights(spare_bays=[self.airport.bay_names[current_bay]]))
+        self.assertEqual([(issue.check, issue.flights[0], issue.bays) for issue in issues],
+                         [("overnight", i, (current_bay,))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+These tests check whether the profiler records every stage of generating and solving the problems.
+"""
+
+import unittest
+import os
+import io
+import json
+import tempfile
+
+from ooc import Airport, Flights, BayAssignment, BayGateSolver
+from ooc.profiling import Profiler, NullProfiler, JsonLinesRecorder, lp_statistics
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+class TestProfiling(unittest.TestCase):
+    def test_lp_statistics(self):
+        code = "// Single time slot constraints.\n" \
+               "tc_0_5_0: X_0_0      + X_5_0      <= 1;\n" \
+               "tc_0_5_1: X_0_1      + X_5_1      <= 1;\n" \
+               "sp_1_2: X_1_2 - X_2_2 - V_1_2 + W_2_2 = 0;\n" \
+               "cc_3_0: X_0_3 + X_5_3 - O_3_0 <= 1;\n"
+        self.assertEqual(lp_statistics(code), {"rows": 4, "variables": 11, "nonzeros": 11})
+
+    def test_bay_assignment_sections(self):
+        airport = Airport(abs_path("./airport_data"))
+        flights = Flights(abs_path("./flight_data_small"), airport)
+        profiler = Profiler()
+        code = BayAssignment(flights, profiler=profiler).lp_code()
+
+        # Profiling may not change the generated code.
+        self.assertEqual(code, BayAssignment(flights).lp_code())
+
+        records = {record["name"]: record for record in profiler.records}
+        for name in ["bay.constraint_single_bay_compliance",
+                     "bay.constraint_single_time_slot",
+                     "bay.constraint_fueling",
+                     "bay.constraint_splitted_flight",
+                     "bay.constraint_adjacency",
+                     "bay.of_min_passenger_transport_distance",
+                     "bay.of_max_airline_preference",
+                     "bay.of_penalty_values",
+                     "bay.of_adjacency_penalties",
+                     "bay.binary_decision_variables_declaration"]:
+            self.assertIn(name, records)
+            self.assertGreaterEqual(records[name]["wall_time"], 0)
+
+        self.assertEqual(records["bay.constraint_single_bay_compliance"]["rows"], flights.n_flights)
+        self.assertEqual(records["bay.constraint_single_time_slot"]["rows"], code.count("\ntc_"))
+        self.assertEqual(records["bay.binary_decision_variables_declaration"]["rows"], 0)
+
+    def test_solver_sections(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                json_lines_path = os.path.join(directory, "profile.jsonl")
+                profiler = Profiler(recorder=JsonLinesRecorder(json_lines_path))
+                solver = BayGateSolver(abs_path("./airport_data"),
+                                       abs_path("./flight_data_small"), "workspace",
+                                       cplex_command=None, profiler=profiler)
+                solver.solve_bay_assignment()
+
+                records = {record["name"]: record for record in profiler.records}
+                self.assertEqual(records["bay.write_lp"]["bytes"], os.path.getsize(solver.bay_lp_path))
+                self.assertIn("bay.lp_code", records)
+
+                with open(json_lines_path) as f:
+                    lines = [json.loads(line) for line in f]
+                self.assertEqual([line["name"] for line in lines], [record["name"] for record in profiler.records])
+
+                f = io.StringIO()
+                profiler.write_json_lines(f)
+                self.assertEqual(len(f.getvalue().splitlines()), len(profiler.records))
+            finally:
+                os.chdir(cwd)
+
+    def test_null_profiler(self):
+        profiler = NullProfiler()
+        with profiler.section("test") as section:
+            section.lp_statistics("tc_0_1_2: X_0_2 + X_1_2 <= 1")
+            section["bytes"] = 10
+        self.assertEqual(profiler.lp_section("test", lambda: "x"), "x")
+        self.assertEqual(profiler.totals(), {})
+
+    def test_lp_section(self):
+        profiler = Profiler()
+        code = profiler.lp_section("bay.test", lambda: "tc_0_1_2: X_0_2 + X_1_2 <= 1")
+        self.assertEqual(code, "tc_0_1_2: X_0_2 + X_1_2 <= 1")
+        self.assertEqual(profiler.records[0]["name"], "bay.test")
+        self.assertEqual(profiler.records[0]["nonzeros"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+These tests check whether the solutions are stored in and queried from the results database correctly.
+"""
+
+import unittest
+import os
+from datetime import date, datetime
+
+from ooc import BayGateSolver, ft
+from ooc.results_store import ResultsStore
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+class TestResultsStore(unittest.TestCase):
+    @staticmethod
+    def load_solver():
+        """
+        This is not a unit test. Loads in the small case together with the stored solutions.
+        """
+        solver = BayGateSolver(abs_path("./airport_data"),
+                               abs_path("./flight_data_small"), "test_case",
+                               cplex_command=None)
+        solver.load_bay_assignment_solution()
+        solver.load_gate_assignment_solution()
+        return solver
+
+    def test_add_run(self):
+        solver = self.load_solver()
+        solver.timings = {"bay_code_generation": 1.5, "bay_solving": 2.5}
+
+        with ResultsStore(":memory:") as store:
+            run_id = store.add_run(solver, created=datetime(2015, 6, 3, 12, 0))
+            runs = store.runs()
+            self.assertEqual(len(runs), 1)
+            self.assertEqual(runs[0].run_id, run_id)
+            self.assertEqual(runs[0].date, "2015-06-02")
+            self.assertEqual(runs[0].bay_solving, 2.5)
+            self.assertIsNone(runs[0].gate_solving)
+
+            solutions = store.solutions(run_id)
+            self.assertEqual(len(solutions), solver.flights.n_flights)
+            for stored, solution in zip(solutions, solver.solutions):
+                self.assertEqual(stored.bay, solution.bay)
+                self.assertEqual(stored.gate, solution.gate)
+                self.assertEqual(stored.eta, solution.eta)
+                self.assertEqual(stored.etd, solution.etd)
+                self.assertIs(stored.flight_type, solution.flight_type)
+            self.assertIs(solutions[4].flight_type, ft.Arr)
+
+    def test_queries(self):
+        solver = self.load_solver()
+
+        with ResultsStore(":memory:") as store:
+            run_1 = store.add_run(solver)
+            run_2 = store.add_run(solver)
+
+            # Both runs have the same solution, so every flight shows up twice.
+            rows = store.flight_bays("BA065")
+            self.assertEqual([row.run_id for row in rows], [run_1, run_2])
+            self.assertEqual(rows[0].bay, solver.solutions[0].bay)
+
+            self.assertEqual(store.bay_usage(solver.solutions[0].bay),
+                             2 * sum(solution.bay == solver.solutions[0].bay for solution in solver.solutions))
+            self.assertEqual(store.bay_usage("H1", since=date(2016, 1, 1)), 0)
+            self.assertEqual(store.flight_bays("BA065", since=date(2016, 1, 1)), [])
+
+            bays = store.bay_idx_array(run_1)
+            self.assertEqual(bays.tolist(), [solution.bay_idx for solution in solver.solutions])
+            gates = store.gate_idx_array(run_1)
+            self.assertEqual(gates.tolist(), [-1 if solution.gate_idx is None else solution.gate_idx
+                                              for solution in solver.solutions])
+
+            store.delete_run(run_1)
+            self.assertEqual([run.run_id for run in store.runs()], [run_2])
+            self.assertEqual(store.solutions(run_1), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+These tests check estimating the robustness of the solutions against delayed flights.
+"""
+
+import unittest
+import os
+
+import numpy as np
+
+from ooc import BayGateSolver, ft
+from ooc.lp_solvers import ScipySolver
+from ooc.robustness import evaluate_robustness, summary, shared_pairs, sample_times, DelayModelType, no_delay, \
+    exponential_delay, normal_delay
+
+from synthetic_case import SyntheticTestCase
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+class TestRobustness(unittest.TestCase):
+    def setUp(self):
+        self.solver = BayGateSolver(abs_path("./airport_data"),
+                                    abs_path("./flight_data_small"), "test_case",
+                                    cplex_command=None)
+        self.solver.load_bay_assignment_solution()
+        self.solver.load_gate_assignment_solution()
+
+    def test_no_delays(self):
+        # The solved plan has no conflicts when everything runs on schedule.
+        result = evaluate_robustness(self.solver.solutions, n_scenarios=10,
+                                     default=DelayModelType(no_delay(), no_delay()))
+        self.assertEqual(result.bay_conflicts.tolist(), [0] * 10)
+        # The time conflict constraints of the gate assignment are soft, so there might be some gate conflicts.
+        self.assertEqual(len(set(result.gate_conflicts.tolist())), 1)
+        self.assertEqual(result.retowings.tolist(), [0] * 10)
+        self.assertEqual(summary(result)["conflict_free"], 1)
+
+    def test_sample_times(self):
+        # The delayed arrival of a long stay flight pushes back the moments it's towed.
+        def delay(rng, shape):
+            return np.full(shape, 60.0)
+        eta = np.array([0, 100, 120, 200])
+        etd = np.array([50, 120, 200, 250])
+        flight_types = [ft.Full, ft.Arr, ft.Park, ft.Dep]
+        eta_s, etd_s = sample_times(eta, etd, flight_types, {DelayModelType(delay, no_delay()): [0, 1, 2, 3]},
+                                    [(1, 2, 3)], np.random.default_rng(0), 2)
+        self.assertEqual(eta_s[0].tolist(), [60, 160, 160, 200])
+        self.assertEqual(etd_s[1].tolist(), [50, 160, 200, 250])
+
+    def test_shared_pairs(self):
+        # Only the flights sharing a resource with overlapping time windows are paired, except
+        # the parts of the same long stay flight.
+        starts = np.array([0, 10, 20, 100, 5, 0])
+        ends = np.array([15, 25, 30, 110, 30, 50])
+        first, second = shared_pairs([0, 0, 0, 0, 1, None], [0, 1, 1, 2, 3, 4], starts, ends)
+        self.assertEqual(sorted(zip(first.tolist(), second.tolist())), [(0, 1)])
+
+
+class TestSyntheticRobustness(SyntheticTestCase):
+    # A busy synthetic schedule, so delays cause conflicts.
+    airport_args = dict(n_bays=12, n_remote_bays=4, n_adjacent_pairs=0, seed=4)
+    schedule_args = dict(n_flights=30, seed=4)
+
+    def test_delays(self):
+        solver = BayGateSolver(self.airport_path, self.flights_path, "workspace", lp_solver=ScipySolver())
+        solver.solve_bay_assignment()
+        solver.load_bay_assignment_solution()
+        solver.solve_gate_assignment()
+        solver.load_gate_assignment_solution()
+        self.check_delays(solver)
+        self.check_models(solver)
+
+    def check_delays(self, solver):
+        model = DelayModelType(exponential_delay(120), normal_delay(60, 30, minimum=0))
+        result = evaluate_robustness(solver.solutions, n_scenarios=2500, default=model, seed=0,
+                                     batch_size=1000)
+        self.assertEqual(result.bay_conflicts.shape, (2500,))
+        self.assertGreater(result.bay_conflicts.mean(), 0)
+        self.assertGreater(result.gate_conflicts.mean(), 0)
+        # Each conflict requires at most one flight to be towed.
+        self.assertTrue((result.retowings <= result.bay_conflicts).all())
+        self.assertTrue((result.retowings[result.bay_conflicts > 0] > 0).all())
+        self.assertEqual(len(result.conflict_probability), solver.flights.n_flights)
+
+        # The same seed gives the same scenarios.
+        again = evaluate_robustness(solver.solutions, n_scenarios=2500, default=model, seed=0,
+                                    batch_size=1000)
+        self.assertEqual(result.bay_conflicts.tolist(), again.bay_conflicts.tolist())
+
+    def check_models(self, solver):
+        # Delays of parked aircraft are ignored, so only giving those a delay gives no conflicts.
+        models = {ft.Park: DelayModelType(exponential_delay(120), exponential_delay(120))}
+        result = evaluate_robustness(solver.solutions, n_scenarios=100, models=models,
+                                     default=DelayModelType(no_delay(), no_delay()), seed=0)
+        self.assertEqual(result.bay_conflicts.sum(), 0)
+
+        # Airlines take precedence over the flight types.
+        airline = solver.flights.airline(0)
+        models[airline] = DelayModelType(exponential_delay(600), exponential_delay(600))
+        result = evaluate_robustness(solver.solutions, n_scenarios=100, models=models,
+                                     default=DelayModelType(no_delay(), no_delay()), seed=0)
+        self.assertGreater(result.bay_conflicts.sum(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
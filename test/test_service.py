@@ -0,0 +1,157 @@
+"""
+These tests check the http service solving the flight schedules posted to it.
+"""
+
+import unittest
+import json
+import os
+import threading
+from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+
+from ooc import BayGateSolver
+from ooc.cplex_session import CplexSessionPool
+from ooc.lp_solvers import ScipySolver
+from ooc.service import AssignmentService, ServiceBusyError, RequestError, create_server, schedule_payload, \
+    write_schedule, create_parser, create_lp_solver
+
+from synthetic_case import SyntheticTestCase
+
+
+class FailingSolver:
+    """
+    Solver that always fails, like a crashed cplex.
+    """
+
+    def solve(self, lp_path, sol_path):
+        raise Exception("The solver crashed.")
+
+
+class TestService(SyntheticTestCase):
+    airport_args = dict(n_bays=20, n_remote_bays=5, n_adjacent_pairs=0, seed=5)
+    schedule_args = dict(n_flights=12, long_stay_fraction=0.2, seed=5)
+
+    def request(self):
+        return {"airport": self.airport_path, "schedule": schedule_payload(self.flights_path)}
+
+    def test_write_schedule(self):
+        write_schedule("copy", schedule_payload(self.flights_path))
+        for name in ["flight_schedule.csv", "preferences.csv", "current.csv"]:
+            with open(os.path.join("copy", name)) as f, open(os.path.join(self.flights_path, name)) as g:
+                self.assertEqual([line.replace(" ", "") for line in f.read().splitlines()],
+                                 [line.replace(" ", "") for line in g.read().splitlines()])
+
+        with self.assertRaises(Exception):
+            write_schedule("invalid", {"flight_schedule": []})
+
+    def test_service(self):
+        expected = BayGateSolver(self.airport_path, self.flights_path, "expected", lp_solver=ScipySolver())
+        expected.solve_bay_assignment()
+        expected.load_bay_assignment_solution()
+        expected.solve_gate_assignment()
+        expected.load_gate_assignment_solution()
+
+        service = AssignmentService(lp_solver=ScipySolver(), workers=2)
+        try:
+            futures = [service.submit(self.request()) for _ in range(3)]
+            responses = [future.result() for future in futures]
+        finally:
+            service.close()
+
+        self.assertEqual(sorted(response["id"] for response in responses), [1, 2, 3])
+        for response in responses:
+            self.assertEqual([(row["bay"], row["gate"]) for row in response["assignments"]],
+                             [(solution.bay, solution.gate) for solution in expected.solutions])
+            self.assertAlmostEqual(response["objective"]["bay"], expected.objective_value("bay"))
+            self.assertIn("bay_solving", response["timings"])
+
+        # The airport is only parsed once and the workspaces are removed.
+        self.assertEqual(service.airports.paths(), [os.path.abspath(self.airport_path)])
+        self.assertEqual(os.listdir("service"), [])
+
+        metrics = service.metrics.summary()
+        self.assertEqual(metrics["completed"], 3)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["running"], 0)
+        self.assertEqual(metrics["latency"]["count"], 3)
+
+    def test_busy(self):
+        service = AssignmentService(lp_solver=ScipySolver(), max_queue=0)
+        try:
+            with self.assertRaises(ServiceBusyError):
+                service.submit(self.request())
+            with self.assertRaises(Exception):
+                service.assign({"airport": self.airport_path})
+        finally:
+            service.close()
+        self.assertEqual(service.metrics.summary()["rejected"], 2)
+
+    def test_request_error(self):
+        service = AssignmentService(lp_solver=ScipySolver())
+        try:
+            with self.assertRaises(RequestError):
+                service.assign({"airport": self.airport_path})
+            with self.assertRaises(RequestError):
+                service.assign({"airport": os.path.join(self.directory.name, "missing"),
+                                "schedule": self.request()["schedule"]})
+        finally:
+            service.close()
+
+    def test_http(self):
+        service = AssignmentService(lp_solver=ScipySolver())
+        server = create_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = "http://127.0.0.1:{}".format(server.server_address[1])
+        try:
+            request = Request(url + "/assign", data=json.dumps(self.request()).encode(),
+                              headers={"Content-Type": "application/json"})
+            with urlopen(request) as response:
+                result = json.loads(response.read().decode())
+            self.assertEqual(len(result["assignments"]), len(self.request()["schedule"]["flight_schedule"]))
+            self.assertTrue(all(row["bay"] is not None for row in result["assignments"]))
+
+            with self.assertRaises(HTTPError) as cm:
+                urlopen(Request(url + "/assign", data=b"{}"))
+            self.assertEqual(cm.exception.code, 400)
+
+            with urlopen(url + "/metrics") as response:
+                metrics = json.loads(response.read().decode())
+            self.assertEqual(metrics["completed"], 1)
+            self.assertEqual(metrics["failed"], 1)
+            self.assertEqual(metrics["workers"], 1)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    def test_http_solver_error(self):
+        # Failures while solving a valid request are server errors.
+        service = AssignmentService(lp_solver=FailingSolver())
+        server = create_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = "http://127.0.0.1:{}".format(server.server_address[1])
+        try:
+            with self.assertRaises(HTTPError) as cm:
+                urlopen(Request(url + "/assign", data=json.dumps(self.request()).encode()))
+            self.assertEqual(cm.exception.code, 500)
+            self.assertIn("crashed", json.loads(cm.exception.read().decode())["error"])
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    def test_parser(self):
+        args = create_parser().parse_args(["--port", "0", "-j", "2", "--max-queue", "4", "--backend", "scipy"])
+        self.assertEqual((args.host, args.port, args.workers, args.max_queue), ("127.0.0.1", 0, 2, 4))
+        self.assertIsInstance(create_lp_solver(args), ScipySolver)
+
+        args = create_parser().parse_args(["-j", "2", "--backend", "cplex-session", "--cplex-command", "fake"])
+        pool = create_lp_solver(args)
+        self.assertIsInstance(pool, CplexSessionPool)
+        self.assertEqual((pool.command, pool.size), ("fake", 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
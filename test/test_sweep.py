@@ -0,0 +1,52 @@
+"""
+These tests check running the assignments for combinations of buffer times and spare bays.
+"""
+
+import unittest
+import io
+import os
+from datetime import timedelta
+
+from ooc.lp_solvers import ScipySolver
+from ooc.sweep import sweep, write_table
+
+from synthetic_case import SyntheticTestCase
+
+
+class TestSweep(SyntheticTestCase):
+    airport_args = dict(n_bays=20, n_remote_bays=5, n_adjacent_pairs=0, seed=3)
+    schedule_args = dict(n_flights=12, long_stay_fraction=0.2, seed=3)
+
+    def test_sweep(self):
+        spare_bay = self.airport_info.bay_names[0]
+        results = sweep(self.airport_path, self.flights_path, "sweep",
+                        buffer_times=[timedelta(0), timedelta(minutes=30)],
+                        spare_bay_sets=[(), (spare_bay,), ("invalid",)],
+                        lp_solver=ScipySolver(),
+                        processes=2)
+
+        self.assertEqual([result.run for result in results], list(range(6)))
+        for result in results:
+            if "invalid" in result.spare_bays:
+                self.assertEqual(result.error, "Spare bay 'invalid' is invalid.")
+                continue
+            self.assertIsNone(result.error)
+            self.assertTrue(os.path.isfile(os.path.join("sweep", "run_{}".format(result.run), "bay.sol")))
+            self.assertGreaterEqual(result.towings, 0)
+            self.assertGreaterEqual(result.remote, 0)
+            self.assertIn("bay_solving", result.timings)
+
+        # The runs with and without buffer time are independent of each other.
+        self.assertEqual(results[0].buffer_time, timedelta(0))
+        self.assertEqual(results[3].buffer_time, timedelta(minutes=30))
+        self.assertLessEqual(results[0].bay_objective, results[3].bay_objective + 1e-6)
+
+        f = io.StringIO()
+        write_table(results, f)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(len(lines), 7)
+        self.assertIn("error: Spare bay 'invalid' is invalid.", lines[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
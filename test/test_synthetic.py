@@ -0,0 +1,95 @@
+"""
+These tests check the generated synthetic airports and flight schedules.
+"""
+
+import unittest
+import os
+from datetime import timedelta
+
+from ooc import Airport, Flights, BayAssignment, GateAssignment, ft
+from ooc.synthetic import generate_airport, generate_schedule
+
+from synthetic_case import SyntheticTestCase
+
+
+class TestSynthetic(SyntheticTestCase):
+
+    def generate(self, n_flights=60, seed=3, **kwargs):
+        airport_info = generate_airport(self.airport_path, seed=seed, **kwargs)
+        n = generate_schedule(self.flights_path, airport_info, n_flights=n_flights, seed=seed,
+                              long_stay_fraction=0.3, preference_fraction=0.5)
+        return airport_info, n
+
+    def test_airport(self):
+        airport_info, _ = self.generate(n_bays=30, n_gates=12, n_remote_bays=10, n_groups=5)
+        airport = Airport(self.airport_path)
+
+        self.assertEqual(airport.n_bays, 30)
+        self.assertEqual(airport.n_gates, 12)
+        self.assertEqual(len(airport.remote_bays), 10)
+        self.assertEqual(list(airport.bay_compliance_matrix[0]), ["E", "D", "C", "B", "A"])
+        self.assertIn("D", airport.terminal_names)
+        self.assertIn("KQ", airport.airlines)
+
+        # Every aircraft group fits on at least one bay.
+        for group in airport_info.groups:
+            self.assertTrue(any(airport.bay_compliance_matrix[k][group] for k in range(airport.n_bays)))
+
+    def test_schedule(self):
+        _, n = self.generate()
+        airport = Airport(self.airport_path)
+        flights = Flights(self.flights_path, airport)
+
+        self.assertEqual(flights.n_flights, n)
+        self.assertGreaterEqual(n, 60)
+        self.assertTrue(any(flight.preference is not None for flight in flights.flight_schedule))
+
+        # Split flights are consecutive.
+        for i, flight in enumerate(flights.flight_schedule):
+            if flight.flight_type == ft.Arr:
+                self.assertEqual(flights.flight_schedule[i + 1].flight_type, ft.Park)
+                self.assertEqual(flights.flight_schedule[i + 2].flight_type, ft.Dep)
+
+        # All flights with a current location are overnight flights and each is parked
+        # on a different compliant bay.
+        current = [(i, flight.current.bay) for i, flight in enumerate(flights.flight_schedule)
+                   if flight.current is not None]
+        self.assertTrue(current)
+        for i, k in current:
+            self.assertTrue(flights.is_overnight(i))
+            self.assertTrue(flights.bay_compliance(i, k))
+        self.assertEqual(len(set(k for _, k in current)), len(current))
+
+        for flight in flights.flight_schedule:
+            self.assertLess(flight.etd - flight.eta, timedelta(days=1))
+            self.assertGreater(flight.etd, flight.eta)
+
+    def test_seed(self):
+        self.generate(seed=5)
+        with open(os.path.join(self.flights_path, "flight_schedule.csv")) as f:
+            schedule = f.read()
+
+        self.generate(seed=5)
+        with open(os.path.join(self.flights_path, "flight_schedule.csv")) as f:
+            self.assertEqual(f.read(), schedule)
+
+        self.generate(seed=6)
+        with open(os.path.join(self.flights_path, "flight_schedule.csv")) as f:
+            self.assertNotEqual(f.read(), schedule)
+
+    def test_lp_code(self):
+        self.generate(n_flights=20)
+        airport = Airport(self.airport_path)
+        flights = Flights(self.flights_path, airport)
+
+        code = BayAssignment(flights).lp_code()
+        self.assertIn("X_0_", code)
+
+        bays = [next(k for k in range(airport.n_bays) if flights.bay_compliance(i, k))
+                for i in range(flights.n_flights)]
+        code = GateAssignment(flights, bays).lp_code()
+        self.assertIn("sg_", code)
+
+
+if __name__ == '__main__':
+    unittest.main()
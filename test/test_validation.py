@@ -0,0 +1,86 @@
+"""
+These tests check validating the bay and gate assignments against the operational rules.
+"""
+
+import unittest
+import os
+
+from ooc import BayGateSolver, ft
+from ooc.validation import rules
+
+
+def abs_path(rel_path):
+    """
+    Returns an absolute path to a file relative to this file.
+
+    :param rel_path: Path relative to this file
+    :return: Absolute path
+    """
+    return os.path.normpath(os.path.join(os.path.abspath(os.path.dirname(__file__)), rel_path))
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self):
+        self.solver = BayGateSolver(abs_path("./airport_data"),
+                                    abs_path("./flight_data_small"), "test_case",
+                                    cplex_command=None)
+        self.solver.load_bay_assignment_solution()
+        self.solver.load_gate_assignment_solution()
+        self.airport = self.solver.airport
+        self.flights = self.solver.flights
+
+    def move(self, i, k):
+        self.solver.solutions[i].bay_idx = k
+        self.solver.solutions[i].bay = self.airport.bay_names[k]
+
+    def rules(self):
+        return [violation.rule for violation in self.solver.validate()]
+
+    def test_valid(self):
+        self.assertEqual(self.solver.validate(), [])
+
+    def test_bays(self):
+        # Put flight 9 on the bay of flight 10, which departs at the same time.
+        self.move(9, self.solver.solutions[10].bay_idx)
+        violations = self.solver.validate()
+        self.assertIn("time_slot", [violation.rule for violation in violations])
+        violation = violations[[violation.rule for violation in violations].index("time_slot")]
+        self.assertEqual(violation.flights, (9, 10))
+        self.assertEqual(violation.bay, self.solver.solutions[10].bay_idx)
+
+        # A non compliant bay.
+        k = next(k for k in range(self.airport.n_bays) if not self.flights.bay_compliance(0, k))
+        self.move(0, k)
+        self.assertIn("compliance", self.rules())
+
+        # A bay without fueling pits for a departing flight.
+        k = next(k for k in range(self.airport.n_bays)
+                 if not self.airport.fueling[k] and self.flights.bay_compliance(7, k))
+        self.move(7, k)
+        self.assertIn("fueling", self.rules())
+
+        self.solver.solutions[12].bay_idx = None
+        self.assertIn("unassigned_bay", self.rules())
+        self.assertTrue(set(self.rules()) <= set(rules))
+
+    def test_overnight(self):
+        i = next(i for i, flight in enumerate(self.flights.flight_schedule)
+                 if flight.flight_type == ft.Arr and self.flights.is_overnight(i))
+        k = next(k for k in range(self.airport.n_bays)
+                 if k != self.flights.flight_schedule[i].current.bay and self.flights.bay_compliance(i, k))
+        self.move(i, k)
+        self.assertIn("overnight", self.rules())
+
+    def test_gates(self):
+        i = next(i for i in range(self.flights.n_flights) if self.flights.departing(i))
+        domestic = self.flights.domestic(i, departing=True)
+        l = next(l for l in range(self.airport.n_gates) if (l in self.airport.domestic_gates) != domestic)
+        self.solver.solutions[i].gate_idx = l
+        self.assertIn("domestic_gate", self.rules())
+
+        self.solver.solutions[i].gate_idx = None
+        self.assertEqual(self.rules(), ["unassigned_gate"])
+
+
+if __name__ == '__main__':
+    unittest.main()